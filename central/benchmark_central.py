@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+benchmark_central.py - Compara os layouts da Central (processo único x multiprocesso)
+
+Para cada taxa de mensagens CAN oferecida, roda a central completa
+(decode DBC + downsampling + LoRa + CSV) por alguns segundos e mede:
+- Fração das mensagens oferecidas que foi decodificada (processadas/oferecidas)
+- Jitter do loop de 50 Hz (desvio do período nominal de 20 ms, p50/p99)
+
+A taxa máxima sustentável é a maior taxa com >= 98% das mensagens processadas.
+
+O barramento CAN é sintético (mensagens do DBC pré-codificadas, entregues
+no ritmo pedido) e o LoRa escreve num pseudo-terminal drenado por uma
+thread, então o teste não precisa de hardware.
+
+Uso:
+    python3 benchmark_central.py
+    python3 benchmark_central.py --rates 1000 4000 8000 --duration 5
+
+Rode na própria Raspberry Pi: o ganho do multiprocesso depende de haver
+núcleos livres (em máquina de 1 núcleo os dois layouts disputam a mesma CPU).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import can
+import cantools
+
+import central
+
+SUSTAINED_RATIO = 0.98   # Fração mínima processada para considerar sustentável
+WARMUP_SEC = 1.0         # Descartado antes de medir (fork, DBC, buffers)
+
+
+class SyntheticBus:
+    """
+    Barramento CAN sintético: repete mensagens pré-codificadas a `rate` msg/s.
+
+    Se o consumidor atrasa, as mensagens se acumulam (como no buffer do
+    SocketCAN) e são entregues em rajada; a perda aparece como
+    mensagens processadas < oferecidas dentro da janela de medição.
+    """
+
+    def __init__(self, messages: list, rate: float):
+        self.messages = messages
+        self.interval = 1.0 / rate
+        self.index = 0
+        self.t0 = None
+
+    def recv(self, timeout: float = None):
+        now = time.perf_counter()
+        if self.t0 is None:
+            self.t0 = now
+        due = self.t0 + self.index * self.interval
+        if due > now:
+            wait = due - now
+            if timeout is not None and wait > timeout:
+                time.sleep(timeout)
+                return None
+            time.sleep(wait)
+        msg = self.messages[self.index % len(self.messages)]
+        self.index += 1
+        return msg
+
+    def shutdown(self):
+        pass
+
+
+def build_messages(dbc_path: str) -> list:
+    """Codifica uma mensagem de cada frame do DBC com valores no meio da faixa."""
+    db = cantools.database.load_file(dbc_path)
+    messages = []
+    for frame in db.messages:
+        values = {}
+        for signal in frame.signals:
+            lo = signal.minimum if signal.minimum is not None else 0
+            hi = signal.maximum if signal.maximum is not None else 0
+            values[signal.name] = (lo + hi) / 2
+        data = frame.encode(values)
+        messages.append(can.Message(arbitration_id=frame.frame_id, data=data,
+                                    is_extended_id=False))
+    return messages
+
+
+def drain_fd(fd: int, stop: threading.Event):
+    """Descarta o que a central escreve no pty do LoRa."""
+    while not stop.is_set():
+        try:
+            os.read(fd, 4096)
+        except OSError:
+            time.sleep(0.01)
+
+
+def run_layout(multiprocess: bool, messages: list, rate: float, duration: float,
+               verbose: bool) -> dict:
+    """Roda um layout a uma taxa e retorna as métricas."""
+    master, slave = os.openpty()
+    central.LORA_PORT = os.ttyname(slave)
+    stop_drain = threading.Event()
+    drain = threading.Thread(target=drain_fd, args=(master, stop_drain), daemon=True)
+    drain.start()
+
+    bus = SyntheticBus(messages, rate)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        if multiprocess:
+            system = central.MultiProcessTelemetrySystem(can_bus=bus)
+        else:
+            system = central.TelemetrySystem()
+            system.can_receiver = central.CANReceiver(central.CAN_INTERFACE,
+                                                      central.DBC_FILE, bus=bus)
+        if not system.start():
+            raise RuntimeError("Falha ao iniciar a central")
+
+        loop = threading.Thread(target=system.main_loop, daemon=True)
+        loop.start()
+
+        time.sleep(WARMUP_SEC)
+        system.loop_periods.clear()
+        count_start = system.can_receiver.messages_received
+        t_start = time.perf_counter()
+        time.sleep(duration)
+        processed = system.can_receiver.messages_received - count_start
+        elapsed = time.perf_counter() - t_start
+        jitter = system.get_loop_jitter()
+
+        system.running = False
+        loop.join(timeout=5.0)
+        time.sleep(0.2)  # Deixa a thread de recepção CAN encerrar em silêncio
+
+    stop_drain.set()
+    os.close(slave)
+    os.close(master)
+
+    offered = rate * elapsed
+    return {
+        'ratio': processed / offered if offered else 0.0,
+        'processed_hz': processed / elapsed,
+        'p50_ms': jitter.get('p50_ms', 0.0),
+        'p99_ms': jitter.get('p99_ms', 0.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos layouts da Central")
+    parser.add_argument('--rates', type=float, nargs='+',
+                        default=[1000, 4000, 16000, 32000, 64000],
+                        help="Taxas CAN oferecidas (msg/s)")
+    parser.add_argument('--duration', type=float, default=3.0,
+                        help="Segundos medidos por taxa")
+    parser.add_argument('--verbose', action='store_true', help="Mostra a saída da central")
+    args = parser.parse_args()
+
+    # Configuração do teste: sem GPS, backfill sem uplink, log em diretório temporário
+    log_dir = tempfile.mkdtemp(prefix='bench_central_')
+    central.ENABLE_GPS = False
+    central.LOG_DIRECTORY = log_dir
+    central.LOG_COMPRESS = True  # Mesma carga de gravação nos dois layouts
+
+    messages = build_messages(central.DBC_FILE)
+
+    print("=== BENCHMARK CENTRAL PUCPR RACING ===")
+    print(f"Núcleos disponíveis: {os.cpu_count()} | "
+          f"{len(messages)} frames do DBC | {args.duration:.0f} s por taxa\n")
+    print(f"{'Layout':<14} {'Oferecido':>10} {'Processado':>11} {'%':>7} "
+          f"{'Jitter p50':>11} {'p99':>9}")
+
+    results = {}
+    try:
+        for name, multiprocess in (('processo único', False), ('multiprocesso', True)):
+            sustained = 0.0
+            for rate in args.rates:
+                r = run_layout(multiprocess, messages, rate, args.duration, args.verbose)
+                print(f"{name:<14} {rate:>8.0f}/s {r['processed_hz']:>9.0f}/s "
+                      f"{r['ratio'] * 100:>6.1f}% {r['p50_ms']:>8.2f} ms "
+                      f"{r['p99_ms']:>6.2f} ms")
+                if r['ratio'] >= SUSTAINED_RATIO:
+                    sustained = rate
+            results[name] = sustained
+            print()
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    print("Taxa CAN máxima sustentável (>= 98% processado):")
+    for name, sustained in results.items():
+        print(f"  {name:<14} {sustained:.0f} msg/s" if sustained else
+              f"  {name:<14} < {args.rates[0]:.0f} msg/s")
+
+
+if __name__ == '__main__':
+    main()
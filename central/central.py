@@ -17,6 +17,7 @@ Taxa de Transmissão (Central → LoRa):
 - Alta Prioridade (50 Hz):  RPM, Suspensão (4x), Aceleração (X/Y), Volante, Freio
 - Média Prioridade (10 Hz): TPS, Lambda, Velocidade das Rodas (4x)
 - Baixa Prioridade (1 Hz):  Temperatura Motor, Bateria, GPS
+  (GPS é lido a 10 Hz via NMEA e gravado no CSV - ver gps_nmea.py)
 
 TAXA MÁXIMA TEÓRICA LoRa (SF7, BW125, CR4/5):
 - ~5470 bps = 683 bytes/s
@@ -26,6 +27,8 @@ TAXA MÁXIMA TEÓRICA LoRa (SF7, BW125, CR4/5):
 ESTRATÉGIA:
 - Pacote principal (alta prioridade): 50 Hz
 - Dados de baixa prioridade: incluídos a cada N ciclos
+- Retransmissões (store-and-forward): só com a banda que sobra, medida
+  pelos bytes enviados no último segundo (LORA_AIRTIME_BYTES_PER_S)
 """
 
 import can
@@ -35,10 +38,20 @@ import time
 import serial
 import threading
 import csv
+import gzip
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Optional
 import os
+import math
+import signal
+import configparser
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+from collections import deque
+
+from gps_nmea import GPSReader, GPS_BAUD
 
 # ============================================================================
 # CONFIGURAÇÕES DO SISTEMA
@@ -46,6 +59,7 @@ import os
 
 # CAN Bus
 CAN_INTERFACE = 'can0'  # SocketCAN no Linux
+CAN_BUSTYPE = 'socketcan'  # 'udp_multicast' + '239.0.0.1' para usar o simulador_carro.py
 CAN_BITRATE = 500000    # 500 kbps
 DBC_FILE = '../config/pucpr.dbc'  # Arquivo de definição CAN
 
@@ -58,14 +72,52 @@ RATE_HIGH_PRIORITY = 50      # RPM, Suspensão, Aceleração
 RATE_MEDIUM_PRIORITY = 10    # TPS, Lambda, Velocidade Rodas
 RATE_LOW_PRIORITY = 1        # Temperatura, Bateria, GPS
 
+# GPS (NMEA serial, opcional)
+ENABLE_GPS = True
+GPS_PORT = '/dev/ttyAMA0'   # UART da Pi (ou /dev/ttyACM0 para GPS USB)
+
 # Marcadores de pacote (opcional - ajuda na recepção)
 USE_PACKET_MARKERS = True
 START_MARKER = b'\xAA\x55'
 END_MARKER = b'\x55\xAA'
 
+# Mensagens auxiliares (requer USE_PACKET_MARKERS = True)
+# Formato: AUX_MARKER + tipo (1 byte) + tamanho (1 byte) + payload + END_MARKER
+AUX_MARKER = b'\xAA\x56'
+MSG_BACKFILL = 0x01   # Central → GS: pacote de telemetria retransmitido (36 bytes)
+MSG_LAP_SUMMARY = 0x02  # Central → GS: resumo de volta (LAP_SUMMARY_FORMAT)
+MSG_NACK = 0x10       # GS → Central: faixa de timestamps perdida '<II' (início, fim)
+
+# Store-and-forward (retransmissão de pacotes perdidos)
+ENABLE_BACKFILL = True
+HISTORY_SECONDS = 30         # Janela de histórico guardada na central
+LORA_AIRTIME_BYTES_PER_S = 2400  # Capacidade do enlace no ar (19,2 kbps); ajuste à taxa do módulo
+AIRTIME_WINDOW_S = 1.0       # Janela da medição dos bytes enviados
+MAX_BACKFILL_PER_REQUEST = 250  # Limite de pacotes por pedido (5 s @ 50 Hz)
+
+# Resumo de volta calculado na central (tempo de volta + máximos por volta)
+# A linha de chegada vem de [TRACK]/[ANALYSIS] do mesmo .ini da análise offline
+ENABLE_LAP_SUMMARY = True
+TRACK_CONFIG_FILE = '../config/config_pucpr_tool.ini'
+LAP_GATE_RADIUS_M = 10.0      # Padrão se o .ini não tiver lapdetectionthresholdmeters
+MIN_LAP_TIME_S = 20.0         # Padrão se o .ini não tiver minlaptimeseconds
+LAP_BEACON_GPIO = None        # Pino BCM do receptor de beacon IR (None = só GPS)
+LAP_SUMMARY_REPEATS = 3       # Cada resumo é enviado 3x (1 por segundo) contra perdas
+# volta, tempo_ms, rpm_max, freio_max, temp_max, vel_max*10, timestamp_ms do fim da volta
+LAP_SUMMARY_FORMAT = '<HIHHbHI'
+
 # Data Logging
 LOG_DIRECTORY = '../logs'  # Diretório para salvar logs CSV
 ENABLE_LOGGING = True      # Ativar/desativar gravação de logs
+LOG_COMPRESS = False       # Gravar .csv.gz (nos dois layouts)
+LOG_COMPRESSLEVEL = 6      # Nível gzip (1 = rápido, 9 = menor arquivo)
+
+# Layout multiprocesso (Pi 4 = 4 núcleos)
+# CAN ingest/decode e logging/compressão em processos próprios, trocando
+# estado via multiprocessing.shared_memory; o escalonador LoRa fica sozinho
+# no processo principal. Núcleo 0 fica livre para o SO (IRQs de USB/UART).
+ENABLE_MULTIPROCESS = False
+CPU_AFFINITY = {'lora': 2, 'can': 1, 'log': 3}
 
 # ============================================================================
 # ESTRUTURA DE DADOS (mesmo formato do lora_receiver.py)
@@ -99,6 +151,11 @@ class TelemetryData:
     # Baixa Prioridade (1 Hz)
     temperatura: int = 0            # -40 a 125°C (int8)
     
+    # GPS (10 Hz no estado; ainda não incluído no pacote LoRa de 36 bytes)
+    gps_lat: float = 0.0            # graus decimais
+    gps_lon: float = 0.0            # graus decimais
+    gps_speed: float = 0.0          # km/h
+    
     timestamp: int = 0              # milissegundos (uint32)
 
 
@@ -183,6 +240,59 @@ class DownsamplingManager:
         }
 
 
+# ============================================================================
+# HISTÓRICO DE PACOTES (STORE-AND-FORWARD)
+# ============================================================================
+
+class PacketHistory:
+    """
+    Buffer circular com os últimos pacotes enviados via LoRa.
+    
+    Conceito: STORE-AND-FORWARD
+    ===========================
+    - Cada payload enviado é guardado junto com seu timestamp (ms)
+    - O timestamp funciona como número de sequência (1 pacote a cada 20ms)
+    - A Ground Station detecta buracos na sequência e pede a faixa perdida
+    - A central retransmite a faixa em baixa prioridade
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = [0] * capacity
+        self.payloads = [b''] * capacity
+        self.count = 0  # Total de pacotes já guardados
+    
+    def add(self, timestamp_ms: int, payload: bytes):
+        """Guarda um payload (sobrescreve o mais antigo quando cheio)"""
+        idx = self.count % self.capacity
+        self.timestamps[idx] = timestamp_ms
+        self.payloads[idx] = payload
+        self.count += 1
+    
+    def get_range(self, start_ms: int, end_ms: int, limit: int) -> list:
+        """
+        Retorna (timestamp, payload) com start_ms <= timestamp <= end_ms (ordem crescente).
+        
+        Timestamps são crescentes, então a busca do início é binária.
+        """
+        oldest = max(0, self.count - self.capacity)
+        lo, hi = oldest, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamps[mid % self.capacity] < start_ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        
+        result = []
+        for k in range(lo, self.count):
+            idx = k % self.capacity
+            if self.timestamps[idx] > end_ms or len(result) >= limit:
+                break
+            result.append((self.timestamps[idx], self.payloads[idx]))
+        return result
+
+
 # ============================================================================
 # RECEPTOR CAN
 # ============================================================================
@@ -192,11 +302,11 @@ class CANReceiver:
     Recebe mensagens CAN da ECU e decodifica usando DBC.
     """
     
-    def __init__(self, interface: str, dbc_path: str):
+    def __init__(self, interface: str, dbc_path: str, bus=None):
         self.interface = interface
         self.dbc_path = dbc_path
         self.db = None
-        self.bus = None
+        self.bus = bus  # Barramento pré-criado (benchmark); None = abre no connect()
         self.running = False
         
         # Buffer de dados (thread-safe)
@@ -214,11 +324,12 @@ class CANReceiver:
             print(f"[CAN] DBC carregado: {len(self.db.messages)} mensagens")
             
             # Conectar ao barramento
-            self.bus = can.interface.Bus(
-                channel=self.interface,
-                bustype='socketcan',
-                bitrate=CAN_BITRATE
-            )
+            if self.bus is None:
+                self.bus = can.interface.Bus(
+                    channel=self.interface,
+                    bustype=CAN_BUSTYPE,
+                    bitrate=CAN_BITRATE
+                )
             print(f"[CAN] Conectado em {self.interface} @ {CAN_BITRATE} bps")
             return True
             
@@ -291,6 +402,13 @@ class CANReceiver:
             # Mensagem não está no DBC ou erro de decodificação
             pass
     
+    def update_gps(self, lat: float, lon: float, speed_kmh: float):
+        """Atualiza posição GPS (chamado pela thread do GPSReader a 10 Hz)"""
+        with self.data_lock:
+            self.data.gps_lat = lat
+            self.data.gps_lon = lon
+            self.data.gps_speed = speed_kmh
+    
     def get_current_data(self) -> TelemetryData:
         """Retorna snapshot dos dados atuais (thread-safe)"""
         with self.data_lock:
@@ -312,6 +430,9 @@ class CANReceiver:
                 susp_fr=self.data.susp_fr,
                 susp_rl=self.data.susp_rl,
                 susp_rr=self.data.susp_rr,
+                gps_lat=self.data.gps_lat,
+                gps_lon=self.data.gps_lon,
+                gps_speed=self.data.gps_speed,
                 timestamp=int(time.time() * 1000)
             )
     
@@ -367,6 +488,26 @@ class LoRaTransmitter:
         self.packets_sent = 0
         self.bytes_sent = 0
         self.start_time = time.time()
+        
+        # Referência do timestamp do pacote (ms desde o início da central)
+        self.start_ms = int(self.start_time * 1000)
+        
+        # Store-and-forward
+        self.history = PacketHistory(HISTORY_SECONDS * RATE_HIGH_PRIORITY)
+        self.backfill_queue = deque()   # (timestamp, payload) a retransmitir
+        self.backfill_queued_ts = set()  # Evita duplicatas quando o pedido se repete
+        self.uplink_buffer = bytearray()
+        self.nacks_received = 0
+        self.backfill_sent = 0
+        self.backfill_deferred = 0  # Ciclos com retransmissão pendente e sem banda
+        
+        # Bytes escritos na janela AIRTIME_WINDOW_S: (instante, bytes)
+        self.sent_window = deque()
+        self.sent_window_bytes = 0
+        
+        # Resumos de volta aguardando envio
+        self.lap_queue = deque()
+        self.lap_summaries_sent = 0
     
     def connect(self) -> bool:
         """Conecta à porta serial do LoRa"""
@@ -388,6 +529,9 @@ class LoRaTransmitter:
         """
         Empacota dados de telemetria em struct binária (36 bytes).
         
+        O timestamp do pacote é relativo ao início da central (ms, uint32);
+        data.timestamp (epoch ms) continua sendo usado no CSV.
+        
         Formato: little-endian (<)
         - H: uint16 (2 bytes)
         - h: int16 (2 bytes)
@@ -396,6 +540,7 @@ class LoRaTransmitter:
         - I: uint32 (4 bytes)
         
         Struct: <HbBHhHhhhHHHHHHHHI
+        (o 9º campo, int16 após accel_y, é reservado e enviado como 0)
         """
         try:
             # Aplicar escalas (inverso do lora_receiver.py)
@@ -415,6 +560,7 @@ class LoRaTransmitter:
                 data.brake_pressure,   # uint16
                 accel_x_scaled,        # int16
                 accel_y_scaled,        # int16
+                0,                     # int16 reservado (completa os 36 bytes)
                 data.wheel_fl,         # uint16
                 data.wheel_fr,         # uint16
                 data.wheel_rl,         # uint16
@@ -423,7 +569,7 @@ class LoRaTransmitter:
                 data.susp_fr,          # uint16
                 data.susp_rl,          # uint16
                 data.susp_rr,          # uint16
-                data.timestamp         # uint32
+                (data.timestamp - self.start_ms) & 0xFFFFFFFF  # uint32
             )
             
             return packed
@@ -450,6 +596,11 @@ class LoRaTransmitter:
             
             # Enviar
             self.serial_conn.write(packet)
+            self._account_airtime(len(packet))
+            
+            # Guardar no histórico para possível retransmissão
+            if ENABLE_BACKFILL:
+                self.history.add((data.timestamp - self.start_ms) & 0xFFFFFFFF, payload)
             
             # Atualizar estatísticas
             self.packets_sent += 1
@@ -461,6 +612,130 @@ class LoRaTransmitter:
             print(f"[LoRa] Erro ao enviar: {e}")
             return False
     
+    def poll_uplink(self):
+        """
+        Lê pedidos de retransmissão (NACK) vindos da Ground Station.
+        
+        Não bloqueia: consome apenas o que já está no buffer da serial.
+        """
+        if not self.serial_conn or not self.serial_conn.is_open:
+            return
+        
+        try:
+            waiting = self.serial_conn.in_waiting
+            if waiting:
+                self.uplink_buffer += self.serial_conn.read(waiting)
+        except Exception as e:
+            print(f"[LoRa] Erro ao ler uplink: {e}")
+            return
+        
+        buf = self.uplink_buffer
+        while True:
+            start = buf.find(AUX_MARKER)
+            if start < 0:
+                # Mantém só o último byte (pode ser metade do marcador)
+                del buf[:max(0, len(buf) - 1)]
+                return
+            if len(buf) - start < 4:
+                del buf[:start]
+                return
+            
+            msg_type = buf[start + 2]
+            length = buf[start + 3]
+            frame_end = start + 4 + length + len(END_MARKER)
+            if len(buf) < frame_end:
+                del buf[:start]
+                return
+            
+            if buf[frame_end - len(END_MARKER):frame_end] != END_MARKER:
+                del buf[:start + 1]  # Marcador falso: ressincroniza
+                continue
+            
+            if msg_type == MSG_NACK and length == struct.calcsize('<II'):
+                start_ms, end_ms = struct.unpack_from('<II', buf, start + 4)
+                self.nacks_received += 1
+                for ts, payload in self.history.get_range(start_ms, end_ms, MAX_BACKFILL_PER_REQUEST):
+                    if ts not in self.backfill_queued_ts:
+                        self.backfill_queued_ts.add(ts)
+                        self.backfill_queue.append((ts, payload))
+            
+            del buf[:frame_end]
+    
+    def _account_airtime(self, nbytes: int):
+        """Registra bytes escritos na janela de medição do enlace"""
+        self.sent_window.append((time.time(), nbytes))
+        self.sent_window_bytes += nbytes
+    
+    def spare_bandwidth(self) -> int:
+        """Bytes que ainda cabem no enlace na janela atual (medido, não estimado)"""
+        horizon = time.time() - AIRTIME_WINDOW_S
+        while self.sent_window and self.sent_window[0][0] < horizon:
+            self.sent_window_bytes -= self.sent_window.popleft()[1]
+        budget = LORA_AIRTIME_BYTES_PER_S * AIRTIME_WINDOW_S
+        return int(budget - self.sent_window_bytes)
+    
+    def send_backfill(self) -> bool:
+        """
+        Retransmite um pacote pendente só se houver banda sobrando.
+        
+        Não ocupa slot do fluxo ao vivo: o pacote só sai se os bytes
+        escritos na última janela, somados a ele, couberem em
+        LORA_AIRTIME_BYTES_PER_S. Com o enlace saturado a fila espera.
+        """
+        if not self.backfill_queue:
+            return False
+        if not self.serial_conn or not self.serial_conn.is_open:
+            return False
+        
+        ts, payload = self.backfill_queue[0]
+        if self.spare_bandwidth() < len(AUX_MARKER) + 2 + len(payload) + len(END_MARKER):
+            self.backfill_deferred += 1
+            return False
+        self.backfill_queue.popleft()
+        self.backfill_queued_ts.discard(ts)
+        if not self.send_aux(MSG_BACKFILL, payload):
+            return False
+        self.backfill_sent += 1
+        return True
+    
+    def queue_lap_summary(self, summary: 'LapSummary'):
+        """Enfileira um resumo de volta (repetido LAP_SUMMARY_REPEATS vezes)"""
+        payload = struct.pack(
+            LAP_SUMMARY_FORMAT,
+            summary.lap_number & 0xFFFF,
+            min(summary.lap_time_ms, 0xFFFFFFFF),
+            max(0, min(summary.max_rpm, 65535)),
+            max(0, min(summary.max_brake, 65535)),
+            max(-128, min(summary.max_temp, 127)),
+            max(0, min(int(summary.max_speed * 10), 65535)),
+            (summary.end_timestamp - self.start_ms) & 0xFFFFFFFF
+        )
+        self.lap_queue.extend([payload] * LAP_SUMMARY_REPEATS)
+    
+    def send_lap_summary(self) -> bool:
+        """Envia um resumo de volta pendente (baixa prioridade, 1 Hz)"""
+        if not self.lap_queue:
+            return False
+        if not self.send_aux(MSG_LAP_SUMMARY, self.lap_queue.popleft()):
+            return False
+        self.lap_summaries_sent += 1
+        return True
+    
+    def send_aux(self, msg_type: int, payload: bytes) -> bool:
+        """Envia uma mensagem auxiliar: AUX_MARKER | tipo | tamanho | payload | END_MARKER"""
+        if not self.serial_conn or not self.serial_conn.is_open:
+            return False
+        
+        packet = AUX_MARKER + bytes((msg_type, len(payload))) + payload + END_MARKER
+        try:
+            self.serial_conn.write(packet)
+            self.bytes_sent += len(packet)
+            self._account_airtime(len(packet))
+            return True
+        except Exception as e:
+            print(f"[LoRa] Erro ao enviar mensagem 0x{msg_type:02X}: {e}")
+            return False
+    
     def get_statistics(self) -> dict:
         """Retorna estatísticas de transmissão"""
         elapsed = time.time() - self.start_time
@@ -476,7 +751,12 @@ class LoRaTransmitter:
             'hz': hz,
             'bytes_per_sec': int(bytes_per_sec),
             'kbps': kbps,
-            'uptime_sec': int(elapsed)
+            'uptime_sec': int(elapsed),
+            'nacks_received': self.nacks_received,
+            'backfill_sent': self.backfill_sent,
+            'backfill_pending': len(self.backfill_queue),
+            'backfill_deferred': self.backfill_deferred,
+            'lap_summaries_sent': self.lap_summaries_sent
         }
     
     def disconnect(self):
@@ -485,6 +765,289 @@ class LoRaTransmitter:
             self.serial_conn.close()
 
 
+# ============================================================================
+# RESUMO DE VOLTA (ON-BOARD)
+# ============================================================================
+
+@dataclass
+class LapSummary:
+    """Agregados de uma volta completa."""
+    lap_number: int = 0
+    lap_time_ms: int = 0
+    max_rpm: int = 0
+    max_brake: int = 0
+    max_temp: int = -128
+    max_speed: float = 0.0          # km/h (GPS)
+    end_timestamp: int = 0          # ms (epoch) do cruzamento que fechou a volta
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distância em metros entre dois pontos (mesma fórmula de calculations.haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * 6371000.0 * math.asin(math.sqrt(a))
+
+
+def load_track_gate(path: str) -> tuple:
+    """
+    Lê a linha de chegada do .ini da ferramenta de análise.
+    
+    Returns:
+        (lat, lon, raio_m, volta_mínima_s) ou None se não houver [TRACK]
+    """
+    config = configparser.ConfigParser()
+    if not config.read(path) or not config.has_section('TRACK'):
+        return None
+    try:
+        lat = config.getfloat('TRACK', 'startfinishlat')
+        lon = config.getfloat('TRACK', 'startfinishlon')
+        radius = config.getfloat('ANALYSIS', 'lapdetectionthresholdmeters', fallback=LAP_GATE_RADIUS_M)
+        min_lap = config.getfloat('ANALYSIS', 'minlaptimeseconds', fallback=MIN_LAP_TIME_S)
+    except (configparser.Error, ValueError) as e:
+        print(f"[Volta] Erro em {path}: {e}")
+        return None
+    return lat, lon, radius, min_lap
+
+
+class LapTracker:
+    """
+    Detecta voltas e acumula máximos da volta em curso, amostra a amostra.
+    
+    Detecção (mesma lógica de calcular_tempos_volta, mas incremental):
+    - GPS: o carro entra no raio da linha de chegada; o cruzamento é o
+      instante de menor distância, confirmado ao sair do raio
+    - Beacon: mark_crossing() chamado pela interrupção do receptor IR
+    Cruzamentos a menos de min_lap_s do anterior são ignorados.
+    A primeira volta só começa no primeiro cruzamento (volta de saída descartada).
+    """
+    
+    def __init__(self, gate_lat: float, gate_lon: float, radius_m: float, min_lap_s: float):
+        self.gate_lat = gate_lat
+        self.gate_lon = gate_lon
+        self.radius_m = radius_m
+        self.min_lap_ms = int(min_lap_s * 1000)
+        
+        self.lap_number = 0
+        self.lap_start_ms: Optional[int] = None
+        self.current = LapSummary()
+        self.best_lap_ms: Optional[int] = None
+        
+        # Estado do gate GPS
+        self.last_fix = (0.0, 0.0)
+        self.in_gate = False
+        self.gate_min_dist = 0.0
+        self.gate_min_ms = 0
+        
+        # Beacon: sinalizado por outra thread, tratado no update()
+        self.beacon_ms: Optional[int] = None
+    
+    def mark_crossing(self):
+        """Cruzamento detectado por beacon (thread-safe: só grava o instante)."""
+        self.beacon_ms = int(time.time() * 1000)
+    
+    def update(self, data: TelemetryData) -> Optional[LapSummary]:
+        """
+        Processa uma amostra (50 Hz).
+        
+        Returns:
+            LapSummary da volta que acabou de fechar, ou None
+        """
+        cur = self.current
+        if data.rpm > cur.max_rpm:
+            cur.max_rpm = data.rpm
+        if data.brake_pressure > cur.max_brake:
+            cur.max_brake = data.brake_pressure
+        if data.temperatura > cur.max_temp:
+            cur.max_temp = data.temperatura
+        if data.gps_speed > cur.max_speed:
+            cur.max_speed = data.gps_speed
+        
+        crossing_ms = None
+        if self.beacon_ms is not None:
+            crossing_ms, self.beacon_ms = self.beacon_ms, None
+        elif (data.gps_lat, data.gps_lon) != self.last_fix:
+            # Novo fix GPS (10 Hz): avalia o gate
+            self.last_fix = (data.gps_lat, data.gps_lon)
+            crossing_ms = self._check_gate(data)
+        
+        if crossing_ms is None:
+            return None
+        return self._on_crossing(crossing_ms)
+    
+    def _check_gate(self, data: TelemetryData) -> Optional[int]:
+        """Retorna o instante do cruzamento ao sair do raio da linha de chegada."""
+        if data.gps_lat == 0.0 and data.gps_lon == 0.0:
+            return None  # Sem fix
+        dist = _haversine_m(data.gps_lat, data.gps_lon, self.gate_lat, self.gate_lon)
+        if dist < self.radius_m:
+            if not self.in_gate or dist < self.gate_min_dist:
+                self.gate_min_dist = dist
+                self.gate_min_ms = data.timestamp
+            self.in_gate = True
+            return None
+        if self.in_gate:
+            self.in_gate = False
+            return self.gate_min_ms
+        return None
+    
+    def _on_crossing(self, crossing_ms: int) -> Optional[LapSummary]:
+        if self.lap_start_ms is None:
+            # Primeiro cruzamento: começa a volta 1
+            self.lap_start_ms = crossing_ms
+            self.current = LapSummary()
+            print("[Volta] Linha de chegada cruzada: início da volta 1")
+            return None
+        
+        lap_time = crossing_ms - self.lap_start_ms
+        if lap_time < self.min_lap_ms:
+            return None  # Rebote do beacon / GPS oscilando perto da linha
+        
+        self.lap_number += 1
+        summary = self.current
+        summary.lap_number = self.lap_number
+        summary.lap_time_ms = lap_time
+        summary.end_timestamp = crossing_ms
+        if self.best_lap_ms is None or lap_time < self.best_lap_ms:
+            self.best_lap_ms = lap_time
+        
+        self.lap_start_ms = crossing_ms
+        self.current = LapSummary()
+        return summary
+
+
+# ============================================================================
+# DATA LOGGING (CSV)
+# ============================================================================
+
+class CSVLogger:
+    """
+    Grava os dados COMPLETOS (sem downsampling) em CSV.
+    
+    Com compress=True grava .csv.gz (pandas.read_csv lê direto).
+    """
+    
+    def __init__(self, compress: bool = False):
+        self.compress = compress
+        self.csv_file = None
+        self.csv_writer = None
+        self.log_filename = None
+        self.samples_logged = 0
+    
+    def make_filename(self) -> str:
+        """Nome do arquivo de log com data/hora atual"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"telemetria_pucpr_{timestamp}.csv"
+        return filename + '.gz' if self.compress else filename
+    
+    def is_active(self) -> bool:
+        """True se o arquivo está aberto para gravação"""
+        return self.csv_writer is not None
+    
+    def start(self) -> bool:
+        """Inicia gravação de dados em arquivo CSV"""
+        try:
+            # Criar diretório de logs se não existir
+            os.makedirs(LOG_DIRECTORY, exist_ok=True)
+            
+            # Gerar nome do arquivo com timestamp (se ainda não definido)
+            if not self.log_filename:
+                self.log_filename = self.make_filename()
+            filepath = os.path.join(LOG_DIRECTORY, self.log_filename)
+            
+            # Abrir arquivo CSV (gzip em modo texto se compactado)
+            if self.compress:
+                self.csv_file = gzip.open(filepath, 'wt', newline='', compresslevel=LOG_COMPRESSLEVEL)
+            else:
+                self.csv_file = open(filepath, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            
+            # Escrever cabeçalho
+            header = [
+                'Timestamp_ms',
+                'Datetime',
+                'RPM',
+                'Temperatura',
+                'TPS',
+                'Lambda',
+                'SteeringAngle',
+                'BrakePressure',
+                'AccelX',
+                'AccelY',
+                'WheelSpeed_FL',
+                'WheelSpeed_FR',
+                'WheelSpeed_RL',
+                'WheelSpeed_RR',
+                'Suspension_FL',
+                'Suspension_FR',
+                'Suspension_RL',
+                'Suspension_RR',
+                'GPS_Lat',
+                'GPS_Lon',
+                'GPS_Speed'
+            ]
+            self.csv_writer.writerow(header)
+            self.csv_file.flush()
+            
+            print(f"[CSV] Iniciando gravação: {filepath}")
+            return True
+            
+        except Exception as e:
+            print(f"[CSV] Erro ao criar arquivo: {e}")
+            return False
+    
+    def log(self, data: TelemetryData):
+        """Grava uma linha de dados no CSV"""
+        try:
+            # Timestamp atual em formato legível
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            
+            row = [
+                data.timestamp,
+                now,
+                data.rpm,
+                data.temperatura,
+                data.tps,
+                f"{data.lambda_:.3f}",
+                f"{data.steering_angle:.1f}",
+                data.brake_pressure,
+                f"{data.accel_x:.3f}",
+                f"{data.accel_y:.3f}",
+                data.wheel_fl,
+                data.wheel_fr,
+                data.wheel_rl,
+                data.wheel_rr,
+                data.susp_fl,
+                data.susp_fr,
+                data.susp_rl,
+                data.susp_rr,
+                f"{data.gps_lat:.7f}",
+                f"{data.gps_lon:.7f}",
+                f"{data.gps_speed:.2f}"
+            ]
+            
+            self.csv_writer.writerow(row)
+            self.samples_logged += 1
+            
+            # Flush a cada 100 amostras (2 segundos @ 50Hz) para não perder dados
+            if self.samples_logged % 100 == 0:
+                self.csv_file.flush()
+                
+        except Exception as e:
+            print(f"[CSV] Erro ao gravar dados: {e}")
+    
+    def stop(self):
+        """Finaliza gravação e fecha arquivo CSV"""
+        if self.csv_file:
+            try:
+                self.csv_file.flush()
+                self.csv_file.close()
+                print(f"[CSV] Arquivo fechado: {self.samples_logged} amostras gravadas")
+            except Exception as e:
+                print(f"[CSV] Erro ao fechar arquivo: {e}")
+
+
 # ============================================================================
 # SISTEMA PRINCIPAL
 # ============================================================================
@@ -498,16 +1061,18 @@ class TelemetrySystem:
         self.can_receiver = CANReceiver(CAN_INTERFACE, DBC_FILE)
         self.lora_transmitter = LoRaTransmitter(LORA_PORT, LORA_BAUD)
         self.downsampler = DownsamplingManager()
+        self.gps_reader: Optional[GPSReader] = None
+        self.lap_tracker: Optional[LapTracker] = None
         
         # Cache de dados de baixa/média prioridade
         # (reutilizados quando não é hora de atualizar)
         self.cached_data = TelemetryData()
         
         # Data Logging
-        self.csv_file = None
-        self.csv_writer = None
-        self.log_filename = None
-        self.samples_logged = 0
+        self.csv_logger = CSVLogger(compress=LOG_COMPRESS)
+        
+        # Jitter do loop principal: período real de cada ciclo (s)
+        self.loop_periods = deque(maxlen=RATE_HIGH_PRIORITY * 10)
         
         self.running = False
     
@@ -528,6 +1093,17 @@ class TelemetrySystem:
             self.can_receiver.stop()
             return False
         
+        # Conectar GPS (opcional - sem GPS a central continua operando)
+        if ENABLE_GPS:
+            self.gps_reader = GPSReader(GPS_PORT, GPS_BAUD, on_fix=self.can_receiver.update_gps)
+            if not self.gps_reader.start():
+                print("[Sistema] Aviso: GPS indisponível (continuando sem posição)")
+                self.gps_reader = None
+        
+        # Resumo de volta (GPS e/ou beacon)
+        if ENABLE_LAP_SUMMARY:
+            self.start_lap_tracker()
+        
         # Iniciar data logging
         if ENABLE_LOGGING:
             if not self.start_logging():
@@ -536,9 +1112,14 @@ class TelemetrySystem:
         print(f"\n[Sistema] Iniciado com sucesso!")
         print(f"  CAN: {CAN_INTERFACE} @ {CAN_BITRATE} bps")
         print(f"  LoRa: {LORA_PORT} @ {LORA_BAUD} baud")
+        if self.gps_reader:
+            print(f"  GPS: {GPS_PORT} @ {self.gps_reader.baud} baud")
         print(f"  Taxa de transmissão: {RATE_HIGH_PRIORITY} Hz (downsampling ativo)")
-        if ENABLE_LOGGING and self.csv_file:
-            print(f"  Data Logging: {self.log_filename}")
+        if self.lap_tracker:
+            print(f"  Voltas: linha em ({self.lap_tracker.gate_lat:.5f}, {self.lap_tracker.gate_lon:.5f}) "
+                  f"raio {self.lap_tracker.radius_m:.0f} m")
+        if ENABLE_LOGGING and self.csv_logger.is_active():
+            print(f"  Data Logging: {self.csv_logger.log_filename}")
         print("\nPressione Ctrl+C para parar\n")
         
         return True
@@ -559,14 +1140,27 @@ class TelemetrySystem:
         interval = 1.0 / RATE_HIGH_PRIORITY  # 20ms @ 50 Hz
         
         next_stats_time = time.time() + 5.0  # Mostrar stats a cada 5s
+        last_loop_start = None
         
         try:
             while self.running:
                 loop_start = time.time()
+                if last_loop_start is not None:
+                    self.loop_periods.append(loop_start - last_loop_start)
+                last_loop_start = loop_start
                 
                 # Obter dados atuais do CAN
                 current = self.can_receiver.get_current_data()
                 
+                # Resumo de volta: agrega e detecta cruzamento da linha
+                if self.lap_tracker:
+                    summary = self.lap_tracker.update(current)
+                    if summary:
+                        self.lora_transmitter.queue_lap_summary(summary)
+                        print(f"[Volta] Volta {summary.lap_number}: {summary.lap_time_ms / 1000:.3f} s | "
+                              f"RPM máx {summary.max_rpm} | Freio máx {summary.max_brake} bar | "
+                              f"Temp máx {summary.max_temp}°C")
+                
                 # ALTA PRIORIDADE: Sempre atualiza
                 packet = TelemetryData()
                 packet.rpm = current.rpm
@@ -615,8 +1209,18 @@ class TelemetrySystem:
                 # Enviar pacote via LoRa (com downsampling)
                 self.lora_transmitter.send_packet(packet)
                 
+                # STORE-AND-FORWARD: atende pedidos de retransmissão só
+                # com a banda que sobra do fluxo ao vivo (medida na janela)
+                if ENABLE_BACKFILL:
+                    self.lora_transmitter.poll_uplink()
+                    self.lora_transmitter.send_backfill()
+                
+                # Resumos de volta: uma mensagem por segundo no slot de baixa prioridade
+                if self.lap_tracker and self.downsampler.should_send_low():
+                    self.lora_transmitter.send_lap_summary()
+                
                 # Gravar dados COMPLETOS no CSV (sem downsampling)
-                if ENABLE_LOGGING and self.csv_writer:
+                if ENABLE_LOGGING and self.csv_logger.is_active():
                     self.log_data(current)
                 
                 # Incrementar contador de ciclos
@@ -651,121 +1255,419 @@ class TelemetrySystem:
               f"{lora_stats.get('hz', 0):.1f} Hz | "
               f"{lora_stats.get('kbps', 0):.1f} kbps")
         print(f"  CAN RX: {self.can_receiver.messages_received} mensagens")
+        if ENABLE_BACKFILL:
+            print(f"  Backfill: {lora_stats.get('nacks_received', 0)} pedidos | "
+                  f"{lora_stats.get('backfill_sent', 0)} retransmitidos | "
+                  f"{lora_stats.get('backfill_pending', 0)} pendentes | "
+                  f"{lora_stats.get('backfill_deferred', 0)} ciclos sem banda")
+        if self.gps_reader:
+            gps_stats = self.gps_reader.get_statistics()
+            print(f"  GPS: {gps_stats['sentences_ok']} sentenças | "
+                  f"fix={'OK' if gps_stats['fix_valid'] else '--'} | "
+                  f"{gps_stats['satellites']} satélites | "
+                  f"{gps_stats['checksum_errors']} erros de checksum")
         print(f"  Banda: {lora_stats.get('bytes_per_sec', 0)} bytes/s "
               f"({lora_stats.get('kbps', 0):.1f} kbps)")
+        if self.lap_tracker:
+            best = self.lap_tracker.best_lap_ms
+            best_str = f"{best / 1000:.3f} s" if best else "--"
+            print(f"  Voltas: {self.lap_tracker.lap_number} completas | melhor {best_str} | "
+                  f"{lora_stats.get('lap_summaries_sent', 0)} resumos enviados")
         if ENABLE_LOGGING:
-            print(f"  CSV Log: {self.samples_logged} amostras gravadas")
+            print(f"  CSV Log: {self.csv_logger.samples_logged} amostras gravadas")
+        jitter = self.get_loop_jitter()
+        if jitter:
+            print(f"  Jitter do loop: p50={jitter['p50_ms']:.2f} ms | "
+                  f"p99={jitter['p99_ms']:.2f} ms | max={jitter['max_ms']:.2f} ms")
         print("-"*60)
     
+    def get_loop_jitter(self) -> dict:
+        """
+        Desvio do período do loop em relação ao nominal (20 ms @ 50 Hz).
+        
+        Returns:
+            Dict com p50_ms, p99_ms e max_ms (vazio se ainda sem amostras)
+        """
+        if not self.loop_periods:
+            return {}
+        interval = 1.0 / RATE_HIGH_PRIORITY
+        deviations = sorted(abs(p - interval) * 1000 for p in self.loop_periods)
+        n = len(deviations)
+        return {
+            'p50_ms': deviations[n // 2],
+            'p99_ms': deviations[min(n - 1, int(n * 0.99))],
+            'max_ms': deviations[-1],
+        }
+    
+    def start_lap_tracker(self):
+        """Configura a detecção de voltas (linha de chegada do .ini + beacon opcional)"""
+        gate = load_track_gate(TRACK_CONFIG_FILE)
+        if gate is None:
+            print(f"[Volta] Aviso: [TRACK] não encontrado em {TRACK_CONFIG_FILE} (resumo de volta desativado)")
+            return
+        
+        lat, lon, radius, min_lap = gate
+        self.lap_tracker = LapTracker(lat, lon, radius, min_lap)
+        
+        if LAP_BEACON_GPIO is not None:
+            try:
+                import RPi.GPIO as GPIO
+                GPIO.setmode(GPIO.BCM)
+                GPIO.setup(LAP_BEACON_GPIO, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+                GPIO.add_event_detect(LAP_BEACON_GPIO, GPIO.FALLING,
+                                      callback=lambda _pin: self.lap_tracker.mark_crossing(),
+                                      bouncetime=500)
+                print(f"[Volta] Beacon IR no GPIO {LAP_BEACON_GPIO}")
+            except (ImportError, RuntimeError) as e:
+                print(f"[Volta] Aviso: beacon indisponível ({e}), usando apenas GPS")
+    
     def start_logging(self) -> bool:
         """Inicia gravação de dados em arquivo CSV"""
-        try:
-            # Criar diretório de logs se não existir
-            os.makedirs(LOG_DIRECTORY, exist_ok=True)
-            
-            # Gerar nome do arquivo com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.log_filename = f"telemetria_pucpr_{timestamp}.csv"
-            filepath = os.path.join(LOG_DIRECTORY, self.log_filename)
-            
-            # Abrir arquivo CSV
-            self.csv_file = open(filepath, 'w', newline='')
-            self.csv_writer = csv.writer(self.csv_file)
-            
-            # Escrever cabeçalho
-            header = [
-                'Timestamp_ms',
-                'Datetime',
-                'RPM',
-                'Temperatura',
-                'TPS',
-                'Lambda',
-                'SteeringAngle',
-                'BrakePressure',
-                'AccelX',
-                'AccelY',
-                'WheelSpeed_FL',
-                'WheelSpeed_FR',
-                'WheelSpeed_RL',
-                'WheelSpeed_RR',
-                'Suspension_FL',
-                'Suspension_FR',
-                'Suspension_RL',
-                'Suspension_RR'
-            ]
-            self.csv_writer.writerow(header)
-            self.csv_file.flush()
-            
-            print(f"[CSV] Iniciando gravação: {filepath}")
-            return True
-            
-        except Exception as e:
-            print(f"[CSV] Erro ao criar arquivo: {e}")
-            return False
+        return self.csv_logger.start()
     
     def log_data(self, data: TelemetryData):
         """Grava uma linha de dados no CSV"""
-        try:
-            # Timestamp atual em formato legível
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            
-            row = [
-                data.timestamp,
-                now,
-                data.rpm,
-                data.temperatura,
-                data.tps,
-                f"{data.lambda_:.3f}",
-                f"{data.steering_angle:.1f}",
-                data.brake_pressure,
-                f"{data.accel_x:.3f}",
-                f"{data.accel_y:.3f}",
-                data.wheel_fl,
-                data.wheel_fr,
-                data.wheel_rl,
-                data.wheel_rr,
-                data.susp_fl,
-                data.susp_fr,
-                data.susp_rl,
-                data.susp_rr
-            ]
-            
-            self.csv_writer.writerow(row)
-            self.samples_logged += 1
-            
-            # Flush a cada 100 amostras (2 segundos @ 50Hz) para não perder dados
-            if self.samples_logged % 100 == 0:
-                self.csv_file.flush()
-                
-        except Exception as e:
-            print(f"[CSV] Erro ao gravar dados: {e}")
+        self.csv_logger.log(data)
     
     def stop_logging(self):
         """Finaliza gravação e fecha arquivo CSV"""
-        if self.csv_file:
-            try:
-                self.csv_file.flush()
-                self.csv_file.close()
-                print(f"[CSV] Arquivo fechado: {self.samples_logged} amostras gravadas")
-            except Exception as e:
-                print(f"[CSV] Erro ao fechar arquivo: {e}")
+        self.csv_logger.stop()
     
     def stop(self):
         """Para sistema"""
         print("\n[Sistema] Encerrando...")
         self.running = False
         self.can_receiver.stop()
+        if self.gps_reader:
+            self.gps_reader.stop()
         self.lora_transmitter.disconnect()
         self.stop_logging()
         print("[Sistema] Finalizado")
 
 
+# ============================================================================
+# LAYOUT MULTIPROCESSO (shared_memory)
+# ============================================================================
+#
+# Processo principal  → escalonador LoRa (50 Hz) + GPS        [CPU_AFFINITY['lora']]
+# Processo CAN        → recv + decode DBC, publica o estado    [CPU_AFFINITY['can']]
+# Processo de logging → amostra o estado a 50 Hz, grava o CSV  [CPU_AFFINITY['log']]
+#
+# O estado atual fica num bloco de memória compartilhada com regiões
+# separadas por escritor (CAN, GPS, logging), protegidas por um único
+# multiprocessing.Lock. Cada escritor só toca a sua região.
+
+# Campos de TelemetryData publicados pelo processo CAN (todos como double)
+SHARED_CAN_FIELDS = (
+    'rpm', 'steering_angle', 'brake_pressure', 'accel_x', 'accel_y',
+    'susp_fl', 'susp_fr', 'susp_rl', 'susp_rr',
+    'tps', 'lambda_', 'wheel_fl', 'wheel_fr', 'wheel_rl', 'wheel_rr',
+    'temperatura',
+)
+_INT_FIELDS = {'rpm', 'brake_pressure', 'susp_fl', 'susp_fr', 'susp_rl', 'susp_rr',
+               'tps', 'wheel_fl', 'wheel_fr', 'wheel_rl', 'wheel_rr', 'temperatura'}
+
+# Layout: [campos CAN..., messages_received] [lat, lon, speed] [samples_logged]
+_CAN_FORMAT = '<' + 'd' * (len(SHARED_CAN_FIELDS) + 1)
+_GPS_FORMAT = '<ddd'
+_LOG_FORMAT = '<d'
+_CAN_OFFSET = 0
+_GPS_OFFSET = _CAN_OFFSET + struct.calcsize(_CAN_FORMAT)
+_LOG_OFFSET = _GPS_OFFSET + struct.calcsize(_GPS_FORMAT)
+SHARED_STATE_SIZE = _LOG_OFFSET + struct.calcsize(_LOG_FORMAT)
+
+
+def _pin_to_core(role: str):
+    """Fixa o processo atual no núcleo de CPU_AFFINITY[role] (se existir)."""
+    cpu = CPU_AFFINITY.get(role)
+    if cpu is None or not hasattr(os, 'sched_setaffinity'):
+        return
+    if cpu >= (os.cpu_count() or 1):
+        print(f"[MP] Núcleo {cpu} inexistente para '{role}' (mantendo afinidade padrão)")
+        return
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError as e:
+        print(f"[MP] Não foi possível fixar '{role}' no núcleo {cpu}: {e}")
+
+
+class SharedTelemetryState:
+    """
+    Estado de telemetria em multiprocessing.shared_memory.
+    
+    Criado no processo principal; os filhos herdam o mapeamento pelo fork
+    (não reabrem pelo nome, então só o processo principal faz unlink).
+    """
+    
+    def __init__(self, lock):
+        self.lock = lock
+        self.shm = shared_memory.SharedMemory(create=True, size=SHARED_STATE_SIZE)
+        self.shm.buf[:SHARED_STATE_SIZE] = bytes(SHARED_STATE_SIZE)
+    
+    def publish_can(self, data: TelemetryData, messages_received: int):
+        """Escreve os campos CAN (processo CAN, após cada mensagem)"""
+        values = [getattr(data, f) for f in SHARED_CAN_FIELDS]
+        with self.lock:
+            struct.pack_into(_CAN_FORMAT, self.shm.buf, _CAN_OFFSET,
+                             *values, messages_received)
+    
+    def publish_gps(self, lat: float, lon: float, speed_kmh: float):
+        """Escreve a posição GPS (thread do GPSReader no processo principal)"""
+        with self.lock:
+            struct.pack_into(_GPS_FORMAT, self.shm.buf, _GPS_OFFSET, lat, lon, speed_kmh)
+    
+    def publish_samples_logged(self, samples: int):
+        """Escreve o contador de amostras (processo de logging)"""
+        with self.lock:
+            struct.pack_into(_LOG_FORMAT, self.shm.buf, _LOG_OFFSET, samples)
+    
+    def snapshot(self):
+        """
+        Lê o estado completo de forma consistente.
+        
+        Returns:
+            (TelemetryData, messages_received, samples_logged)
+        """
+        with self.lock:
+            can_values = struct.unpack_from(_CAN_FORMAT, self.shm.buf, _CAN_OFFSET)
+            lat, lon, speed = struct.unpack_from(_GPS_FORMAT, self.shm.buf, _GPS_OFFSET)
+            samples, = struct.unpack_from(_LOG_FORMAT, self.shm.buf, _LOG_OFFSET)
+        
+        data = TelemetryData(gps_lat=lat, gps_lon=lon, gps_speed=speed,
+                             timestamp=int(time.time() * 1000))
+        for field, value in zip(SHARED_CAN_FIELDS, can_values):
+            setattr(data, field, int(value) if field in _INT_FIELDS else value)
+        return data, int(can_values[-1]), int(samples)
+    
+    def close(self):
+        """Libera a memória compartilhada (apenas no processo principal)"""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedCANReceiver(CANReceiver):
+    """CANReceiver que publica o estado na memória compartilhada."""
+    
+    def __init__(self, interface: str, dbc_path: str, shared: SharedTelemetryState, bus=None):
+        super().__init__(interface, dbc_path, bus)
+        self.shared = shared
+    
+    def process_message(self, msg: can.Message):
+        super().process_message(msg)
+        self.shared.publish_can(self.data, self.messages_received)
+
+
+def _can_process_main(shared: SharedTelemetryState, ready, stop_event, bus):
+    """Processo CAN: recv + decode DBC, publica cada atualização."""
+    _pin_to_core('can')
+    receiver = SharedCANReceiver(CAN_INTERFACE, DBC_FILE, shared, bus=bus)
+    if not receiver.connect():
+        return
+    
+    # Ctrl+C é tratado pelo processo principal (que sinaliza stop_event)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    def watch_stop():
+        stop_event.wait()
+        receiver.running = False
+    
+    receiver.running = True
+    threading.Thread(target=watch_stop, daemon=True).start()
+    ready.set()
+    receiver.reception_loop()
+    
+    if receiver.bus:
+        receiver.bus.shutdown()
+
+
+def _log_process_main(shared: SharedTelemetryState, ready, stop_event, logger: CSVLogger):
+    """Processo de logging: amostra o estado a 50 Hz e grava o CSV (.csv.gz com LOG_COMPRESS)."""
+    _pin_to_core('log')
+    if not logger.start():
+        return
+    
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ready.set()
+    
+    interval = 1.0 / RATE_HIGH_PRIORITY
+    next_tick = time.time()
+    while not stop_event.is_set():
+        data, _, _ = shared.snapshot()
+        logger.log(data)
+        shared.publish_samples_logged(logger.samples_logged)
+        
+        next_tick += interval
+        sleep_time = next_tick - time.time()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+        else:
+            next_tick = time.time()  # Atrasado: não tenta compensar em rajada
+    
+    logger.stop()
+
+
+class CANIngestProcess:
+    """
+    Substitui o CANReceiver no processo principal: inicia o processo CAN
+    e lê o estado da memória compartilhada (mesma interface).
+    """
+    
+    def __init__(self, ctx, shared: SharedTelemetryState, bus=None):
+        self.ctx = ctx
+        self.shared = shared
+        self.bus = bus  # Usado apenas no processo filho (após o fork)
+        self.stop_event = ctx.Event()
+        self.process = None
+    
+    @property
+    def messages_received(self) -> int:
+        return self.shared.snapshot()[1]
+    
+    def start(self) -> bool:
+        ready = self.ctx.Event()
+        self.process = self.ctx.Process(
+            target=_can_process_main, name='central-can',
+            args=(self.shared, ready, self.stop_event, self.bus),
+            daemon=True)
+        self.process.start()
+        
+        # Espera o connect() do filho (carregar DBC + abrir barramento)
+        while not ready.wait(0.1):
+            if not self.process.is_alive():
+                return False
+        print(f"[MP] Processo CAN iniciado (pid {self.process.pid})")
+        return True
+    
+    def update_gps(self, lat: float, lon: float, speed_kmh: float):
+        self.shared.publish_gps(lat, lon, speed_kmh)
+    
+    def get_current_data(self) -> TelemetryData:
+        return self.shared.snapshot()[0]
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.process:
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+
+
+class CSVLoggerProcess:
+    """
+    Substitui o CSVLogger no processo principal: o CSV (.csv.gz com
+    LOG_COMPRESS) é gravado pelo processo de logging a partir da memória
+    compartilhada.
+    """
+    
+    def __init__(self, ctx, shared: SharedTelemetryState):
+        self.ctx = ctx
+        self.shared = shared
+        self.logger = CSVLogger(compress=LOG_COMPRESS)
+        self.stop_event = ctx.Event()
+        self.process = None
+    
+    @property
+    def log_filename(self) -> Optional[str]:
+        return self.logger.log_filename
+    
+    @property
+    def samples_logged(self) -> int:
+        return self.shared.snapshot()[2]
+    
+    def is_active(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+    
+    def start(self) -> bool:
+        # Nome definido antes do fork para o processo principal conhecê-lo
+        self.logger.log_filename = self.logger.make_filename()
+        ready = self.ctx.Event()
+        self.process = self.ctx.Process(
+            target=_log_process_main, name='central-log',
+            args=(self.shared, ready, self.stop_event, self.logger),
+            daemon=True)
+        self.process.start()
+        
+        while not ready.wait(0.1):
+            if not self.process.is_alive():
+                return False
+        print(f"[MP] Processo de logging iniciado (pid {self.process.pid})")
+        return True
+    
+    def log(self, data: TelemetryData):
+        pass  # Gravação feita pelo processo de logging
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.process:
+            self.process.join(timeout=3.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            print(f"[CSV] Processo de logging finalizado: {self.log_filename}")
+
+
+class MultiProcessTelemetrySystem(TelemetrySystem):
+    """
+    TelemetrySystem com CAN e logging em processos separados.
+    
+    O main_loop (downsampling + LoRa + backfill) é o mesmo; apenas
+    can_receiver e csv_logger são trocados por fachadas que leem a
+    memória compartilhada.
+    """
+    
+    def __init__(self, can_bus=None):
+        super().__init__()
+        # fork: filhos herdam DBC/configuração já ajustada pelo argparse
+        self.ctx = multiprocessing.get_context('fork')
+        self.shared = SharedTelemetryState(self.ctx.Lock())
+        self.can_receiver = CANIngestProcess(self.ctx, self.shared, bus=can_bus)
+        self.csv_logger = CSVLoggerProcess(self.ctx, self.shared)
+    
+    def start(self) -> bool:
+        print(f"[MP] Layout multiprocesso: CPU_AFFINITY={CPU_AFFINITY}")
+        _pin_to_core('lora')
+        if not super().start():
+            self.shared.close()
+            return False
+        return True
+    
+    def stop(self):
+        super().stop()
+        self.shared.close()
+
+
 # ============================================================================
 # PONTO DE ENTRADA
 # ============================================================================
 
 if __name__ == '__main__':
-    system = TelemetrySystem()
+    arg_parser = argparse.ArgumentParser(description="PUCPR Racing - Telemetria Central")
+    arg_parser.add_argument('--lora-port', help=f"Porta serial do LoRa (padrão: {LORA_PORT})")
+    arg_parser.add_argument('--can-interface', help=f"Canal CAN (padrão: {CAN_INTERFACE})")
+    arg_parser.add_argument('--can-bustype', help=f"Tipo de barramento python-can (padrão: {CAN_BUSTYPE})")
+    arg_parser.add_argument('--gps-port', help=f"Porta serial do GPS (padrão: {GPS_PORT})")
+    arg_parser.add_argument('--no-gps', action='store_true', help="Desativa a leitura de GPS")
+    arg_parser.add_argument('--lap-beacon-gpio', type=int,
+                            help="Pino BCM do receptor de beacon de volta (padrão: só GPS)")
+    arg_parser.add_argument('--multiprocess', action='store_true',
+                            help="CAN e logging em processos separados (usa os 4 núcleos da Pi)")
+    args = arg_parser.parse_args()
+    
+    if args.lora_port:
+        LORA_PORT = args.lora_port
+    if args.can_interface:
+        CAN_INTERFACE = args.can_interface
+    if args.can_bustype:
+        CAN_BUSTYPE = args.can_bustype
+    if args.gps_port:
+        GPS_PORT = args.gps_port
+    if args.no_gps:
+        ENABLE_GPS = False
+    if args.lap_beacon_gpio is not None:
+        LAP_BEACON_GPIO = args.lap_beacon_gpio
+    if args.multiprocess:
+        ENABLE_MULTIPROCESS = True
+    
+    system = MultiProcessTelemetrySystem() if ENABLE_MULTIPROCESS else TelemetrySystem()
     
     if system.start():
         system.main_loop()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+gps_nmea.py - Leitura de GPS NMEA para a Central (Raspberry Pi)
+
+Lê sentenças NMEA 0183 (RMC e GGA) de um módulo GPS serial e entrega
+latitude, longitude e velocidade para o estado de telemetria da central.
+
+CONCEITO: PARSER INCREMENTAL SEM ALOCAÇÃO
+=========================================
+- Os bytes chegam da serial em pedaços de tamanho arbitrário
+- Cada byte alimenta uma máquina de estados ($ ... *CS\\r\\n)
+- A sentença é montada num bytearray pré-alocado (sem strings)
+- Campos são localizados com bytearray.find(b',', ...) e convertidos
+  direto dos dígitos ASCII para número (sem decode/split/float(str))
+- Checksum XOR é calculado durante a recepção, byte a byte
+
+Sentenças suportadas:
+- $xxRMC: posição, velocidade (nós) e validade do fix
+- $xxGGA: posição, qualidade do fix e número de satélites
+  (xx = GP, GN, GL, GA... qualquer talker ID)
+
+Taxa: módulos u-blox (NEO-6M/M8N) saem de fábrica a 1 Hz, 9600 baud e com
+GGA, GLL, GSA, GSV, RMC e VTG ligadas. Só RMC+GGA a 10 Hz já passam de
+1,4 kB/s, acima dos ~960 B/s de 9600 baud. Na conexão a central:
+1. envia UBX-CFG-PRT (GPS_BAUD_FAST) e reabre a serial nesse baud
+2. desliga as sentenças que o parser não usa (UBX-CFG-MSG)
+3. configura 10 Hz (UBX-CFG-RATE, GPS_RATE_HZ)
+A configuração fica na RAM do módulo; os passos 2 e 3 vão no baud novo,
+então funcionam também se o módulo já estava nele.
+"""
+
+import struct
+import threading
+import time
+from typing import Callable, Optional
+
+import serial
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+GPS_BAUD = 9600          # Padrão de fábrica dos módulos u-blox (conexão inicial)
+GPS_BAUD_FAST = 115200   # Baud configurado por UBX-CFG-PRT (None = manter GPS_BAUD)
+GPS_RATE_HZ = 10         # Taxa de navegação desejada
+GPS_DISABLED_SENTENCES = ('GSV', 'GSA', 'VTG', 'GLL')  # Ligadas de fábrica, não usadas
+PORT_SWITCH_S = 0.1      # Espera para o módulo trocar de baud após o CFG-PRT
+MAX_SENTENCE_LEN = 96    # NMEA limita a 82 caracteres; margem de segurança
+READ_CHUNK = 256         # Bytes por leitura da serial
+
+KNOTS_TO_KMH = 1.852
+
+# Estados da máquina de recepção
+_IDLE = 0        # Aguardando '$'
+_BODY = 1        # Acumulando corpo da sentença (checksum XOR ativo)
+_CS_HI = 2       # Primeiro dígito hexa do checksum
+_CS_LO = 3       # Segundo dígito hexa do checksum
+
+_DOLLAR = 0x24
+_STAR = 0x2A
+_COMMA = 0x2C
+_DOT = 0x2E
+_CR = 0x0D
+_LF = 0x0A
+
+
+def _hex_value(b: int) -> int:
+    """Converte um dígito hexa ASCII em valor (ou -1 se inválido)."""
+    if 0x30 <= b <= 0x39:
+        return b - 0x30
+    if 0x41 <= b <= 0x46:
+        return b - 0x37
+    if 0x61 <= b <= 0x66:
+        return b - 0x57
+    return -1
+
+
+def _parse_decimal(buf: bytearray, start: int, end: int) -> Optional[float]:
+    """
+    Converte buf[start:end] (ASCII 'ddd.ddd') em float sem criar strings.
+
+    Returns:
+        Valor numérico ou None se o campo estiver vazio/inválido
+    """
+    if start >= end:
+        return None
+
+    value = 0
+    scale = 1
+    seen_dot = False
+    for i in range(start, end):
+        b = buf[i]
+        if b == _DOT:
+            if seen_dot:
+                return None
+            seen_dot = True
+        elif 0x30 <= b <= 0x39:
+            value = value * 10 + (b - 0x30)
+            if seen_dot:
+                scale *= 10
+        else:
+            return None
+    return value / scale
+
+
+def _parse_coordinate(buf: bytearray, start: int, end: int, hemi: int) -> Optional[float]:
+    """
+    Converte campo NMEA 'dddmm.mmmm' + hemisfério (N/S/E/W) em graus decimais.
+    """
+    raw = _parse_decimal(buf, start, end)
+    if raw is None:
+        return None
+    degrees = int(raw // 100)
+    minutes = raw - degrees * 100
+    value = degrees + minutes / 60.0
+    if hemi == 0x53 or hemi == 0x57:  # 'S' ou 'W'
+        value = -value
+    return value
+
+
+# IDs das sentenças NMEA padrão na classe UBX 0xF0
+NMEA_MSG_IDS = {'GGA': 0x00, 'GLL': 0x01, 'GSA': 0x02, 'GSV': 0x03, 'RMC': 0x04, 'VTG': 0x05}
+
+
+def _ubx(msg_class: int, msg_id: int, payload: bytes) -> bytes:
+    """Monta um quadro UBX (sync, classe, ID, tamanho, payload, checksum Fletcher)."""
+    body = bytes((msg_class, msg_id)) + struct.pack('<H', len(payload)) + payload
+    ck_a = 0
+    ck_b = 0
+    for b in body:
+        ck_a = (ck_a + b) & 0xFF
+        ck_b = (ck_b + ck_a) & 0xFF
+    return b'\xB5\x62' + body + bytes((ck_a, ck_b))
+
+
+def ubx_cfg_rate(period_ms: int) -> bytes:
+    """
+    Monta um comando UBX-CFG-RATE (u-blox) para a taxa de navegação.
+
+    Args:
+        period_ms: Período de medição (100 ms = 10 Hz)
+    """
+    return _ubx(0x06, 0x08, struct.pack('<HHH', period_ms, 1, 1))  # measRate, navRate, timeRef=GPS
+
+
+def ubx_cfg_msg(sentence: str, rate: int) -> bytes:
+    """UBX-CFG-MSG: taxa de uma sentença NMEA na porta atual (0 = desligada)."""
+    return _ubx(0x06, 0x01, bytes((0xF0, NMEA_MSG_IDS[sentence], rate)))
+
+
+def ubx_cfg_prt(baud: int) -> bytes:
+    """UBX-CFG-PRT: UART1 em 8N1 no baud dado, entrada UBX+NMEA, saída UBX+NMEA."""
+    return _ubx(0x06, 0x00, struct.pack('<BBHIIHHHH', 1, 0, 0, 0x000008D0, baud, 0x0003, 0x0003, 0, 0))
+
+
+# ============================================================================
+# PARSER NMEA INCREMENTAL
+# ============================================================================
+
+class NMEAParser:
+    """
+    Parser NMEA incremental alimentado por bytes.
+
+    Mantém o último fix conhecido em atributos simples (lat, lon,
+    speed_kmh, fix_valid, satellites). Após cada sentença RMC válida
+    chama o callback on_fix(lat, lon, speed_kmh).
+    """
+
+    def __init__(self, on_fix: Optional[Callable[[float, float, float], None]] = None):
+        self.on_fix = on_fix
+
+        # Buffer pré-alocado da sentença (sem '$', '*' e checksum)
+        self._buf = bytearray(MAX_SENTENCE_LEN)
+        self._len = 0
+        self._state = _IDLE
+        self._checksum = 0
+        self._cs_received = 0
+
+        # Posição de cada vírgula na sentença atual (pré-alocado)
+        self._fields = [0] * 24
+
+        # Último fix conhecido
+        self.lat = 0.0
+        self.lon = 0.0
+        self.speed_kmh = 0.0
+        self.fix_valid = False
+        self.satellites = 0
+        self.fix_quality = 0
+
+        # Estatísticas
+        self.sentences_ok = 0
+        self.checksum_errors = 0
+        self.overflows = 0
+
+    def feed(self, data) -> None:
+        """Alimenta o parser com bytes vindos da serial (qualquer tamanho)."""
+        buf = self._buf
+        for b in data:
+            state = self._state
+
+            if b == _DOLLAR:
+                # Início de sentença sempre ressincroniza
+                self._state = _BODY
+                self._len = 0
+                self._checksum = 0
+                continue
+
+            if state == _IDLE:
+                continue
+
+            if state == _BODY:
+                if b == _STAR:
+                    self._state = _CS_HI
+                elif b == _CR or b == _LF:
+                    self._state = _IDLE  # Sentença sem checksum: descarta
+                elif self._len >= MAX_SENTENCE_LEN:
+                    self.overflows += 1
+                    self._state = _IDLE
+                else:
+                    buf[self._len] = b
+                    self._len += 1
+                    self._checksum ^= b
+
+            elif state == _CS_HI:
+                v = _hex_value(b)
+                if v < 0:
+                    self._state = _IDLE
+                else:
+                    self._cs_received = v << 4
+                    self._state = _CS_LO
+
+            elif state == _CS_LO:
+                v = _hex_value(b)
+                self._state = _IDLE
+                if v < 0:
+                    continue
+                if (self._cs_received | v) != self._checksum:
+                    self.checksum_errors += 1
+                    continue
+                self._process_sentence()
+
+    def _process_sentence(self) -> None:
+        """Interpreta a sentença completa armazenada em self._buf."""
+        buf = self._buf
+        end = self._len
+
+        # Indexa vírgulas (campo i vai de fields[i]+1 até fields[i+1])
+        fields = self._fields
+        n = 0
+        pos = buf.find(_COMMA, 0, end)
+        while pos >= 0 and n < len(fields) - 1:
+            fields[n] = pos
+            n += 1
+            pos = buf.find(_COMMA, pos + 1, end)
+        fields[n] = end  # Sentinela: fim do último campo
+
+        # Tipo da sentença: 'xxRMC' / 'xxGGA' (talker de 2 letras)
+        if buf.startswith(b'RMC', 2):
+            if n < 7:
+                return
+            self.sentences_ok += 1
+            self._process_rmc(buf, fields)
+        elif buf.startswith(b'GGA', 2):
+            if n < 7:
+                return
+            self.sentences_ok += 1
+            self._process_gga(buf, fields)
+
+    def _field(self, idx: int):
+        """Retorna (início, fim) do campo idx (1 = primeiro após o tipo)."""
+        return self._fields[idx - 1] + 1, self._fields[idx]
+
+    def _process_rmc(self, buf: bytearray, fields: list) -> None:
+        # $xxRMC,hhmmss.ss,A,llll.ll,a,yyyyy.yy,a,x.x(nós),x.x,ddmmyy,...
+        s, e = self._field(2)
+        self.fix_valid = (e > s and buf[s] == 0x41)  # 'A' = ativo
+        if not self.fix_valid:
+            return
+
+        s, e = self._field(4)
+        hemi_lat = buf[s] if e > s else 0
+        s, e = self._field(3)
+        lat = _parse_coordinate(buf, s, e, hemi_lat)
+
+        s, e = self._field(6)
+        hemi_lon = buf[s] if e > s else 0
+        s, e = self._field(5)
+        lon = _parse_coordinate(buf, s, e, hemi_lon)
+
+        s, e = self._field(7)
+        knots = _parse_decimal(buf, s, e)
+
+        if lat is None or lon is None:
+            return
+
+        self.lat = lat
+        self.lon = lon
+        if knots is not None:
+            self.speed_kmh = knots * KNOTS_TO_KMH
+
+        if self.on_fix:
+            self.on_fix(self.lat, self.lon, self.speed_kmh)
+
+    def _process_gga(self, buf: bytearray, fields: list) -> None:
+        # $xxGGA,hhmmss.ss,llll.ll,a,yyyyy.yy,a,q,nn,hdop,alt,M,...
+        s, e = self._field(6)
+        quality = _parse_decimal(buf, s, e)
+        self.fix_quality = int(quality) if quality is not None else 0
+
+        s, e = self._field(7)
+        sats = _parse_decimal(buf, s, e)
+        self.satellites = int(sats) if sats is not None else 0
+
+
+# ============================================================================
+# LEITOR SERIAL (THREAD)
+# ============================================================================
+
+class GPSReader:
+    """
+    Lê o GPS serial em background e repassa cada fix para on_fix.
+    """
+
+    def __init__(self, port: str, baud: int = GPS_BAUD,
+                 on_fix: Optional[Callable[[float, float, float], None]] = None):
+        self.port = port
+        self.baud = baud
+        self.serial_conn: Optional[serial.Serial] = None
+        self.parser = NMEAParser(on_fix=on_fix)
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def connect(self) -> bool:
+        """Abre a serial do GPS e configura baud, sentenças e taxa de navegação."""
+        try:
+            self.serial_conn = serial.Serial(
+                port=self.port,
+                baudrate=self.baud,
+                timeout=0.5
+            )
+            print(f"[GPS] Conectado em {self.port} @ {self.baud} baud")
+        except Exception as e:
+            print(f"[GPS] Erro ao conectar: {e}")
+            return False
+
+        try:
+            if GPS_BAUD_FAST and self.baud != GPS_BAUD_FAST:
+                self.serial_conn.write(ubx_cfg_prt(GPS_BAUD_FAST))
+                self.serial_conn.flush()
+                time.sleep(PORT_SWITCH_S)
+                self.serial_conn.baudrate = GPS_BAUD_FAST  # pyserial reconfigura a porta aberta
+                self.serial_conn.reset_input_buffer()
+                self.baud = GPS_BAUD_FAST
+                print(f"[GPS] Serial reconfigurada para {self.baud} baud")
+            for sentence in GPS_DISABLED_SENTENCES:
+                self.serial_conn.write(ubx_cfg_msg(sentence, 0))
+            self.serial_conn.write(ubx_cfg_rate(1000 // GPS_RATE_HZ))
+        except Exception as e:
+            print(f"[GPS] Aviso: não foi possível configurar {self.baud} baud / {GPS_RATE_HZ} Hz: {e}")
+        return True
+
+    def reception_loop(self):
+        """Loop de leitura (thread separada)."""
+        print("[GPS] Loop de recepção iniciado")
+
+        while self.running:
+            try:
+                # Bloqueia até chegar ao menos 1 byte, depois lê o que houver
+                waiting = self.serial_conn.in_waiting
+                chunk = self.serial_conn.read(min(max(waiting, 1), READ_CHUNK))
+                if chunk:
+                    self.parser.feed(chunk)
+            except Exception as e:
+                print(f"[GPS] Erro no loop: {e}")
+                time.sleep(0.5)
+
+        print("[GPS] Loop de recepção finalizado")
+
+    def start(self) -> bool:
+        """Inicia leitura em background."""
+        if not self.connect():
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self.reception_loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Para leitura e fecha a serial."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        if self.serial_conn:
+            self.serial_conn.close()
+
+    def get_statistics(self) -> dict:
+        """Retorna estatísticas do parser."""
+        return {
+            'sentences_ok': self.parser.sentences_ok,
+            'checksum_errors': self.parser.checksum_errors,
+            'fix_valid': self.parser.fix_valid,
+            'satellites': self.parser.satellites,
+        }
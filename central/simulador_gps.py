@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+simulador_gps.py - GPS virtual (pseudo-terminal) para testar a Central
+
+Cria um par de pseudo-terminais (pty) e escreve sentenças NMEA RMC + GGA
+no lado mestre, simulando um carro dando voltas num circuito oval que
+passa pela linha de chegada configurada em config_pucpr_tool.ini.
+
+Uso:
+    python3 simulador_gps.py              # 10 Hz, volta de ~30 s
+    python3 simulador_gps.py --rate 5 --lap 45
+
+    # Em outro terminal, use a porta impressa:
+    python3 central.py --gps-port /dev/pts/N
+
+Linux/macOS apenas (usa os.openpty).
+"""
+
+import argparse
+import math
+import os
+import time
+
+# Linha de chegada padrão (mesma de config/config_pucpr_tool.ini)
+START_FINISH_LAT = -25.45000
+START_FINISH_LON = -49.23000
+
+TRACK_RADIUS_M = 150.0   # Raio do circuito simulado
+M_PER_DEG_LAT = 111111.0
+
+
+def nmea_sentence(body: str) -> bytes:
+    """Adiciona '$', checksum XOR e CRLF ao corpo da sentença."""
+    checksum = 0
+    for ch in body.encode('ascii'):
+        checksum ^= ch
+    return f"${body}*{checksum:02X}\r\n".encode('ascii')
+
+
+def format_coord(value: float, is_lat: bool) -> tuple:
+    """Converte graus decimais em ('ddmm.mmmm', hemisfério)."""
+    hemi = ('N' if value >= 0 else 'S') if is_lat else ('E' if value >= 0 else 'W')
+    value = abs(value)
+    degrees = int(value)
+    minutes = (value - degrees) * 60.0
+    if is_lat:
+        return f"{degrees:02d}{minutes:07.4f}", hemi
+    return f"{degrees:03d}{minutes:07.4f}", hemi
+
+
+def position_on_track(t: float, lap_time: float) -> tuple:
+    """
+    Posição (lat, lon) e velocidade (km/h) no instante t.
+
+    O círculo é tangente à linha de chegada em t = 0, então cada volta
+    cruza o ponto (START_FINISH_LAT, START_FINISH_LON).
+    """
+    angle = 2 * math.pi * (t % lap_time) / lap_time
+    m_per_deg_lon = M_PER_DEG_LAT * math.cos(math.radians(START_FINISH_LAT))
+    dx = TRACK_RADIUS_M * math.sin(angle)
+    dy = TRACK_RADIUS_M * (1 - math.cos(angle))
+    lat = START_FINISH_LAT + dy / M_PER_DEG_LAT
+    lon = START_FINISH_LON + dx / m_per_deg_lon
+    speed_kmh = (2 * math.pi * TRACK_RADIUS_M / lap_time) * 3.6
+    return lat, lon, speed_kmh
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GPS NMEA virtual via pty")
+    parser.add_argument('--rate', type=float, default=10.0, help="Taxa de fix (Hz)")
+    parser.add_argument('--lap', type=float, default=30.0, help="Tempo de volta (s)")
+    args = parser.parse_args()
+
+    master, slave = os.openpty()
+    print("=== SIMULADOR GPS PUCPR RACING ===")
+    print(f"Porta virtual: {os.ttyname(slave)}")
+    print(f"Taxa: {args.rate:.0f} Hz | Volta: {args.lap:.0f} s")
+    print("Ctrl+C para parar\n")
+
+    interval = 1.0 / args.rate
+    t0 = time.time()
+    next_tick = t0
+
+    try:
+        while True:
+            now = time.time()
+            t = now - t0
+            lat, lon, speed_kmh = position_on_track(t, args.lap)
+
+            utc = time.gmtime(now)
+            hhmmss = f"{utc.tm_hour:02d}{utc.tm_min:02d}{utc.tm_sec:02d}.{int((now % 1) * 100):02d}"
+            ddmmyy = f"{utc.tm_mday:02d}{utc.tm_mon:02d}{utc.tm_year % 100:02d}"
+            lat_s, lat_h = format_coord(lat, is_lat=True)
+            lon_s, lon_h = format_coord(lon, is_lat=False)
+            knots = speed_kmh / 1.852
+
+            rmc = nmea_sentence(f"GPRMC,{hhmmss},A,{lat_s},{lat_h},{lon_s},{lon_h},"
+                                f"{knots:.2f},0.0,{ddmmyy},,,A")
+            gga = nmea_sentence(f"GPGGA,{hhmmss},{lat_s},{lat_h},{lon_s},{lon_h},"
+                                f"1,09,0.9,910.0,M,0.0,M,,")
+            os.write(master, rmc + gga)
+
+            next_tick += interval
+            sleep_time = next_tick - time.time()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+    except KeyboardInterrupt:
+        print("\nSimulador GPS encerrado.")
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+if __name__ == '__main__':
+    main()
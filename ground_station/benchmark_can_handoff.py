@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Entrega CAN → GUI - PUCPR Racing
+
+Compara, com o mesmo DBC e o mesmo armazenamento (MultiRateStore), os
+dois jeitos de a thread CAN entregar mensagens à GUI:
+- Fila de dicts: queue.Queue.put((timestamp, chegada, frame, dict)) por
+  mensagem e get_nowait() em loop no tick da GUI (implementação anterior)
+- Blocos: CanSource (ler_can() acumula em blocos de colunas e publica
+  pelo BlockHandoff, SPSC); a GUI copia lote a lote (_ingest_batches)
+
+O barramento é sintético (frames do DBC pré-codificados, entregues na
+taxa agregada pedida) e a "GUI" é uma thread que a cada 100 ms consome
+e depois ocupa a CPU por --draw-ms (simula o redesenho do Tk, que
+disputa o GIL com a thread CAN).
+
+Uso:
+    python benchmark_can_handoff.py
+    python benchmark_can_handoff.py --rates 1000 5000 10000 --duration 5
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+import types
+
+import can
+import cantools
+import numpy as np
+
+from core import telemetry_realtime
+from core.clock_sync import ClockSync
+from core.live_store import MultiRateStore
+from core.telemetry_sources import CanSource
+
+DBC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'pucpr.dbc')
+GUI_TICK = 0.1
+
+
+class SyntheticBus:
+    """Entrega frames pré-codificados a `rate` msg/s, com msg.timestamp de envio."""
+
+    def __init__(self, messages: list, rate: float):
+        self.messages = messages
+        self.interval = 1.0 / rate
+        self.index = 0
+        self.t0 = None
+
+    def recv(self, timeout: float = None):
+        now = time.perf_counter()
+        if self.t0 is None:
+            self.t0 = now
+        due = self.t0 + self.index * self.interval
+        if due > now:
+            wait = due - now
+            if timeout is not None and wait > timeout:
+                time.sleep(timeout)
+                return None
+            time.sleep(wait)
+        template = self.messages[self.index % len(self.messages)]
+        self.index += 1
+        return can.Message(arbitration_id=template.arbitration_id, data=template.data,
+                           is_extended_id=False, timestamp=time.time())
+
+
+def build_messages(db) -> list:
+    """Uma mensagem de cada frame do DBC com valores no meio da faixa."""
+    messages = []
+    for frame in db.messages:
+        values = {sig.name: ((sig.minimum or 0) + (sig.maximum or 0)) / 2 for sig in frame.signals}
+        messages.append(can.Message(arbitration_id=frame.frame_id, data=frame.encode(values),
+                                    is_extended_id=False))
+    return messages
+
+
+def reader_queue(bus, db, q: queue.Queue, stop: threading.Event):
+    """Implementação anterior: um dict na fila por mensagem."""
+    while not stop.is_set():
+        msg = bus.recv(0.5)
+        if msg:
+            rx_time = time.time()
+            frame = db.get_message_by_frame_id(msg.arbitration_id)
+            q.put((msg.timestamp or rx_time, rx_time, frame.name, frame.decode(msg.data)))
+
+
+def consume_queue(app) -> int:
+    """Consumo anterior: get_nowait em loop + uma amostra por mensagem."""
+    n = 0
+    try:
+        while not app.live_queue.empty():
+            msg_ts, rx_time, frame_name, dados = app.live_queue.get_nowait()
+            app.can_clock.update(msg_ts, rx_time)
+            app.live_data_storage.append(frame_name, app.can_clock.to_local(msg_ts) - app.start_time_live, dados)
+            n += 1
+    except queue.Empty:
+        pass
+    return n
+
+
+def consume_blocks(app) -> int:
+    n, _ = telemetry_realtime._ingest_batches(app, app.live_source.poll())
+    return n
+
+
+def busy(ms: float):
+    end = time.perf_counter() + ms / 1000.0
+    while time.perf_counter() < end:
+        pass
+
+
+def run(mode: str, db, messages: list, rate: float, duration: float, draw_ms: float) -> dict:
+    app = types.SimpleNamespace(
+        live_data_storage=MultiRateStore(200000), can_clock=ClockSync(),
+        start_time_live=time.time(), live_queue=queue.Queue())
+    telemetry_realtime.reset_live_stats(app)
+    bus = SyntheticBus(messages, rate)
+    if mode == 'fila':
+        stop = threading.Event()
+        reader = threading.Thread(target=reader_queue, args=(bus, db, app.live_queue, stop), daemon=True)
+        reader.start()
+        consume = consume_queue
+    else:
+        app.live_source = CanSource(bus=bus, db=db, use_process=False)
+        app.live_source.start()
+        stop, reader = app.live_source.stop_event, app.live_source.thread
+        consume = consume_blocks
+
+    tick_ms = []
+    stored = 0
+    t_end = time.perf_counter() + duration
+    while time.perf_counter() < t_end:
+        t0 = time.perf_counter()
+        stored += consume(app)
+        tick_ms.append((time.perf_counter() - t0) * 1000.0)
+        busy(draw_ms)
+        time.sleep(max(0.0, GUI_TICK - (time.perf_counter() - t0)))
+    stop.set()
+    reader.join(timeout=2.0)
+    offered = bus.index
+    return {
+        'offered_hz': offered / duration,
+        'stored_hz': stored / duration,
+        'ratio': stored / max(offered, 1),
+        'tick_p50_ms': float(np.percentile(tick_ms, 50)),
+        'tick_max_ms': float(np.max(tick_ms)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da entrega CAN → GUI")
+    parser.add_argument('--rates', type=float, nargs='+', default=[1000, 5000],
+                        help="Taxas agregadas do barramento (msg/s)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Segundos por medição")
+    parser.add_argument('--draw-ms', type=float, default=20.0,
+                        help="CPU ocupada pela GUI a cada tick (simula o redesenho)")
+    args = parser.parse_args()
+
+    db = cantools.database.load_file(DBC_PATH)
+    messages = build_messages(db)
+
+    print("=== BENCHMARK ENTREGA CAN → GUI ===")
+    print(f"{len(messages)} frames do DBC | tick da GUI {GUI_TICK * 1000:.0f} ms + "
+          f"{args.draw_ms:.0f} ms de redesenho | {args.duration:.0f} s por medição\n")
+    print(f"{'Modo':<8} {'Oferecido':>10} {'Armazenado':>11} {'%':>7} {'Tick p50':>9} {'Tick máx':>9}")
+    for rate in args.rates:
+        for mode in ('fila', 'blocos'):
+            r = run(mode, db, messages, rate, args.duration, args.draw_ms)
+            print(f"{mode:<8} {r['offered_hz']:>8.0f}/s {r['stored_hz']:>9.0f}/s "
+                  f"{r['ratio'] * 100:>6.1f}% {r['tick_p50_ms']:>6.2f} ms {r['tick_max_ms']:>6.2f} ms")
+        print()
+    print("Tick = tempo da GUI para tirar as mensagens da entrega e gravar no armazenamento.")
+
+
+if __name__ == '__main__':
+    main()
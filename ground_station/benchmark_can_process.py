@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark Thread vs Processo Decodificador CAN - PUCPR Racing
+
+Mede quanto o trabalho da GUI atrasa a recepção CAN nos dois modos de
+telemetry_realtime:
+- thread:   ler_can() numa thread do processo da GUI (BlockHandoff)
+- processo: CanDecoderProcess (recepção + DBC noutro processo, anel em
+            memória compartilhada)
+
+Um processo emissor manda os frames do DBC por UDP multicast (a mesma
+interface do simulador no Windows) na taxa pedida. O processo principal
+faz o papel da GUI: a cada 100 ms consome o que chegou e ocupa a CPU por
+--draw-ms com código Python (como um redesenho do matplotlib, que segura
+o GIL).
+
+Atraso = instante da decodificação - instante de chegada no socket
+(msg.timestamp do kernel). Perdidas = enviadas - armazenadas.
+
+Uso:
+    python benchmark_can_process.py
+    python benchmark_can_process.py --rates 1000 5000 --draw-ms 60
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import can
+import cantools
+import numpy as np
+
+from core.block_handoff import BlockHandoff
+from core.can_process import CanDecoderProcess, STATE_RUNNING, _MP
+from core.telemetry_sources import ler_can
+
+DBC_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'pucpr.dbc'))
+BUS_KWARGS = {'channel': '239.0.0.1', 'interface': 'udp_multicast'}
+GUI_TICK = 0.1
+WARMUP = 1.0
+
+
+def emissor(rate: float, duration: float, start_at: float, sent):
+    """Processo emissor: frames do DBC em round-robin na taxa agregada `rate`."""
+    db = cantools.database.load_file(DBC_PATH)
+    messages = []
+    for frame in db.messages:
+        values = {sig.name: ((sig.minimum or 0) + (sig.maximum or 0)) / 2 for sig in frame.signals}
+        messages.append(can.Message(arbitration_id=frame.frame_id, data=frame.encode(values),
+                                    is_extended_id=False))
+    bus = can.interface.Bus(**BUS_KWARGS)
+    time.sleep(max(0.0, start_at - time.time()))
+    t0 = time.perf_counter()
+    n = int(rate * duration)
+    for i in range(n):
+        due = t0 + i / rate
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        bus.send(messages[i % len(messages)])
+    sent.value = n
+    bus.shutdown()
+
+
+def busy(ms: float):
+    end = time.perf_counter() + ms / 1000.0
+    x = 0
+    while time.perf_counter() < end:
+        x += 1
+
+
+def run(mode: str, db, rate: float, duration: float, draw_ms: float) -> dict:
+    stop = threading.Event()
+    decoder = None
+    if mode == 'thread':
+        handoff = BlockHandoff()
+        bus = can.interface.Bus(**BUS_KWARGS)
+        reader = threading.Thread(target=ler_can, args=(bus, db, handoff, stop), daemon=True)
+        reader.start()
+    else:
+        decoder = CanDecoderProcess(db, DBC_PATH, bus_kwargs=BUS_KWARGS)
+        decoder.start()
+        handoff = decoder.reader
+        while decoder.ring.state != STATE_RUNNING and not decoder.failed:
+            time.sleep(0.05)
+    time.sleep(WARMUP)  # Tempo para o socket entrar no grupo multicast
+
+    sent = _MP.Value('q', 0)
+    start_at = time.time() + 2.0  # Depois do import do cantools no emissor
+    sender = _MP.Process(target=emissor, args=(rate, duration, start_at, sent))
+    sender.start()
+
+    delays, stored = [], 0
+    t_end = None
+    while t_end is None or time.time() < t_end:
+        if t_end is None and not sender.is_alive():
+            t_end = time.time() + 0.5  # Últimas mensagens em trânsito
+        t0 = time.perf_counter()
+        blocks = handoff.drain()
+        for block in blocks:
+            delays.append(block.rx_times[:block.n] - block.timestamps[:block.n])
+            stored += block.n
+        handoff.release(blocks)
+        busy(draw_ms)
+        time.sleep(max(0.0, GUI_TICK - (time.perf_counter() - t0)))
+    sender.join()
+
+    if decoder is not None:
+        decoder.stop()
+    else:
+        stop.set()
+        reader.join(timeout=2.0)
+        for block in handoff.drain():
+            delays.append(block.rx_times[:block.n] - block.timestamps[:block.n])
+            stored += block.n
+        bus.shutdown()
+    delays_ms = np.concatenate(delays) * 1000.0 if delays else np.zeros(1)
+    return {
+        'sent': sent.value,
+        'stored': stored,
+        'p50': float(np.percentile(delays_ms, 50)),
+        'p99': float(np.percentile(delays_ms, 99)),
+        'max': float(np.max(delays_ms)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thread vs processo decodificador CAN")
+    parser.add_argument('--rates', type=float, nargs='+', default=[1000, 5000],
+                        help="Taxas agregadas do barramento (msg/s)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Segundos de envio por medição")
+    parser.add_argument('--draw-ms', type=float, default=40.0,
+                        help="CPU ocupada pela GUI a cada tick de 100 ms")
+    args = parser.parse_args()
+
+    db = cantools.database.load_file(DBC_PATH)
+    print("=== BENCHMARK THREAD vs PROCESSO DECODIFICADOR CAN ===")
+    print(f"UDP multicast {BUS_KWARGS['channel']} | GUI: {args.draw_ms:.0f} ms de CPU a cada "
+          f"{GUI_TICK * 1000:.0f} ms | {args.duration:.0f} s por medição | {os.cpu_count()} CPU(s)\n")
+    print(f"{'Modo':<9} {'Taxa':>7} {'Enviadas':>9} {'Perdidas':>9} {'Atraso p50':>11} {'p99':>9} {'máx':>9}")
+    for rate in args.rates:
+        for mode in ('thread', 'processo'):
+            r = run(mode, db, rate, args.duration, args.draw_ms)
+            print(f"{mode:<9} {rate:>5.0f}/s {r['sent']:>9} {r['sent'] - r['stored']:>9} "
+                  f"{r['p50']:>8.2f} ms {r['p99']:>6.2f} ms {r['max']:>6.2f} ms")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark das Atualizações dos Dashboards - PUCPR Racing
+
+Conta as chamadas Tk (configure/set) que os dashboards ao vivo fazem por
+segundo, com os mesmos widgets e formatos de gui.dashboards:
+- sempre:   comportamento anterior (todo widget de todo canal recebido é
+            reconfigurado a cada tick, mesmo com o texto igual)
+- ligações: DashboardBinder (só diferenças, taxa máxima por widget)
+
+Os widgets são falsos (só contam as chamadas): no Tk real cada chamada
+ainda dispara layout e redesenho do widget no CustomTkinter.
+
+Uso:
+    python benchmark_dashboards.py
+    python benchmark_dashboards.py --seconds 30 --fps 30
+"""
+
+import argparse
+import time
+import types
+
+import numpy as np
+
+from gui import dashboards
+from gui.dashboard_bindings import DashboardBinder
+
+
+class FakeWidget:
+    calls = 0
+
+    def configure(self, **kwargs):
+        FakeWidget.calls += 1
+
+    def set(self, value):
+        FakeWidget.calls += 1
+
+
+class AlwaysBinder(DashboardBinder):
+    """Sem cache nem taxa máxima: reproduz a atualização anterior."""
+
+    def _apply(self, binding, now):
+        value = binding.value
+        if binding.fmt is not None:
+            binding.widget.configure(text=binding.fmt.format(value))
+        else:
+            binding.widget.set(min(value / binding.full_scale, 1.0))
+            if binding.color_fn is not None:
+                binding.widget.configure(progress_color=binding.color_fn(value))
+
+
+def make_app():
+    app = types.SimpleNamespace()
+    for _, attr, _, _ in dashboards.DASHBOARD_LABELS:
+        setattr(app, attr, FakeWidget())
+    for _, attr, _, _ in dashboards.DASHBOARD_BARS:
+        setattr(app, attr, FakeWidget())
+    return app
+
+
+def signals(t: float, rng) -> dict:
+    """Canais com dinâmica parecida com a do carro (alguns quase parados)."""
+    rpm = 9000 + 3500 * np.sin(0.8 * t) + rng.normal(0, 30)
+    return {
+        'RPM': rpm, 'Temperatura': 92 + 0.01 * t, 'ThrottlePos': 50 + 50 * np.sin(0.8 * t),
+        'Lambda': 0.95 + rng.normal(0, 0.01), 'SteeringAngle': 30 * np.sin(0.5 * t) + rng.normal(0, 0.2),
+        'BrakePressure': max(0.0, -80 * np.sin(0.8 * t)), 'AccelX': 0.8 * np.sin(0.8 * t) + rng.normal(0, 0.02),
+        'AccelY': 1.2 * np.sin(0.5 * t) + rng.normal(0, 0.02),
+        **{f'WheelSpeed_{w}': 80 + 40 * np.sin(0.8 * t) + rng.normal(0, 0.3) for w in ('FL', 'FR', 'RL', 'RR')},
+        **{f'SuspensionPos_{w}': 25 + 5 * np.sin(3 * t) + rng.normal(0, 0.5) for w in ('FL', 'FR', 'RL', 'RR')},
+    }
+
+
+def run(binder_cls, seconds: float, fps: float) -> dict:
+    app = make_app()
+    binder = app.dashboard_binder = binder_cls()
+    for canal, attr, fmt, max_hz in dashboards.DASHBOARD_LABELS:
+        binder.bind_text(canal, getattr(app, attr), fmt, max_hz)
+    for canal, attr, full_scale, color_fn in dashboards.DASHBOARD_BARS:
+        binder.bind_progress(canal, getattr(app, attr), full_scale, color_fn)
+
+    rng = np.random.default_rng(0)
+    FakeWidget.calls = 0
+    elapsed = 0.0
+    ticks = int(seconds * fps)
+    for i in range(ticks):
+        t = i / fps
+        values = signals(t, rng)
+        t0 = time.perf_counter()
+        binder.update(values, now=t)
+        elapsed += time.perf_counter() - t0
+    return {'calls_s': FakeWidget.calls / seconds, 'tick_us': elapsed / ticks * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das atualizações dos dashboards")
+    parser.add_argument('--seconds', type=float, default=60.0, help="Segundos simulados")
+    parser.add_argument('--fps', type=float, default=30.0, help="Ticks da GUI por segundo")
+    args = parser.parse_args()
+
+    n_widgets = len(dashboards.DASHBOARD_LABELS) + len(dashboards.DASHBOARD_BARS)
+    print("=== BENCHMARK DASHBOARDS ===")
+    print(f"{n_widgets} widgets | {args.fps:.0f} ticks/s | {args.seconds:.0f} s simulados\n")
+    print(f"{'Modo':<9} {'Chamadas Tk/s':>14} {'Tick (Python)':>14}")
+    for name, cls in (('sempre', AlwaysBinder), ('ligações', DashboardBinder)):
+        r = run(cls, args.seconds, args.fps)
+        print(f"{name:<9} {r['calls_s']:>14.0f} {r['tick_us']:>11.0f} µs")
+
+
+if __name__ == '__main__':
+    main()
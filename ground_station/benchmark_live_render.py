@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Gráfico Ao Vivo (Blitting vs Redesenho Completo) - PUCPR Racing
+
+Monta a mesma figura da aba ao vivo (8 x 5.5 pol, 100 dpi, via
+update_live_plot_style) num canvas Agg fora da tela e mede o tempo de
+cada quadro, com dados chegando como no CAN (4 canais em frames de taxas
+diferentes):
+- completo: caminho anterior (set_data, relim/autoscale em todos os
+  eixos, X deslizando a cada quadro, figura inteira redesenhada)
+- blit:     render_live_window + LiveBlitRenderer (limites com
+  histerese, só as linhas redesenhadas), sem decimação
+- blit+M4:  idem, com a decimação M4 das linhas (LIVE_DECIMATE)
+
+Com --history o Auto-Scroll fica desligado e o eixo X mostra todo o
+histórico (--minutes de dados), como ao navegar depois de uma sessão.
+
+No Tk o blit ainda copia a região para a tela (PhotoImage); aqui o canvas
+Agg não tem tela, então o número do blit é o custo do matplotlib.
+
+Uso:
+    python benchmark_live_render.py
+    python benchmark_live_render.py --frames 600 --absolute
+    python benchmark_live_render.py --history --minutes 10
+"""
+
+import argparse
+import time
+import types
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from core import telemetry_realtime
+from core.constants import COLOR_BG_TERTIARY
+from core.live_store import MultiRateStore
+from gui.live_blit import LiveBlitRenderer
+from gui.live_plotting import update_live_plot_style
+
+FPS = 30.0
+# Canal -> (frame, taxa em Hz)
+CHANNELS = {'RPM': ('Motor', 100.0), 'WheelSpeed_FL': ('Rodas', 100.0),
+            'SuspensionPos_FL': ('Suspensao', 200.0), 'AccelX': ('IMU', 500.0)}
+
+
+class _Switch:
+    def __init__(self, value: int):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def make_app(normalized: bool, blit: bool):
+    fig = Figure(figsize=(8, 5.5), dpi=100, facecolor=COLOR_BG_TERTIARY)
+    app = types.SimpleNamespace(
+        fig_live=fig, canvas_live=FigureCanvasAgg(fig), ax_live=fig.add_subplot(111),
+        switch_normalize=_Switch(1 if normalized else 0), selected_live_channels=list(CHANNELS),
+        live_data_storage=MultiRateStore(), auto_scroll=True, live_lines={}, live_axes={})
+    if blit:
+        app.live_renderer = LiveBlitRenderer(app.canvas_live)
+    telemetry_realtime.reset_live_stats(app)
+    return app
+
+
+def feed(app, t_from: float, t_to: float):
+    """Acrescenta os frames de [t_from, t_to) de cada canal (sinais sintéticos)."""
+    for k, (canal, (frame, rate)) in enumerate(CHANNELS.items()):
+        t = np.arange(np.ceil(t_from * rate), np.ceil(t_to * rate)) / rate
+        if len(t):
+            y = (k + 1) * 100.0 * np.sin(2 * np.pi * 0.3 * (k + 1) * t) + np.random.normal(0, 5, len(t))
+            app.live_data_storage.extend(frame, t, {canal: y})
+            app.live_stats.extend(t, {canal: y})
+
+
+def render_full(app):
+    """Caminho anterior: tudo redesenhado a cada quadro."""
+    store = app.live_data_storage
+    now = store.last_time()
+    series = store.window(now - 12.0 if app.auto_scroll else float('-inf'), app.live_lines.keys())
+    for canal, line in app.live_lines.items():
+        if canal in series:
+            line.set_data(*series[canal])
+    for ax in dict.fromkeys(app.live_axes.values()):
+        ax.relim()
+        ax.autoscale_view(scalex=False, scaley=True)
+    if app.auto_scroll:
+        app.ax_live.set_xlim(max(0.0, now - 10.0), max(now, 10.0))
+    app.canvas_live.draw()
+
+
+def run(mode: str, normalized: bool, frames: int, history_s: float = None) -> dict:
+    app = make_app(normalized, blit=(mode != 'completo'))
+    telemetry_realtime.LIVE_DECIMATE = (mode == 'blit+M4')
+    t_data = history_s or 10.0
+    for t0 in np.arange(0.0, t_data, 10.0):
+        feed(app, t0, min(t0 + 10.0, t_data))
+    update_live_plot_style(app)
+    if history_s:
+        app.auto_scroll = False
+        app.ax_live.set_xlim(0.0, t_data + frames / FPS)
+    app.canvas_live.draw()
+    times, full = [], 0
+    for _ in range(frames):
+        feed(app, t_data, t_data + 1.0 / FPS)
+        t_data += 1.0 / FPS
+        t0 = time.perf_counter()
+        if mode != 'completo':
+            telemetry_realtime.render_live_window(app)
+            full += app.live_renderer.frame_full[-1]
+        else:
+            render_full(app)
+            full += 1
+        times.append((time.perf_counter() - t0) * 1000.0)
+    times = np.array(times)
+    return {'p50': float(np.percentile(times, 50)), 'p95': float(np.percentile(times, 95)),
+            'max': float(times.max()), 'full': full / frames}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do gráfico ao vivo")
+    parser.add_argument('--frames', type=int, default=300, help="Quadros por medição (30 por segundo de dados)")
+    parser.add_argument('--absolute', action='store_true', help="Modo absoluto (eixo Y único) em vez do normalizado")
+    parser.add_argument('--history', action='store_true', help="Auto-Scroll desligado, histórico inteiro no eixo X")
+    parser.add_argument('--minutes', type=float, default=5.0, help="Minutos de histórico com --history")
+    args = parser.parse_args()
+    normalized = not args.absolute
+    history_s = args.minutes * 60.0 if args.history else None
+
+    print("=== BENCHMARK GRÁFICO AO VIVO ===")
+    print(f"{len(CHANNELS)} canais, modo {'normalizado (4 eixos Y)' if normalized else 'absoluto'}, "
+          f"{args.frames} quadros a {FPS:.0f} FPS de dados"
+          + (f", histórico de {args.minutes:.0f} min visível" if history_s else ", Auto-Scroll") + "\n")
+    print(f"{'Modo':<9} {'Quadro p50':>11} {'p95':>9} {'máx':>9} {'FPS máx':>8} {'Completos':>10}")
+    for mode in ('completo', 'blit', 'blit+M4'):
+        r = run(mode, normalized, args.frames, history_s)
+        print(f"{mode:<9} {r['p50']:>8.2f} ms {r['p95']:>6.2f} ms {r['max']:>6.2f} ms "
+              f"{1000.0 / r['p50']:>8.0f} {r['full'] * 100:>9.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,12 @@ Permite alternar entre diferentes fontes de dados em tempo real:
 - CAN Bus (UDP Multicast / SocketCAN)
 - LoRa (Serial USB)
 - Simulador (para testes)
+- Replay de um log CSV (sem hardware nem simulador)
+
+Cada fonte tem um 'kind' (classe em core/telemetry_sources.py) e a sua
+'config'. O telemetry_source.json pode trazer uma chave 'config' que
+substitui valores da fonte (ex.: {"path": "...", "speed": 4.0} no replay,
+{"replay_path": "capturas_lora/x.lora"} no LoRa).
 """
 
 import json
@@ -17,7 +23,7 @@ SOURCES = {
     'can_udp': {
         'name': 'CAN Bus (UDP Multicast)',
         'description': 'Recebe mensagens CAN via rede UDP (Windows)',
-        'module': 'telemetry_realtime',
+        'kind': 'can',
         'config': {
             'interface': 'udp_multicast',
             'channel': '239.0.0.1'
@@ -26,7 +32,7 @@ SOURCES = {
     'can_socketcan': {
         'name': 'CAN Bus (SocketCAN)',
         'description': 'Recebe mensagens CAN diretamente (Linux/Raspberry Pi)',
-        'module': 'telemetry_realtime',
+        'kind': 'can',
         'config': {
             'interface': 'socketcan',
             'channel': 'can0'
@@ -35,7 +41,7 @@ SOURCES = {
     'lora_serial': {
         'name': 'LoRa (Serial USB)',
         'description': 'Recebe pacotes LoRa via porta serial',
-        'module': 'lora_receiver',
+        'kind': 'lora',
         'config': {
             'port': None,  # Auto-detecta
             'baud_rate': 115200
@@ -44,11 +50,20 @@ SOURCES = {
     'simulator': {
         'name': 'Simulador CAN',
         'description': 'Dados simulados para testes (rodar simulador_carro.py)',
-        'module': 'telemetry_realtime',
+        'kind': 'can',
         'config': {
             'interface': 'udp_multicast',
             'channel': '239.0.0.1'
         }
+    },
+    'replay_log': {
+        'name': 'Replay de Log (CSV)',
+        'description': 'Reproduz um log CSV como se fosse ao vivo (ritmo original ou acelerado)',
+        'kind': 'replay_log',
+        'config': {
+            'path': '../data/exemplo_log_pucpr_realista.csv',
+            'speed': 1.0  # 0 = o mais rápido possível
+        }
     }
 }
 
@@ -70,13 +85,16 @@ def load_config():
 
 
 def save_config(source: str):
-    """Salva configuração escolhida."""
+    """Salva configuração escolhida (mantém a 'config' salva se a fonte não mudou)."""
     from datetime import datetime
     
+    current = load_config()
     config = {
         'source': source,
         'last_updated': datetime.now().isoformat()
     }
+    if current.get('source') == source and current.get('config'):
+        config['config'] = current['config']
     
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config, indent=2, fp=f)
@@ -105,7 +123,7 @@ def interactive_config():
     # Solicita escolha
     while True:
         try:
-            choice = input("Escolha uma fonte (1-4) ou 'q' para sair: ").strip()
+            choice = input(f"Escolha uma fonte (1-{len(SOURCES)}) ou 'q' para sair: ").strip()
             
             if choice.lower() == 'q':
                 print("Saindo sem alterar configuração.")
@@ -139,6 +157,12 @@ def interactive_config():
                         print("2. Em outro terminal, rode: python main.py")
                         print("3. Clique em 'Iniciar Telemetria' na aba Tempo Real")
                     
+                    elif source_key == 'replay_log':
+                        print(f"1. Log reproduzido: {SOURCES[source_key]['config']['path']}")
+                        print("   (outro arquivo/velocidade: chave 'config' no telemetry_source.json)")
+                        print("2. Inicie a aplicação: python main.py")
+                        print("3. Clique em 'Iniciar Telemetria' na aba Tempo Real")
+                    
                     elif 'can' in source_key:
                         print("1. Conecte o dispositivo CAN")
                         print("2. Verifique a interface de rede CAN")
@@ -153,7 +177,7 @@ def interactive_config():
                 print("Opção inválida. Tente novamente.")
         
         except ValueError:
-            print("Entrada inválida. Digite um número de 1 a 4.")
+            print(f"Entrada inválida. Digite um número de 1 a {len(SOURCES)}.")
         except KeyboardInterrupt:
             print("\n\nOperação cancelada.")
             break
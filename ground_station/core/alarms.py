@@ -0,0 +1,174 @@
+"""
+Alarmes de Limite da Telemetria Ao Vivo - PUCPR Racing
+
+Responsável por:
+- Avaliar regras de limite (ex.: sobregiro, pico de freio) em TODAS as
+  amostras recebidas, no lote inteiro com NumPy, e não só no valor que o
+  tick da GUI por acaso mostrou
+- Histerese (liga no limite, desliga só depois de voltar além da folga),
+  duração mínima (filtra ruído) e retenção (o alarme fica marcado até o
+  usuário reconhecer, mesmo que a condição já tenha passado)
+- Entregar eventos à GUI com o tempo exato da amostra que violou o limite
+
+Método:
+    Por regra e por lote, o estado da histerese de cada amostra sai de um
+    forward-fill vetorizado (índice do último "liga"/"desliga" por
+    np.maximum.accumulate). Só as transições (poucas) passam por Python
+    para aplicar a duração mínima e gerar eventos.
+
+    Lotes retransmitidos (late) chegam fora de ordem: são avaliados à
+    parte, com estado próprio, e só podem gerar eventos e reter alarmes.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+ALARM_EVENT_HISTORY = 200   # Eventos guardados para o painel
+
+
+class AlarmRule(NamedTuple):
+    name: str
+    channel: str
+    threshold: float
+    hysteresis: float = 0.0        # Desliga em threshold -/+ hysteresis
+    min_duration_s: float = 0.0    # Violação precisa durar isso para disparar
+    latch: bool = False            # Fica retido até reconhecer
+    above: bool = True             # False = alarme abaixo do limite (ex.: pressão de óleo)
+
+
+class AlarmEvent(NamedTuple):
+    rule: str
+    channel: str
+    kind: str          # 'ativo' (disparou) ou 'normal' (condição passou)
+    t: float           # 'ativo': primeira amostra fora do limite; 'normal': primeira de volta
+    value: float       # 'ativo': valor nessa amostra; 'normal': pior valor da violação
+    late: bool = False  # Veio de pacotes retransmitidos
+
+
+ALARM_RULES = [
+    AlarmRule('Sobregiro', 'RPM', 11000.0, hysteresis=500.0, latch=True),
+    AlarmRule('Pico de freio', 'BrakePressure', 150.0, hysteresis=10.0, latch=True),
+    AlarmRule('Temperatura alta', 'Temperatura', 105.0, hysteresis=3.0, min_duration_s=2.0),
+    AlarmRule('Mistura pobre', 'Lambda', 1.15, hysteresis=0.03, min_duration_s=0.5),
+    AlarmRule('Escorregamento', 'SlipRatio', 15.0, hysteresis=3.0, min_duration_s=0.1),
+]
+
+
+def hysteresis_state(x: np.ndarray, on: float, off: float, above: bool, initial: bool) -> np.ndarray:
+    """
+    Estado da histerese em cada amostra: liga em x >= on, desliga em
+    x < off (invertido com above=False); entre os dois (e em NaN) mantém
+    o estado anterior, começando em `initial`.
+    """
+    if above:
+        turn_on, turn_off = x >= on, x < off
+    else:
+        turn_on, turn_off = x <= on, x > off
+    last = np.where(turn_on | turn_off, np.arange(len(x)), -1)
+    np.maximum.accumulate(last, out=last)
+    return np.where(last >= 0, turn_on[np.maximum(last, 0)], initial)
+
+
+class _RuleState:
+    __slots__ = ('raw', 'since', 'start_value', 'peak', 'active')
+
+    def __init__(self):
+        self.raw = False            # Histerese ligada no fim do último lote
+        self.since = 0.0            # Tempo da primeira amostra da violação atual
+        self.start_value = math.nan
+        self.peak = math.nan
+        self.active = False         # Violação já confirmada (duração mínima)
+
+
+class AlarmEngine:
+    """Avalia ALARM_RULES nos lotes ao vivo e acumula os eventos para a GUI."""
+
+    def __init__(self, rules: Iterable[AlarmRule] = ALARM_RULES):
+        self.rules = list(rules)
+        self.by_channel: Dict[str, List[AlarmRule]] = {}
+        for rule in self.rules:
+            self.by_channel.setdefault(rule.channel, []).append(rule)
+        self.states: Dict[str, _RuleState] = {rule.name: _RuleState() for rule in self.rules}
+        self.latched: Dict[str, AlarmEvent] = {}   # Regra → evento que a reteve
+        self.history = deque(maxlen=ALARM_EVENT_HISTORY)
+        self._pending: List[AlarmEvent] = []
+
+    def process(self, t: np.ndarray, columns: Mapping[str, np.ndarray], late: bool = False):
+        """Avalia as regras cujo canal está no lote (t crescente, exceto em late)."""
+        if not len(t):
+            return
+        for channel, rules in self.by_channel.items():
+            x = columns.get(channel)
+            if x is None:
+                continue
+            for rule in rules:
+                if late:
+                    # Fora de ordem: estado próprio, não mexe no da sequência ao vivo
+                    self._evaluate(rule, _RuleState(), t, x, late=True)
+                else:
+                    self._evaluate(rule, self.states[rule.name], t, x)
+
+    def _evaluate(self, rule: AlarmRule, state: _RuleState, t: np.ndarray, x: np.ndarray, late: bool = False):
+        worst = np.fmax if rule.above else np.fmin
+        if not state.raw:
+            # Caso comum: lote inteiro dentro do limite (uma redução, NaN ignorado)
+            extreme = worst.reduce(x)
+            if not (extreme >= rule.threshold if rule.above else extreme <= rule.threshold):
+                return
+
+        off = rule.threshold - rule.hysteresis if rule.above else rule.threshold + rule.hysteresis
+        on = hysteresis_state(x, rule.threshold, off, rule.above, state.raw)
+        prev = state.raw
+        state.raw = bool(on[-1])
+        if prev and not on[0] and state.active:
+            # Violação do lote anterior terminou logo na primeira amostra deste
+            state.active = False
+            self._emit(rule, AlarmEvent(rule.name, rule.channel, 'normal', float(t[0]), state.peak, late))
+        edges = np.flatnonzero(on[1:] != on[:-1]) + 1
+        bounds = np.concatenate(([0], edges, [len(on)]))
+        for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            if not on[a]:
+                continue
+            if a > 0 or not prev:
+                # Violação nova a partir desta amostra
+                state.since, state.start_value = float(t[a]), float(x[a])
+                state.peak, state.active = math.nan, False
+            state.peak = float(worst(state.peak, worst.reduce(x[a:b])))
+            if not state.active:
+                confirm_at = state.since + rule.min_duration_s
+                if a + int(np.searchsorted(t[a:b], confirm_at, side='left')) < b:
+                    state.active = True
+                    self._emit(rule, AlarmEvent(rule.name, rule.channel, 'ativo', state.since,
+                                                state.start_value, late))
+            if b < len(on) and state.active:
+                state.active = False
+                self._emit(rule, AlarmEvent(rule.name, rule.channel, 'normal', float(t[b]),
+                                            state.peak, late))
+
+    def _emit(self, rule: AlarmRule, event: AlarmEvent):
+        if event.kind == 'ativo':
+            if rule.latch:
+                self.latched.setdefault(rule.name, event)
+            print(f"[Alarmes] {rule.name}: {rule.channel}={event.value:.4g} em t={event.t:.3f} s"
+                  + (" (retransmitido)" if event.late else ""))
+        self.history.append(event)
+        self._pending.append(event)
+
+    def pop_events(self) -> List[AlarmEvent]:
+        """Eventos gerados desde a última chamada (para a GUI)."""
+        events, self._pending = self._pending, []
+        return events
+
+    def active(self) -> List[str]:
+        """Regras com a condição ativa agora (sequência ao vivo)."""
+        return [rule.name for rule in self.rules if self.states[rule.name].active]
+
+    def acknowledge(self, rule: Optional[str] = None):
+        """Reconhece (solta) os alarmes retidos - todos ou só `rule`."""
+        if rule is None:
+            self.latched.clear()
+        else:
+            self.latched.pop(rule, None)
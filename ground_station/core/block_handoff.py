@@ -0,0 +1,146 @@
+"""
+Entrega em Blocos Thread CAN → GUI - PUCPR Racing
+
+Responsável por:
+- Acumular os sinais decodificados de cada frame CAN em blocos de
+  colunas pré-alocados (sem um dicionário na fila por mensagem)
+- Entregar blocos inteiros à GUI por um canal produtor único /
+  consumidor único (SPSC), sem lock explícito
+- Reciclar os blocos já consumidos (pool), para a thread CAN não alocar
+  arrays durante a sessão
+
+Funcionamento:
+    A thread CAN escreve uma linha por mensagem no bloco do frame
+    (timestamp, chegada, valores dos sinais). O bloco é publicado quando
+    enche (BLOCK_ROWS) ou quando a primeira linha fica mais velha que
+    BLOCK_MAX_AGE, o que limita o atraso extra da entrega.
+
+    A publicação é um deque.append e o consumo um deque.popleft, ambos
+    atômicos no CPython: um único produtor e um único consumidor não
+    precisam de Lock nem de queue.Queue (que usa Condition + Lock por
+    operação). Os blocos consumidos voltam por um segundo deque.
+"""
+
+from collections import deque
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+BLOCK_ROWS = 256        # Linhas por bloco (5 s de um frame a 50 Hz)
+BLOCK_MAX_AGE = 0.02    # Publica blocos parciais após 20 ms
+POOL_LIMIT = 64         # Blocos livres guardados por frame
+
+
+class ColumnBlock:
+    """Bloco pré-alocado com as linhas de um frame CAN."""
+
+    __slots__ = ('timebase', 'channels', 'timestamps', 'rx_times', 'values', 'n', 'first_rx')
+
+    def __init__(self, timebase: str, channels: Sequence[str], rows: int = BLOCK_ROWS):
+        self.timebase = timebase
+        self.channels = tuple(channels)
+        self.timestamps = np.empty(rows, dtype=np.float64)
+        self.rx_times = np.empty(rows, dtype=np.float64)
+        self.values = np.empty((len(self.channels), rows), dtype=np.float32)
+        self.n = 0
+        self.first_rx = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.n == len(self.timestamps)
+
+    def add(self, timestamp: float, rx_time: float, values: Sequence[float]):
+        """Escreve uma linha (valores na ordem de `channels`)."""
+        i = self.n
+        if i == 0:
+            self.first_rx = rx_time
+        self.timestamps[i] = timestamp
+        self.rx_times[i] = rx_time
+        self.values[:, i] = values
+        self.n = i + 1
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Views das linhas preenchidas, por canal."""
+        return {name: self.values[k, :self.n] for k, name in enumerate(self.channels)}
+
+
+class BlockHandoff:
+    """
+    Canal SPSC de blocos entre a thread CAN (produtor) e a GUI (consumidor).
+
+    Só a thread CAN chama add()/flush(); só a GUI chama drain()/release().
+    """
+
+    def __init__(self, rows: int = BLOCK_ROWS, max_age: float = BLOCK_MAX_AGE):
+        self.rows = rows
+        self.max_age = max_age
+        self.ready: deque = deque()   # Produtor → consumidor
+        self.free: Dict[str, deque] = {}  # Consumidor → produtor, por frame (reciclagem)
+        self.open_blocks: Dict[str, ColumnBlock] = {}  # Só o produtor acessa
+        self.blocks_published = 0
+        self.blocks_allocated = 0
+        self.rows_published = 0
+
+    # ---------- Produtor (thread CAN) ----------
+
+    def _new_block(self, timebase: str, channels: Sequence[str]) -> ColumnBlock:
+        free = self.free.get(timebase)
+        if free is None:
+            # Criado pelo produtor antes do primeiro bloco do frame ser publicado
+            free = self.free[timebase] = deque()
+        if free:
+            block = free.popleft()
+            block.n = 0
+            return block
+        self.blocks_allocated += 1
+        return ColumnBlock(timebase, channels, self.rows)
+
+    def add(self, timebase: str, channels: Sequence[str], timestamp: float,
+            rx_time: float, values: Sequence[float]):
+        """Acrescenta uma mensagem decodificada ao bloco do seu frame."""
+        block = self.open_blocks.get(timebase)
+        if block is None:
+            block = self.open_blocks[timebase] = self._new_block(timebase, channels)
+        block.add(timestamp, rx_time, values)
+        if block.full:
+            self._publish(timebase)
+
+    def _publish(self, timebase: str):
+        block = self.open_blocks.pop(timebase)
+        self.rows_published += block.n
+        self.blocks_published += 1
+        self.ready.append(block)
+
+    def flush(self, now: float, force: bool = False):
+        """Publica os blocos parciais mais velhos que max_age (ou todos, com force)."""
+        for timebase in [tb for tb, b in self.open_blocks.items()
+                         if force or now - b.first_rx >= self.max_age]:
+            self._publish(timebase)
+
+    @property
+    def pending(self) -> bool:
+        """True se há linhas ainda não publicadas."""
+        return bool(self.open_blocks)
+
+    # ---------- Consumidor (GUI) ----------
+
+    def drain(self) -> List[ColumnBlock]:
+        """Retira todos os blocos publicados até agora."""
+        blocks = []
+        ready = self.ready
+        while ready:
+            blocks.append(ready.popleft())
+        return blocks
+
+    def release(self, blocks: List[ColumnBlock]):
+        """Devolve blocos já copiados para o armazenamento (reciclagem)."""
+        for block in blocks:
+            free = self.free[block.timebase]
+            if len(free) < POOL_LIMIT:
+                free.append(block)
+
+    def reset(self):
+        """Descarta tudo (chamar com a thread CAN parada)."""
+        self.ready.clear()
+        self.open_blocks.clear()
+
@@ -0,0 +1,282 @@
+"""
+Decodificação CAN em Processo Separado - PUCPR Racing
+
+Responsável por:
+- Receber e decodificar (DBC) o barramento CAN num processo próprio,
+  fora do processo do Tk: redesenhos do matplotlib não atrasam mais o
+  bus.recv nem a decodificação
+- Escrever os sinais decodificados num anel em memória compartilhada
+  (multiprocessing.shared_memory), um anel de colunas por frame do DBC
+- Ler o anel no processo da GUI com a mesma interface do BlockHandoff
+  (drain/release), para o CanSource não mudar
+
+Layout do anel (um único segmento):
+    cabeçalho int64 [estado, contador_frame_0, ..., contador_frame_N-1]
+    para cada frame: timestamps float64[linhas], chegadas float64[linhas],
+                     valores float32[sinais, linhas]
+
+    O contador de um frame é o total de linhas já escritas (nunca volta);
+    a linha `c` fica na posição c % linhas. O escritor grava a linha e só
+    depois incrementa o contador, então tudo abaixo do contador está
+    completo. O leitor copia [cursor, contador) e relê o contador: linhas
+    que o escritor sobrescreveu durante a cópia são descartadas e
+    contadas como perdidas (a GUI ficou mais de RING_ROWS linhas atrás).
+
+    O leitor só cria views somente-leitura (flags.writeable = False) do
+    segmento; shared_memory não tem mapeamento somente-leitura real.
+"""
+
+import multiprocessing
+import platform
+import time
+from multiprocessing import shared_memory
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from core.block_handoff import ColumnBlock
+
+DBC_PATH = '../config/pucpr.dbc'
+RING_ROWS = 8192            # Linhas por frame no anel (~8 s de um frame a 1 kHz)
+STATE_STARTING = 0
+STATE_RUNNING = 1
+STATE_FAILED = -1
+PROCESS_JOIN_TIMEOUT = 2.0
+
+# spawn em todas as plataformas: o filho não herda o estado do Tk (fork
+# de um processo com Tk aberto não é seguro) e o comportamento é o mesmo
+# do Windows
+_MP = multiprocessing.get_context('spawn')
+
+
+def abrir_barramento_can(**bus_kwargs):
+    """
+    Abre o barramento CAN da plataforma (UDP multicast no Windows, socketcan
+    no Linux) ou, se bus_kwargs for passado, can.interface.Bus(**bus_kwargs).
+    """
+    import can
+    if bus_kwargs:
+        return can.interface.Bus(**bus_kwargs)
+    # Configuração Windows (UDP Multicast) - Igual ao simulator_carro.py / central.py
+    if platform.system() == "Windows":
+        return can.interface.Bus(channel='239.0.0.1', interface='udp_multicast')
+    # Fallback ou configuração linux (não testado aqui)
+    return can.interface.Bus(channel='can0', bustype='socketcan')
+
+
+def frames_do_dbc(db) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Layout do anel: (nome do frame, sinais) na ordem do DBC."""
+    return [(frame.name, tuple(sig.name for sig in frame.signals)) for frame in db.messages]
+
+
+class SharedRing:
+    """Anel de colunas por frame sobre um segmento de memória compartilhada."""
+
+    def __init__(self, frames: Sequence[Tuple[str, Sequence[str]]], rows: int = RING_ROWS,
+                 name: str = None, create: bool = False, readonly: bool = False):
+        self.frames = [(nome, tuple(sinais)) for nome, sinais in frames]
+        self.rows = rows
+        size = 8 * (1 + len(self.frames))
+        for _, sinais in self.frames:
+            size += rows * (8 + 8 + 4 * len(sinais))
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.owner = create
+
+        buf = self.shm.buf
+        self.header = np.ndarray(1 + len(self.frames), dtype=np.int64, buffer=buf)
+        if create:
+            self.header[:] = 0
+        self.columns = []  # (timestamps, chegadas, valores) por frame
+        offset = self.header.nbytes
+        for _, sinais in self.frames:
+            timestamps = np.ndarray(rows, dtype=np.float64, buffer=buf, offset=offset)
+            offset += timestamps.nbytes
+            rx_times = np.ndarray(rows, dtype=np.float64, buffer=buf, offset=offset)
+            offset += rx_times.nbytes
+            values = np.ndarray((len(sinais), rows), dtype=np.float32, buffer=buf, offset=offset)
+            offset += values.nbytes
+            self.columns.append((timestamps, rx_times, values))
+        if readonly:
+            for array in (self.header, *[a for cols in self.columns for a in cols]):
+                array.flags.writeable = False
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def state(self) -> int:
+        return int(self.header[0])
+
+    def count(self, k: int) -> int:
+        """Total de linhas já escritas no frame k."""
+        return int(self.header[1 + k])
+
+    def close(self):
+        """Desmapeia o segmento (e o remove, se este lado o criou)."""
+        self.header = None
+        self.columns = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingWriter:
+    """Lado do processo decodificador: uma linha por mensagem CAN."""
+
+    def __init__(self, ring: SharedRing):
+        self.ring = ring
+        self.counts = [0] * len(ring.frames)
+
+    def set_state(self, state: int):
+        self.ring.header[0] = state
+
+    def add(self, k: int, timestamp: float, rx_time: float, values: Sequence[float]):
+        c = self.counts[k]
+        i = c % self.ring.rows
+        timestamps, rx_times, columns = self.ring.columns[k]
+        timestamps[i] = timestamp
+        rx_times[i] = rx_time
+        columns[:, i] = values
+        self.counts[k] = c + 1
+        self.ring.header[1 + k] = c + 1  # Publica a linha só depois de escrita
+
+
+class RingReader:
+    """
+    Lado da GUI: copia as linhas novas do anel para blocos de colunas.
+
+    Tem a mesma interface de consumidor do BlockHandoff (drain/release).
+    Os blocos são do leitor e reaproveitados a cada drain.
+    """
+
+    def __init__(self, ring: SharedRing):
+        self.ring = ring
+        self.cursors = [0] * len(ring.frames)
+        self.blocks = [ColumnBlock(nome, sinais, ring.rows) for nome, sinais in ring.frames]
+        self.rows_lost = 0
+
+    def _copy(self, k: int, start: int, end: int):
+        """Copia as linhas [start, end) do frame k para o seu bloco."""
+        rows = self.ring.rows
+        block = self.blocks[k]
+        n = end - start
+        i = start % rows
+        first = min(n, rows - i)  # Até o fim do anel; o resto volta ao início
+        for src, dst in zip(self.ring.columns[k], (block.timestamps, block.rx_times, block.values)):
+            dst[..., :first] = src[..., i:i + first]
+            dst[..., first:n] = src[..., :n - first]
+        block.n = n
+
+    def drain(self) -> List[ColumnBlock]:
+        """Blocos com as linhas escritas desde o último drain."""
+        blocks = []
+        rows = self.ring.rows
+        for k in range(len(self.blocks)):
+            start = self.cursors[k]
+            end = self.ring.count(k)
+            if end == start:
+                continue
+            if end - start > rows:
+                self.rows_lost += end - start - rows
+                start = end - rows
+            self._copy(k, start, end)
+            # Linhas sobrescritas enquanto copiávamos não são confiáveis
+            oldest = self.ring.count(k) - rows
+            if oldest > start:
+                skip = min(oldest - start, end - start)
+                self.rows_lost += skip
+                block = self.blocks[k]
+                keep = block.n - skip
+                block.timestamps[:keep] = block.timestamps[skip:block.n]
+                block.rx_times[:keep] = block.rx_times[skip:block.n]
+                block.values[:, :keep] = block.values[:, skip:block.n]
+                block.n = keep
+            self.cursors[k] = end
+            if self.blocks[k].n:
+                blocks.append(self.blocks[k])
+        return blocks
+
+    def release(self, blocks: List[ColumnBlock]):
+        """Nada a devolver: os blocos são reaproveitados pelo próximo drain."""
+
+
+def decodificar_para_anel(bus, db, writer: RingWriter, stop_event):
+    """Lê o barramento e escreve cada mensagem decodificada no anel (processo decodificador)."""
+    indices = {nome: k for k, (nome, _) in enumerate(writer.ring.frames)}
+    frames = {}  # arbitration_id -> (índice no anel, sinais, decode)
+    while not stop_event.is_set():
+        msg = bus.recv(0.5)
+        if msg is None:
+            continue
+        rx_time = time.time()
+        entry = frames.get(msg.arbitration_id)
+        try:
+            if entry is None:
+                frame = db.get_message_by_frame_id(msg.arbitration_id)
+                entry = frames[msg.arbitration_id] = (
+                    indices[frame.name], writer.ring.frames[indices[frame.name]][1], frame.decode)
+            k, sinais, decode = entry
+            dados = decode(msg.data, decode_choices=False)
+            writer.add(k, msg.timestamp or rx_time, rx_time, [dados[sinal] for sinal in sinais])
+        except Exception:
+            pass  # Frame fora do DBC ou payload inválido
+
+
+def _processo_decodificador(ring_name: str, frames, rows: int, dbc_path: str, bus_kwargs, stop_event):
+    """Ponto de entrada do processo filho."""
+    import cantools
+
+    ring = SharedRing(frames, rows, name=ring_name)
+    writer = RingWriter(ring)
+    bus = None
+    try:
+        db = cantools.database.load_file(dbc_path)
+        bus = abrir_barramento_can(**(bus_kwargs or {}))
+        writer.set_state(STATE_RUNNING)
+        print("[CAN-Proc] Processo decodificador iniciado.")
+        decodificar_para_anel(bus, db, writer, stop_event)
+    except Exception as e:
+        print(f"[CAN-Proc] Erro: {e}")
+        writer.set_state(STATE_FAILED)
+    finally:
+        if bus:
+            bus.shutdown()
+        ring.close()
+        print("[CAN-Proc] Processo decodificador finalizado.")
+
+
+class CanDecoderProcess:
+    """
+    Processo decodificador + anel compartilhado, do ponto de vista da GUI.
+
+    `reader` é o consumidor (drain/release) usado no lugar do BlockHandoff.
+    """
+
+    def __init__(self, db, dbc_path: str = DBC_PATH, rows: int = RING_ROWS, bus_kwargs: dict = None):
+        frames = frames_do_dbc(db)
+        self.ring = SharedRing(frames, rows, create=True, readonly=True)
+        self.reader = RingReader(self.ring)
+        self.stop_event = _MP.Event()
+        self.process = _MP.Process(
+            target=_processo_decodificador, name="can-decoder",
+            args=(self.ring.name, frames, rows, dbc_path, bus_kwargs, self.stop_event), daemon=True)
+
+    @property
+    def failed(self) -> bool:
+        return self.ring.state == STATE_FAILED or (
+            self.process.exitcode is not None and self.process.exitcode != 0)
+
+    def start(self):
+        self.process.start()
+
+    def stop(self):
+        """Para o processo e libera a memória compartilhada."""
+        self.stop_event.set()
+        if self.process.pid is not None:
+            self.process.join(PROCESS_JOIN_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(PROCESS_JOIN_TIMEOUT)
+        self.reader.ring = None
+        self.ring.close()
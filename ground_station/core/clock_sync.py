@@ -0,0 +1,114 @@
+"""
+Sincronização de Relógio Carro ↔ Ground Station - PUCPR Racing
+
+Responsável por:
+- Estimar o offset e a deriva entre o relógio de quem envia (Central /
+  barramento CAN) e o relógio local (time.time())
+- Converter timestamps do carro em tempo local, para montar o eixo de
+  tempo ao vivo a partir do instante em que a amostra foi medida
+- Calcular a latência de entrega (medição → chegada) de cada amostra
+
+Método:
+    Cada amostra dá offset = chegada_local - timestamp_carro, que é o
+    offset verdadeiro mais o atraso do enlace (sempre >= 0). O menor
+    offset de cada janela de BUCKET_SEC segundos é a amostra com menos
+    fila; uma reta ajustada (mínimos quadrados) sobre esses mínimos e
+    depois baixada até tocar o menor deles é o envelope inferior:
+    inclinação = deriva, valor = offset atual.
+
+    A latência resultante é relativa ao pacote mais rápido da janela,
+    somada a min_delay_s (o atraso mínimo físico do enlace, se conhecido).
+"""
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+BUCKET_SEC = 1.0      # Um mínimo por segundo de dados do carro
+WINDOW_BUCKETS = 120  # Janela do ajuste (2 min)
+MIN_FIT_SPAN = 10.0   # Segundos de dados antes de estimar a deriva
+
+
+class ClockSync:
+    """Estimador de offset/deriva entre o relógio do carro e o local."""
+
+    def __init__(self, min_delay_s: float = 0.0):
+        self.min_delay_s = min_delay_s
+        self.reset()
+
+    def reset(self):
+        """Descarta a estimativa (ex.: Central reiniciou o contador de ms)."""
+        self.buckets: deque = deque(maxlen=WINDOW_BUCKETS)  # [bucket, t_carro, offset]
+        self.last_sender_s: Optional[float] = None
+        self.offset_s = 0.0       # Offset no instante ref_sender_s
+        self.drift = 0.0          # s/s (multiplique por 1e6 para ppm)
+        self.ref_sender_s = 0.0
+        self.samples = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.samples > 0
+
+    @property
+    def drift_ppm(self) -> float:
+        return self.drift * 1e6
+
+    def update(self, sender_s: float, rx_time: float):
+        """
+        Acrescenta uma amostra (timestamp do carro em s, chegada local em s).
+
+        Em lotes, basta passar a amostra com menor offset (em geral a
+        última do lote, que esperou menos na fila).
+        """
+        if self.last_sender_s is not None and sender_s < self.last_sender_s - 1.0:
+            self.reset()  # Relógio do carro voltou: reiniciou
+        self.last_sender_s = sender_s
+        self.samples += 1
+
+        offset = rx_time - sender_s
+        bucket = int(sender_s // BUCKET_SEC)
+        if self.buckets and self.buckets[-1][0] == bucket:
+            if offset < self.buckets[-1][2]:
+                self.buckets[-1][1:] = [sender_s, offset]
+            else:
+                return  # Não muda o envelope
+        else:
+            self.buckets.append([bucket, sender_s, offset])
+        self._fit()
+
+    def update_many(self, sender_s: np.ndarray, rx_time: np.ndarray):
+        """Acrescenta um lote: só a amostra de menor offset de cada segundo importa."""
+        sender_s = np.asarray(sender_s, dtype=np.float64)
+        if not len(sender_s):
+            return
+        offsets = np.asarray(rx_time, dtype=np.float64) - sender_s
+        buckets = np.floor(sender_s / BUCKET_SEC)
+        order = np.lexsort((offsets, buckets))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = buckets[order][1:] != buckets[order][:-1]
+        self.samples += len(sender_s) - int(first.sum())
+        for i in order[first]:
+            self.update(float(sender_s[i]), float(sender_s[i] + offsets[i]))
+
+    def _fit(self):
+        """Reajusta o envelope inferior sobre os mínimos da janela."""
+        t = np.array([b[1] for b in self.buckets])
+        off = np.array([b[2] for b in self.buckets])
+        self.ref_sender_s = t[-1]
+
+        if len(t) >= 3 and t[-1] - t[0] >= MIN_FIT_SPAN:
+            drift, _ = np.polyfit(t - t[-1], off, 1)
+            self.drift = float(drift)
+        else:
+            self.drift = 0.0
+        # Baixa a reta até o mínimo mais baixo (nenhum pacote chega "antes" de sair)
+        self.offset_s = float(np.min(off - self.drift * (t - t[-1])))
+
+    def to_local(self, sender_s):
+        """Converte timestamp(s) do carro (s) em time.time() local (aceita arrays)."""
+        return sender_s + self.offset_s + self.drift * (sender_s - self.ref_sender_s) - self.min_delay_s
+
+    def latency(self, sender_s, rx_time):
+        """Latência de entrega (s) de amostra(s) medidas em sender_s e recebidas em rx_time."""
+        return rx_time - self.to_local(sender_s)
@@ -0,0 +1,164 @@
+"""
+Decimação M4 para o Gráfico Ao Vivo - PUCPR Racing
+
+Responsável por:
+- Reduzir cada canal a poucos pontos por pixel antes do set_data, sem
+  perder picos: de cada coluna da grade ficam o primeiro, o mínimo, o
+  máximo e o último ponto (M4), na ordem original
+- Reaproveitar as colunas já completas entre quadros (M4Decimator): a
+  cada quadro só as amostras novas são processadas
+
+Grade:
+    As colunas têm largura dx (unidades de tempo) ancorada em t = 0, então
+    uma coluna completa continua válida quando a janela rola. dx vem da
+    largura do eixo em pixels (DECIMATE_PX_PER_BIN pixels por coluna):
+    mudar o zoom muda dx e reinicia o cache.
+
+    Com colunas de 2 px, o M4 entrega no máximo 2 pontos por pixel (em
+    geral menos: primeiro/mínimo/máximo/último coincidem muitas vezes).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+DECIMATE_PX_PER_BIN = 2  # Pixels por coluna M4 (≤ 4 pontos por coluna)
+
+
+def _first_in_segment(hits: np.ndarray, segment: np.ndarray, default: np.ndarray) -> np.ndarray:
+    """Primeiro índice de `hits` em cada segmento (default onde não há nenhum)."""
+    out = default.copy()
+    if len(hits):
+        seg = segment[hits]
+        first = np.empty(len(hits), dtype=bool)
+        first[0] = True
+        first[1:] = seg[1:] != seg[:-1]
+        out[seg[first]] = hits[first]
+    return out
+
+
+def m4_indices(t: np.ndarray, y: np.ndarray, dx: float) -> np.ndarray:
+    """
+    Índices (ordenados) dos pontos M4 de cada coluna floor(t / dx).
+
+    `t` deve ser crescente. NaN é ignorado no mínimo/máximo; uma coluna só
+    com NaN mantém o primeiro e o último ponto (a lacuna continua visível).
+    """
+    n = len(t)
+    if n <= 4:
+        return np.arange(n)
+    column = np.floor(t / dx)
+    starts = np.flatnonzero(np.concatenate(([True], column[1:] != column[:-1])))
+    ends = np.append(starts[1:], n)
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+
+    mins = np.fmin.reduceat(y, starts)
+    maxs = np.fmax.reduceat(y, starts)
+    imin = _first_in_segment(np.flatnonzero(y == mins[segment]), segment, starts)
+    imax = _first_in_segment(np.flatnonzero(y == maxs[segment]), segment, starts)
+    return np.unique(np.concatenate((starts, imin, imax, ends - 1)))
+
+
+def decimate_to_width(t: np.ndarray, y: np.ndarray, width_px: float) -> Tuple[np.ndarray, np.ndarray]:
+    """M4 de todo o intervalo de `t` numa largura de `width_px` pixels (sem cache)."""
+    bins = max(1, int(width_px / DECIMATE_PX_PER_BIN))
+    if len(t) <= 4 * bins:
+        return t, y
+    dx = (t[-1] - t[0]) / bins
+    if not dx > 0:
+        return t, y
+    idx = m4_indices(t, y, dx)
+    return t[idx], y[idx]
+
+
+class M4Decimator:
+    """
+    Decimação M4 incremental de um canal.
+
+    As colunas completas (todas menos a última, que ainda pode receber
+    amostras) ficam em cache; a cada quadro só a cauda é decimada.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.dx: Optional[float] = None
+        self.revision = None
+        self._t = np.empty(0, dtype=np.float64)
+        self._y = np.empty(0, dtype=np.float32)
+        self.n = 0                  # Pontos válidos no cache
+        self.t_first = None         # Primeiro tempo coberto pelo cache
+        self.open_column = None     # Primeira coluna ainda aberta (fora do cache)
+
+    def _append(self, t: np.ndarray, y: np.ndarray):
+        m = len(t)
+        if self.n + m > len(self._t):
+            size = max(2 * len(self._t), self.n + m, 1024)
+            self._t = np.resize(self._t, size)
+            self._y = np.resize(self._y, size)
+        self._t[self.n:self.n + m] = t
+        self._y[self.n:self.n + m] = y
+        self.n += m
+
+    def _column_start(self, t: np.ndarray, column: float) -> int:
+        """Primeiro índice de t na coluna `column` ou depois (mesmo floor de m4_indices)."""
+        i = int(np.searchsorted(t, column * self.dx, side='left'))
+        while i > 0 and np.floor(t[i - 1] / self.dx) >= column:
+            i -= 1
+        while i < len(t) and np.floor(t[i] / self.dx) < column:
+            i += 1
+        return i
+
+    def update(self, t: np.ndarray, y: np.ndarray, dx: float, x0: float, x1: float,
+               revision=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pontos decimados que cobrem [x0, x1] (mais um de cada lado, para a
+        linha continuar até a borda).
+
+        Args:
+            t, y: série completa do canal (views do live_data_storage)
+            dx: largura da coluna em unidades de tempo
+            revision: muda quando amostras antigas foram alteradas
+                (inserção de retransmitidos, clear) e invalida o cache
+        """
+        if not len(t):
+            self.reset()
+            return t, y
+        # Zoom mudou, amostras antigas mudaram ou a série agora começa antes do cache
+        if dx != self.dx or revision != self.revision or (self.t_first is not None and t[0] < self.t_first):
+            self.reset()
+            self.dx = dx
+            self.revision = revision
+            self.t_first = t[0]
+
+        # Descarta o que já saiu do armazenamento (capacidade fixa)
+        if self.n and self._t[0] < t[0]:
+            drop = int(np.searchsorted(self._t[:self.n], t[0], side='left'))
+            if drop > self.n // 2:
+                keep = self.n - drop
+                self._t[:keep] = self._t[drop:self.n]
+                self._y[:keep] = self._y[drop:self.n]
+                self.n = keep
+                self.t_first = t[0]
+
+        # Cauda: da primeira coluna aberta até o fim
+        i_tail = self._column_start(t, self.open_column) if self.open_column is not None else 0
+        t_tail, y_tail = t[i_tail:], y[i_tail:]
+        idx = m4_indices(t_tail, y_tail, dx)
+        td, yd = t_tail[idx], y_tail[idx]
+
+        # Colunas completas da cauda vão para o cache
+        self.open_column = np.floor(t[-1] / dx)
+        split = int(np.searchsorted(np.floor(td / dx), self.open_column, side='left'))
+        if split:
+            self._append(td[:split], yd[:split])
+
+        # Janela visível: cache + coluna aberta
+        cached_t = self._t[:self.n]
+        i0 = max(int(np.searchsorted(cached_t, x0, side='left')) - 1, 0)
+        i1 = int(np.searchsorted(cached_t, x1, side='right')) + 1
+        if i1 <= self.n:
+            return cached_t[i0:i1], self._y[i0:i1]
+        return (np.concatenate((cached_t[i0:], td[split:])),
+                np.concatenate((self._y[i0:self.n], yd[split:])))
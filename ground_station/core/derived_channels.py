@@ -0,0 +1,120 @@
+"""
+Canais Derivados da Telemetria Ao Vivo - PUCPR Racing
+
+Responsável por:
+- Declarar canais calculados a partir dos canais medidos (escorregamento,
+  G combinado, diferença de altura dianteira/traseira, erro de lambda)
+- Calcular esses canais em cada lote recebido, com NumPy sobre as colunas
+  do lote (nenhum laço Python por amostra)
+
+Os canais derivados entram no lote como colunas comuns: vão para o
+live_data_storage, estatísticas móveis, gráfico e dashboards como qualquer
+canal medido.
+
+Regras:
+    Um canal derivado é calculado nos lotes que trazem todas as suas
+    entradas (no CAN, o frame que tem esses sinais; no LoRa e no replay,
+    todo pacote) e fica na mesma base de tempo delas. Entradas NaN geram
+    NaN. Um canal derivado pode usar outro declarado antes dele.
+
+Para criar um canal, acrescente uma linha em DERIVED_CHANNELS com uma
+função que recebe os arrays das entradas (na ordem) e retorna um array.
+"""
+
+from typing import Callable, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Tuple
+
+import numpy as np
+
+from core.live_store import VALUE_DTYPE
+
+SLIP_MIN_SPEED_KMH = 5.0   # Abaixo disso o escorregamento não é calculado (NaN)
+LAMBDA_TARGET = 1.0        # Lambda alvo do mapa (erro = medido - alvo)
+
+
+class DerivedChannel(NamedTuple):
+    name: str
+    inputs: Tuple[str, ...]
+    fn: Callable[..., np.ndarray]
+    unit: str = ""
+
+
+def _slip_ratio(fl, fr, rl, rr):
+    """Escorregamento da traseira (tração) sobre a dianteira, em %."""
+    front = (fl + fr) * 0.5
+    rear = (rl + rr) * 0.5
+    return np.where(front >= SLIP_MIN_SPEED_KMH, (rear - front) / front * 100.0, np.nan)
+
+
+def _combined_g(accel_x, accel_y):
+    """Aceleração total no plano (círculo de aderência)."""
+    return np.hypot(accel_x, accel_y)
+
+
+def _ride_height_delta(fl, fr, rl, rr):
+    """Curso médio dianteiro menos o traseiro (mm): > 0 = dianteira mais comprimida."""
+    return (fl + fr - rl - rr) * 0.5
+
+
+def _lambda_error(lam):
+    return lam - LAMBDA_TARGET
+
+
+DERIVED_CHANNELS = [
+    DerivedChannel('SlipRatio', ('WheelSpeed_FL', 'WheelSpeed_FR', 'WheelSpeed_RL', 'WheelSpeed_RR'),
+                   _slip_ratio, '%'),
+    DerivedChannel('CombinedG', ('AccelX', 'AccelY'), _combined_g, 'g'),
+    DerivedChannel('RideHeightDelta', ('SuspensionPos_FL', 'SuspensionPos_FR', 'SuspensionPos_RL', 'SuspensionPos_RR'),
+                   _ride_height_delta, 'mm'),
+    DerivedChannel('LambdaError', ('Lambda',), _lambda_error, 'λ'),
+]
+
+
+class DerivedChannelEngine:
+    """
+    Calcula os canais derivados de cada lote.
+
+    O plano (quais canais derivados um lote com aquele conjunto de colunas
+    permite calcular, e em que ordem) fica em cache por conjunto de
+    colunas: no CAN são poucos frames diferentes, então por lote sobra uma
+    busca no dicionário e as operações NumPy.
+    """
+
+    def __init__(self, channels: Iterable[DerivedChannel] = DERIVED_CHANNELS):
+        self.channels = list(channels)
+        names = [channel.name for channel in self.channels]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Canais derivados repetidos: {names}")
+        self._plans: Dict[FrozenSet[str], Tuple[DerivedChannel, ...]] = {}
+
+    def _plan(self, columns: FrozenSet[str]) -> Tuple[DerivedChannel, ...]:
+        plan = self._plans.get(columns)
+        if plan is None:
+            available = set(columns)
+            steps = []
+            for channel in self.channels:
+                if channel.name not in available and all(name in available for name in channel.inputs):
+                    steps.append(channel)
+                    available.add(channel.name)
+            plan = self._plans[columns] = tuple(steps)
+        return plan
+
+    def apply(self, columns: Mapping[str, np.ndarray]) -> Mapping[str, np.ndarray]:
+        """
+        Colunas do lote mais os canais derivados calculáveis com elas
+        (o próprio `columns` se nenhum for).
+        """
+        plan = self._plan(frozenset(columns))
+        if not plan:
+            return columns
+        out = dict(columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for channel in plan:
+                try:
+                    values = channel.fn(*(out[name] for name in channel.inputs))
+                    out[channel.name] = np.asarray(values, dtype=VALUE_DTYPE)
+                except Exception as e:
+                    # Um canal com defeito sai de cena; os demais continuam
+                    print(f"[Derivados] Erro em '{channel.name}' (desativado): {e}")
+                    self.channels.remove(channel)
+                    self._plans.clear()
+        return out
@@ -0,0 +1,154 @@
+"""
+Sessão Ao Vivo como DataFrame para as Abas de Análise - PUCPR Racing
+
+Responsável por:
+- Expor o live_data_storage como um DataFrame no formato de
+  carregar_log_csv, para tempos de volta, G-G, mapa da pista e gráficos
+  funcionarem durante a sessão (não só com logs CSV)
+- Não copiar o histórico: as colunas do DataFrame são views dos arrays
+  do armazenamento ao vivo
+- Atualizar de forma incremental: cada frame() só processa as amostras
+  que chegaram desde o anterior
+
+Linhas e colunas:
+    As linhas são as amostras da base de tempo com mais amostras (a
+    referência). Índice e coluna de timestamp do [CHANNELS] são o tempo
+    dela, em segundos desde o início da sessão (mesmo eixo do gráfico ao
+    vivo); os canais da referência são views diretas.
+
+    Os canais das demais bases de tempo (outros frames CAN) são
+    reamostrados nas linhas da referência (último valor recebido até cada
+    instante, como em carregar_sessao_ao_vivo) num cache do mesmo tamanho.
+    Cada frame() recalcula só as linhas novas e as que ficam depois da
+    última amostra já vista de cada base.
+
+    Os canais recebem os nomes de coluna do [CHANNELS] do config (canais
+    sem correspondência, como os derivados, mantêm o nome ao vivo). As
+    views são somente leitura: acrescentar ou substituir colunas (ex.:
+    LapNumber) funciona, mas escrever valores dentro de uma coluna gera
+    erro em vez de alterar o armazenamento ao vivo.
+
+Validade:
+    As views acompanham o buffer deslizante do LiveStore: um DataFrame
+    vale até o próximo deslizamento ou reescrita da referência (pacote
+    retransmitido inserido no meio, clear). stale() indica quando é
+    preciso pedir outro a frame(); a telemetria ao vivo faz isso logo
+    após cada ingestão, na mesma chamada.
+"""
+
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.live_store import LiveStore, MultiRateStore
+from core.telemetry_sources import REPLAY_CHANNELS
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+def live_column_name(channel: str, config_map: Mapping[str, str]) -> str:
+    """Nome de coluna do [CHANNELS] para um canal ao vivo (o próprio nome se não houver)."""
+    return config_map.get(REPLAY_CHANNELS.get(channel, ''), channel)
+
+
+class LiveSessionView:
+    """DataFrame (views, sem cópia) de um MultiRateStore ao vivo."""
+
+    def __init__(self, store: MultiRateStore, config_map: Mapping[str, str]):
+        self.store = store
+        self.config_map = config_map
+        self.timestamp_col = config_map.get('timestamp', 'Timestamp')
+        self.reference: Optional[str] = None
+        # Canais das outras bases, uma linha por amostra da referência
+        self._held: Optional[LiveStore] = None
+        self._held_revision = 0
+        self._held_appended = 0   # reference.appended já refletido no cache
+        # Base → ((revision, nº de canais), último tempo já reamostrado)
+        self._seen: Dict[str, Tuple[Tuple[int, int], Optional[float]]] = {}
+        self._frame_layout: Optional[Tuple[str, int, int]] = None
+        self.rows_resampled = 0   # Linhas recalculadas no cache (diagnóstico)
+
+    def stale(self) -> bool:
+        """True se o último DataFrame devolvido por frame() deixou de valer."""
+        if self._frame_layout is None:
+            return False
+        reference, revision, slides = self._frame_layout
+        live = self.store.stores.get(reference)
+        return live is None or live.revision != revision or live.slides != slides
+
+    def frame(self) -> Optional[pd.DataFrame]:
+        """DataFrame atual da sessão (None enquanto não houver amostras)."""
+        live = self._reference_store()
+        if live is None:
+            self._frame_layout = None
+            return None
+        self._sync_held(live)
+
+        times = _read_only(live.time)
+        data = {self.timestamp_col: times}
+        for channel in live.channels:
+            if self.store.timebase_of(channel) == self.reference:
+                data.setdefault(live_column_name(channel, self.config_map), _read_only(live.column(channel)))
+        for channel in self._held.channels:
+            data.setdefault(live_column_name(channel, self.config_map), _read_only(self._held.column(channel)))
+        self._frame_layout = (self.reference, live.revision, live.slides)
+        return pd.DataFrame(data, index=pd.Index(times, copy=False), copy=False)
+
+    def _reference_store(self) -> Optional[LiveStore]:
+        stores = {name: live for name, live in self.store.stores.items() if len(live)}
+        if not stores:
+            return None
+        best = max(stores, key=lambda name: len(stores[name]))
+        current = stores.get(self.reference)
+        if current is None or len(stores[best]) > len(current):
+            self.reference = best
+            self._held = None
+        return stores[self.reference]
+
+    def _sync_held(self, live: LiveStore):
+        """Acompanha as linhas novas da referência e reamostra as outras bases nelas."""
+        if self._held is None or self._held_revision != live.revision:
+            # Referência nova ou reescrita: reamostra tudo
+            self._held = LiveStore(live.capacity)
+            self._held_revision = live.revision
+            self._held_appended = live.appended - len(live)
+            self._seen.clear()
+        held = self._held
+        new = min(live.appended - self._held_appended, len(live))
+        if new > 0:
+            held.extend(live.time[len(live) - new:], {})
+        self._held_appended = live.appended
+
+        times = held.time
+        first_new = len(times) - new
+        for name, other in self.store.stores.items():
+            if name == self.reference or not len(other):
+                continue
+            state = (other.revision, len(other.channels))
+            seen = self._seen.get(name)
+            if seen is None or seen[0] != state:
+                row = 0
+            else:
+                # Linhas a partir da última amostra vista podem ter valor mais novo
+                row = min(int(np.searchsorted(times, seen[1], side='left')), first_new)
+            if row < len(times):
+                self._resample(name, other, times[row:], row)
+            self._seen[name] = (state, other.last_time())
+
+    def _resample(self, name: str, other: LiveStore, times: np.ndarray, row: int):
+        idx = np.searchsorted(other.time, times, side='right') - 1  # Última amostra até cada linha
+        valid = idx >= 0
+        idx = idx[valid]
+        for channel in other.channels:
+            if self.store.timebase_of(channel) != name:
+                continue
+            self._held.add_channel(channel)
+            out = self._held.column(channel)[row:]
+            out[~valid] = np.nan
+            out[valid] = other.column(channel)[idx]
+        self.rows_resampled += len(times)
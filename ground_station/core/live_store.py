@@ -0,0 +1,321 @@
+"""
+Armazenamento Ao Vivo em Colunas NumPy - PUCPR Racing
+
+Responsável por:
+- Guardar as amostras da telemetria ao vivo (CAN ou LoRa) com capacidade
+  fixa: memória constante durante um enduro inteiro
+- Acrescentar amostras em O(1) amortizado (uma a uma ou em lote)
+- Entregar janelas do histórico como views (sem cópia) para o gráfico,
+  com busca de tempo por searchsorted
+- Manter cada fonte na sua própria base de tempo (MultiRateStore)
+
+Layout:
+    Cada coluna (Time + canais) é um array de 2x a capacidade, usado como
+    buffer deslizante: os dados válidos ficam sempre contíguos em
+    [start:end]. Quando end chega ao fim do array, as últimas `capacity`
+    amostras são copiadas para o início (uma cópia a cada `capacity`
+    inserções). Assim qualquer janela é uma fatia simples, sem wrap.
+    Uma view vale até o próximo deslizamento (contado em `slides`).
+
+    Canal sem valor numa amostra fica NaN (o matplotlib mostra como
+    lacuna, em vez de um zero falso).
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+LIVE_CAPACITY = 100000  # Amostras por canal (~33 min a 50 Hz)
+TIME_DTYPE = np.float64
+VALUE_DTYPE = np.float32
+
+
+class LiveStore:
+    """Histórico ao vivo em colunas com capacidade fixa."""
+
+    def __init__(self, capacity: int = LIVE_CAPACITY, channels: Iterable[str] = ()):
+        self.capacity = capacity
+        self.start = 0
+        self.end = 0
+        self.revision = 0  # Muda quando amostras já existentes mudam (insert/clear)
+        self.appended = 0  # Amostras acrescentadas no fim desde a criação (append/extend)
+        self.slides = 0    # Deslizamentos do buffer: views antigas deixam de valer
+        self._time = np.empty(2 * capacity, dtype=TIME_DTYPE)
+        self._columns: Dict[str, np.ndarray] = {}
+        for name in channels:
+            self.add_channel(name)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self._columns
+
+    @property
+    def channels(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def time(self) -> np.ndarray:
+        """View (sem cópia) do eixo de tempo."""
+        return self._time[self.start:self.end]
+
+    def column(self, channel: str) -> Optional[np.ndarray]:
+        """View (sem cópia) de um canal, alinhada com `time`; None se não existir."""
+        data = self._columns.get(channel)
+        if data is None:
+            return None
+        return data[self.start:self.end]
+
+    def last_time(self) -> Optional[float]:
+        return float(self._time[self.end - 1]) if self.end > self.start else None
+
+    def last_value(self, channel: str) -> Optional[float]:
+        """Último valor do canal (None se vazio ou sem valor na última amostra)."""
+        data = self.column(channel)
+        if data is None or not len(data):
+            return None
+        value = data[-1]
+        return None if np.isnan(value) else float(value)
+
+    def add_channel(self, channel: str):
+        """Cria um canal novo (NaN nas amostras que já existem)."""
+        if channel not in self._columns:
+            data = np.empty(2 * self.capacity, dtype=VALUE_DTYPE)
+            data[self.start:self.end] = np.nan
+            self._columns[channel] = data
+
+    def clear(self):
+        """Descarta todas as amostras (mantém os canais)."""
+        self.start = self.end = 0
+        self.revision += 1
+
+    def _reserve(self, n: int):
+        """Garante espaço para n amostras no fim do buffer."""
+        if n > self.capacity:
+            raise ValueError(f"Lote de {n} amostras maior que a capacidade ({self.capacity})")
+        if self.end + n <= len(self._time):
+            return
+        # Desliza: mantém as últimas (capacity - n) amostras no início
+        keep = min(len(self), self.capacity - n)
+        src = slice(self.end - keep, self.end)
+        self.slides += 1
+        self._time[:keep] = self._time[src]
+        for data in self._columns.values():
+            data[:keep] = data[src]
+        self.start, self.end = 0, keep
+
+    def _trim(self):
+        """Descarta as amostras mais antigas além da capacidade."""
+        if len(self) > self.capacity:
+            self.start = self.end - self.capacity
+
+    def append(self, t: float, values: Mapping[str, float]):
+        """Acrescenta uma amostra no fim (canais ausentes ficam NaN)."""
+        self._reserve(1)
+        i = self.end
+        self._time[i] = t
+        for name in values:
+            self.add_channel(name)
+        for name, data in self._columns.items():
+            value = values.get(name)
+            data[i] = np.nan if value is None else value
+        self.end += 1
+        self.appended += 1
+        self._trim()
+
+    def extend(self, t: np.ndarray, columns: Mapping[str, np.ndarray]):
+        """Acrescenta um lote de amostras no fim (uma cópia por coluna)."""
+        n = len(t)
+        if not n:
+            return
+        self._reserve(n)
+        dst = slice(self.end, self.end + n)
+        self._time[dst] = t
+        for name in columns:
+            self.add_channel(name)
+        for name, data in self._columns.items():
+            values = columns.get(name)
+            data[dst] = np.nan if values is None else values
+        self.end += n
+        self.appended += n
+        self._trim()
+
+    def insert(self, t: float, values: Mapping[str, float]) -> int:
+        """
+        Insere uma amostra na posição do seu tempo (pacotes retransmitidos).
+
+        Desloca apenas as amostras posteriores a `t` (em geral poucos
+        segundos do fim do histórico).
+
+        Returns:
+            Índice (relativo a `time`) onde a amostra entrou, ou -1 se ela
+            é mais antiga que toda a janela cheia (descartada sem mexer no
+            buffer nem em `revision`)
+        """
+        if len(self) == self.capacity and t <= self._time[self.start]:
+            return -1
+        self._reserve(1)  # Antes do índice: deslizar descarta a amostra mais antiga
+        idx = self.index_of(t)
+        if idx == len(self):
+            self.append(t, values)
+            return idx
+        self.revision += 1
+        pos = self.start + idx
+        for name in values:
+            self.add_channel(name)
+        self._time[pos + 1:self.end + 1] = self._time[pos:self.end]
+        self._time[pos] = t
+        for name, data in self._columns.items():
+            data[pos + 1:self.end + 1] = data[pos:self.end]
+            value = values.get(name)
+            data[pos] = np.nan if value is None else value
+        self.end += 1
+        if len(self) > self.capacity:
+            self.start += 1
+            idx -= 1
+        return idx
+
+    def index_of(self, t: float) -> int:
+        """Primeiro índice com tempo >= t (searchsorted)."""
+        return int(np.searchsorted(self.time, t, side='left'))
+
+    def nearest_index(self, t: float) -> Optional[int]:
+        """Índice da amostra mais próxima de t (None se vazio)."""
+        n = len(self)
+        if not n:
+            return None
+        times = self.time
+        idx = int(np.searchsorted(times, t, side='left'))
+        if idx >= n:
+            return n - 1
+        if idx > 0 and abs(times[idx] - t) > abs(t - times[idx - 1]):
+            return idx - 1
+        return idx
+
+    def window(self, t_from: float, channels: Iterable[str]):
+        """
+        Views das amostras com tempo >= t_from.
+
+        Returns:
+            (tempo, {canal: valores}) - canais inexistentes são omitidos
+        """
+        i = self.start + int(np.searchsorted(self.time, t_from, side='left'))
+        columns = {name: self._columns[name][i:self.end] for name in channels if name in self._columns}
+        return self._time[i:self.end], columns
+
+
+class MultiRateStore:
+    """
+    Conjunto de LiveStore, um por base de tempo.
+
+    No CAN cada frame (Motor, Rodas, IMU...) chega na sua própria taxa e
+    com o seu próprio timestamp: os sinais de um frame compartilham uma
+    base de tempo, e nenhum canal é preenchido com o valor anterior só
+    porque outro frame chegou. No LoRa há uma única base (o pacote).
+    """
+
+    def __init__(self, capacity: int = LIVE_CAPACITY):
+        self.capacity = capacity
+        self.stores: Dict[str, LiveStore] = {}
+        self._channel_base: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Amostras da base de tempo mais longa."""
+        return max((len(store) for store in self.stores.values()), default=0)
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self._channel_base
+
+    @property
+    def channels(self) -> List[str]:
+        return list(self._channel_base)
+
+    def timebase(self, name: str) -> LiveStore:
+        """LiveStore da base de tempo `name` (criado na primeira amostra)."""
+        store = self.stores.get(name)
+        if store is None:
+            store = self.stores[name] = LiveStore(self.capacity)
+        return store
+
+    def _register(self, timebase: str, channels: Iterable[str]):
+        for name in channels:
+            self._channel_base.setdefault(name, timebase)
+
+    def append(self, timebase: str, t: float, values: Mapping[str, float]):
+        """Acrescenta uma amostra (ex.: um frame CAN) na sua base de tempo."""
+        self._register(timebase, values)
+        self.timebase(timebase).append(t, values)
+
+    def extend(self, timebase: str, t: np.ndarray, columns: Mapping[str, np.ndarray]):
+        """Acrescenta um lote de amostras na base de tempo."""
+        self._register(timebase, columns)
+        self.timebase(timebase).extend(t, columns)
+
+    def insert(self, timebase: str, t: float, values: Mapping[str, float]) -> int:
+        """Insere uma amostra na posição do seu tempo (ver LiveStore.insert)."""
+        self._register(timebase, values)
+        return self.timebase(timebase).insert(t, values)
+
+    def clear(self):
+        for store in self.stores.values():
+            store.clear()
+
+    def last_time(self) -> Optional[float]:
+        """Tempo da amostra mais recente entre todas as bases."""
+        times = [t for t in (store.last_time() for store in self.stores.values()) if t is not None]
+        return max(times) if times else None
+
+    def timebase_of(self, channel: str) -> Optional[str]:
+        """Base de tempo do canal (None se não existir)."""
+        return self._channel_base.get(channel)
+
+    def revision(self, channel: str) -> Optional[int]:
+        """Revisão da base de tempo do canal (ver LiveStore.revision)."""
+        timebase = self._channel_base.get(channel)
+        return None if timebase is None else self.stores[timebase].revision
+
+    def series(self, channel: str):
+        """(tempo, valores) do canal como views, ou None se não existir."""
+        timebase = self._channel_base.get(channel)
+        if timebase is None:
+            return None
+        store = self.stores[timebase]
+        return store.time, store.column(channel)
+
+    def window(self, t_from: float, channels: Iterable[str]):
+        """
+        Views das amostras com tempo >= t_from, cada canal na sua base.
+
+        Returns:
+            {canal: (tempo, valores)} - canais inexistentes são omitidos
+        """
+        by_base: Dict[str, List[str]] = {}
+        for name in channels:
+            if name in self._channel_base:
+                by_base.setdefault(self._channel_base[name], []).append(name)
+        result = {}
+        for timebase, names in by_base.items():
+            t, columns = self.stores[timebase].window(t_from, names)
+            for name in names:
+                result[name] = (t, columns[name])
+        return result
+
+    def nearest(self, channel: str, t: float):
+        """(índice, tempo, valor) da amostra do canal mais próxima de t, ou None."""
+        series = self.series(channel)
+        if series is None:
+            return None
+        idx = self.stores[self._channel_base[channel]].nearest_index(t)
+        if idx is None:
+            return None
+        return idx, float(series[0][idx]), series[1][idx]
+
+    def latest(self) -> Dict[str, float]:
+        """Último valor de cada canal (para os dashboards)."""
+        values = {}
+        for name in self._channel_base:
+            value = self.stores[self._channel_base[name]].last_value(name)
+            if value is not None:
+                values[name] = value
+        return values
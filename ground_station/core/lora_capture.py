@@ -0,0 +1,166 @@
+"""
+Gravação e Reprodução do Fluxo Bruto LoRa - PUCPR Racing
+
+Responsável por:
+- Gravar os bytes exatamente como saíram da serial, com o instante de recepção
+- Reproduzir uma gravação pelo mesmo caminho do LoRaReceiver (framer,
+  decodificação, anel, GUI), no ritmo original ou o mais rápido possível
+
+Formato do arquivo (.lora):
+    MAGIC (8 bytes)
+    Repetido por leitura da serial:
+        double  rx_time   // time.time() na recepção
+        uint16  length    // bytes lidos nessa chamada
+        bytes   data[length]
+
+A gravação é feita por uma thread própria: a thread de recepção só
+enfileira (rx_time, bytes) e nunca espera o disco.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+MAGIC = b'PUCPRLR1'
+RECORD_HEADER = '<dH'
+RECORD_HEADER_SIZE = struct.calcsize(RECORD_HEADER)
+MAX_RECORD = 0xFFFF  # Leituras maiores são divididas em vários registros
+
+
+class StreamRecorder:
+    """Grava o fluxo bruto da serial em background."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.queue: "queue.SimpleQueue[Optional[Tuple[float, bytes]]]" = queue.SimpleQueue()
+        self.bytes_recorded = 0
+        self.records = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+        print(f"[Captura] Gravando fluxo LoRa em {path}")
+
+    def write(self, rx_time: float, data: bytes):
+        """Enfileira um bloco recebido (chamado pela thread de recepção)."""
+        self.queue.put((rx_time, data))
+
+    def _writer_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            rx_time, data = item
+            for i in range(0, len(data), MAX_RECORD):
+                block = data[i:i + MAX_RECORD]
+                self.file.write(struct.pack(RECORD_HEADER, rx_time, len(block)))
+                self.file.write(block)
+                self.records += 1
+            self.bytes_recorded += len(data)
+        self.file.close()
+
+    def close(self):
+        """Grava o que estiver na fila e fecha o arquivo."""
+        self.queue.put(None)
+        self.thread.join(timeout=5.0)
+        print(f"[Captura] {self.bytes_recorded} bytes gravados em {self.records} blocos: {self.path}")
+
+
+def read_capture(path: str) -> Iterator[Tuple[float, bytes]]:
+    """Itera sobre (rx_time, bytes) de um arquivo gravado por StreamRecorder."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} não é uma captura LoRa ({MAGIC!r})")
+        while True:
+            header = f.read(RECORD_HEADER_SIZE)
+            if len(header) < RECORD_HEADER_SIZE:
+                return  # Fim (ou gravação interrompida no meio do cabeçalho)
+            rx_time, length = struct.unpack(RECORD_HEADER, header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield rx_time, data
+
+
+class ReplaySerial:
+    """
+    Imita a interface de serial.Serial usada pelo LoRaReceiver, entregando
+    os blocos de uma captura.
+
+    speed = 1.0 reproduz no ritmo gravado (2.0 = 2x mais rápido);
+    speed = 0 entrega tudo o mais rápido possível.
+    Escritas (NACKs do uplink) são descartadas e contadas.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, timeout: float = 0.25):
+        self.path = path
+        self.speed = speed
+        self.timeout = timeout
+        self.is_open = True
+        self.finished = False
+        self.bytes_written = 0
+
+        self._records = read_capture(path)
+        self._pending = b''
+        self._next: Optional[Tuple[float, bytes]] = next(self._records, None)
+        self._t0_capture = self._next[0] if self._next else 0.0
+        self._t0_wall = time.time()
+        if self._next is None:
+            self.finished = True
+
+    def _due(self, rx_time: float) -> float:
+        """Instante (relógio local) em que o bloco gravado em rx_time deve sair."""
+        if self.speed <= 0:
+            return 0.0
+        return self._t0_wall + (rx_time - self._t0_capture) / self.speed
+
+    def _pull_due(self):
+        """Move para o buffer os blocos cujo horário já chegou."""
+        now = time.time()
+        while self._next is not None and self._due(self._next[0]) <= now:
+            self._pending += self._next[1]
+            self._next = next(self._records, None)
+            if self.speed <= 0:
+                break  # Modo rápido: um bloco por leitura (como uma serial real)
+        if self._next is None and not self._pending:
+            self.finished = True
+
+    @property
+    def in_waiting(self) -> int:
+        self._pull_due()
+        return len(self._pending)
+
+    def read(self, size: int = 1) -> bytes:
+        self._pull_due()
+        if not self._pending and self._next is not None:
+            # Espera o próximo bloco (no máximo timeout, como a serial)
+            wait = self._due(self._next[0]) - time.time()
+            if wait > self.timeout:
+                time.sleep(self.timeout)
+                return b''
+            if wait > 0:
+                time.sleep(wait)
+            self._pull_due()
+        if not self._pending:
+            time.sleep(self.timeout)  # Fim da captura: comporta-se como timeout
+            return b''
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def write(self, data: bytes) -> int:
+        self.bytes_written += len(data)
+        return len(data)
+
+    def reset_input_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
@@ -19,6 +19,7 @@ Protocolo:
         uint16_t brakePressure; // 0-200 bar
         int16_t accelX;         // -3000 a 3000 (dividir por 1000)
         int16_t accelY;         // -3000 a 3000 (dividir por 1000)
+        int16_t reserved;       // reservado (sempre 0)
         uint16_t wheelFL;       // 0-300 km/h
         uint16_t wheelFR;
         uint16_t wheelRL;
@@ -31,6 +32,22 @@ Protocolo:
     } __attribute__((packed));
     
     Total: 36 bytes
+    
+    Enquadramento (Central com USE_PACKET_MARKERS = True):
+        Telemetria ao vivo:  AA 55 | payload (36) | 55 AA          = 40 bytes
+        Mensagem auxiliar:   AA 56 | tipo | tamanho | payload | 55 AA
+    
+    Store-and-forward (retransmissão):
+        O timestamp (ms desde o início da central) funciona como número de
+        sequência. Buracos na sequência viram pedidos NACK (tipo 0x10,
+        payload '<II' início/fim) enviados de volta pela mesma serial nos
+        intervalos sem recepção; a Central responde com mensagens tipo 0x01
+        (payload = pacote de 36 bytes original).
+    
+    Resumo de volta (tipo 0x02, calculado na Central a cada cruzamento da
+    linha de chegada; repetido 3x, deduplicado pelo número da volta):
+        '<HIHHbHI' = volta, tempo_ms, rpm_max, freio_max, temp_max,
+                     vel_max*10 (km/h), timestamp_ms do fim da volta
 """
 
 import serial
@@ -38,36 +55,372 @@ import serial.tools.list_ports
 import struct
 import threading
 import time
-from typing import Optional, Dict, Any
+import os
+import numpy as np
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 from collections import deque
 
+try:
+    from core.lora_capture import StreamRecorder, ReplaySerial
+    from core.clock_sync import ClockSync
+except ImportError:  # Execução standalone (python core/lora_receiver.py)
+    from lora_capture import StreamRecorder, ReplaySerial
+    from clock_sync import ClockSync
+
 # Constantes do protocolo
 PACKET_SIZE = 36  # Tamanho total da struct em bytes
 STRUCT_FORMAT = '<HbBHhHhhhHHHHHHHHI'  # Little-endian, campos conforme struct
 BAUD_RATE = 115200  # Taxa padrão LoRa
-TIMEOUT = 2.0  # Timeout de leitura serial (segundos)
+TIMEOUT = 0.25  # Espera máxima por dados (s): acorda para NACKs e para o stop()
 
 # Marcadores de início/fim de pacote (opcional - se a central usar)
 START_MARKER = b'\xAA\x55'  # 0xAA55 - marcador de início
 END_MARKER = b'\x55\xAA'    # 0x55AA - marcador de fim
+AUX_MARKER = b'\xAA\x56'    # 0xAA56 - marcador de mensagem auxiliar
+
+# Tipos de mensagem
+MSG_TELEMETRY = 0x00  # Pacote ao vivo (START_MARKER)
+MSG_BACKFILL = 0x01   # Pacote retransmitido pela Central
+MSG_LAP_SUMMARY = 0x02  # Resumo de volta calculado na Central
+LAP_SUMMARY_FORMAT = '<HIHHbHI'
+MSG_NACK = 0x10       # Pedido de retransmissão (Ground Station → Central)
+NACK_FORMAT = '<II'   # (timestamp inicial, timestamp final) em ms
+
+# Tamanho do payload de cada mensagem auxiliar conhecida (Central → GS).
+# Tipo desconhecido ou tamanho diferente = marcador falso no meio dos dados.
+AUX_PAYLOAD_SIZES = {
+    MSG_BACKFILL: PACKET_SIZE,
+    MSG_LAP_SUMMARY: struct.calcsize(LAP_SUMMARY_FORMAT),
+}
+READ_CHUNK = 4096  # Máximo de bytes por leitura da serial
+LATENCY_WINDOW = 500  # Pacotes usados nos percentis de latência (10 s @ 50 Hz)
+LIVE_TIMEBASE = 'LoRa'   # Base de tempo dos pacotes no live_data_storage
+MIN_LINK_DELAY_MS = 3.5  # Atraso mínimo físico: 40 bytes a 115200 baud na serial do receptor
+
+# Captura do fluxo bruto (reprodução posterior com --replay)
+RECORD_RAW_STREAM = False     # Grava toda sessão iniciada pela GUI
+CAPTURE_DIRECTORY = "capturas_lora"
+
+# Histórico sem perdas: todo pacote decodificado vai para um anel NumPy
+RING_CAPACITY = 1 << 15  # 32768 pacotes = ~11 min @ 50 Hz
+CHANNEL_FIELDS = (
+    'RPM', 'Temperatura', 'ThrottlePos', 'Lambda', 'SteeringAngle', 'BrakePressure',
+    'AccelX', 'AccelY',
+    'WheelSpeed_FL', 'WheelSpeed_FR', 'WheelSpeed_RL', 'WheelSpeed_RR',
+    'SuspensionPos_FL', 'SuspensionPos_FR', 'SuspensionPos_RL', 'SuspensionPos_RR',
+)
+PACKET_DTYPE = np.dtype(
+    [('rx_time', '<f8'),        # Relógio local na recepção (time.time())
+     ('timestamp_ms', '<u4'),   # Timestamp da Central
+     ('late', 'u1')]            # 1 = pacote retransmitido (backfill)
+    + [(name, '<f4') for name in CHANNEL_FIELDS]
+)
+
+# Store-and-forward
+ENABLE_BACKFILL = True
+NOMINAL_INTERVAL_MS = 20     # Central transmite a 50 Hz
+GAP_FACTOR = 1.8             # Intervalo > 1.8x o nominal = pacote perdido
+NACK_MIN_INTERVAL = 0.25     # Intervalo mínimo entre pedidos (s)
+NACK_TIMEOUT = 3.0           # Tempo sem resposta antes de repetir o pedido (s)
+NACK_MAX_ATTEMPTS = 3        # Tentativas por lacuna
+BACKFILL_HORIZON_MS = 25000  # Lacunas mais antigas que isso são abandonadas
+                             # (Central guarda HISTORY_SECONDS = 30 s)
+
+
+class BackfillTracker:
+    """
+    Rastreia lacunas na sequência de timestamps e decide quando pedir
+    retransmissão à Central.
+    
+    Cada lacuna é [início_ms, fim_ms, tentativas, último_pedido].
+    """
+    
+    def __init__(self, interval_ms: int = NOMINAL_INTERVAL_MS):
+        self.gap_ms = int(interval_ms * GAP_FACTOR)
+        self.gaps: List[list] = []
+        self.last_ts: Optional[int] = None
+        self.last_request_time = 0.0
+        
+        # Estatísticas
+        self.gaps_detected = 0
+        self.gaps_abandoned = 0
+    
+    def on_live(self, ts: int):
+        """Registra um pacote ao vivo; abre uma lacuna se houve salto."""
+        if self.last_ts is not None:
+            delta = ts - self.last_ts
+            if delta < 0:
+                # Central reiniciou: descarta estado anterior
+                self.gaps.clear()
+            elif delta > self.gap_ms:
+                self.gaps.append([self.last_ts + 1, ts - 1, 0, 0.0])
+                self.gaps_detected += 1
+        self.last_ts = ts
+    
+    def on_backfill(self, ts: int):
+        """
+        Um pacote retransmitido chegou: divide a lacuna em `ts`.
+        
+        O trecho antes de `ts` continua pendente (uma retransmissão anterior
+        pode ter se perdido) e é pedido de novo após NACK_TIMEOUT; o trecho
+        depois segue aguardando a resposta em andamento.
+        """
+        for i, gap in enumerate(self.gaps):
+            if gap[0] <= ts <= gap[1]:
+                # A Central está respondendo: reinicia tentativas do restante
+                self.gaps[i:i + 1] = [[gap[0], ts - 1, gap[2], gap[3]],
+                                      [ts + 1, gap[1], 1, time.time()]]
+                break
+        # Trecho menor que o intervalo de detecção = nenhuma amostra faltando
+        self.gaps = [g for g in self.gaps if (g[1] + 1) - (g[0] - 1) > self.gap_ms]
+    
+    def due_requests(self, now: float) -> List[Tuple[int, int]]:
+        """Retorna as faixas que devem ser pedidas agora."""
+        if not self.gaps or now - self.last_request_time < NACK_MIN_INTERVAL:
+            return []
+        
+        requests = []
+        keep = []
+        for gap in self.gaps:
+            too_old = self.last_ts is not None and self.last_ts - gap[1] > BACKFILL_HORIZON_MS
+            if too_old or gap[2] >= NACK_MAX_ATTEMPTS:
+                if now - gap[3] < NACK_TIMEOUT:
+                    keep.append(gap)  # Ainda aguardando a última tentativa
+                else:
+                    self.gaps_abandoned += 1
+                continue
+            if gap[2] == 0 or now - gap[3] >= NACK_TIMEOUT:
+                requests.append((gap[0], gap[1]))
+                gap[2] += 1
+                gap[3] = now
+            keep.append(gap)
+        self.gaps = keep
+        
+        if requests:
+            self.last_request_time = now
+        return requests
+
+
+class LoRaFramer:
+    """
+    Separa quadros do fluxo serial sem copiar bytes.
+    
+    Os bytes recebidos são acumulados num bytearray; parse() procura os
+    marcadores com bytearray.find e devolve os payloads como fatias de
+    memoryview (válidas até a próxima chamada de feed()). Quem chama deve
+    soltar as fatias antes do próximo feed(): enquanto houver alguma viva,
+    o prefixo consumido não pode ser removido no lugar e o buffer é copiado.
+    
+    Um byte perdido ou corrompido invalida só o quadro em que caiu: o
+    END_MARKER não confere, a busca recomeça no byte seguinte e o próximo
+    quadro íntegro é encontrado. Bytes descartados contam como lixo.
+    """
+    
+    TELEMETRY_FRAME = len(START_MARKER) + PACKET_SIZE + len(END_MARKER)
+    
+    def __init__(self):
+        self.buffer = bytearray()
+        self.pos = 0  # Início dos bytes ainda não consumidos
+        
+        # Estatísticas
+        self.frames_ok = 0
+        self.frames_bad = 0      # Marcador válido mas END_MARKER não confere
+        self.garbage_bytes = 0   # Bytes descartados durante a ressincronização
+    
+    def feed(self, data: bytes):
+        """Acrescenta bytes recebidos (descarta os já consumidos)."""
+        if self.pos:
+            try:
+                del self.buffer[:self.pos]
+            except BufferError:
+                # Alguma fatia de memoryview ainda viva: troca de buffer
+                self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += data
+    
+    def parse(self) -> List[Tuple[int, memoryview]]:
+        """
+        Extrai todos os quadros completos do buffer.
+        
+        Returns:
+            Lista de (tipo, payload); payload é memoryview do buffer interno
+        """
+        buf = self.buffer
+        view = memoryview(buf)
+        end_len = len(END_MARKER)
+        frames = []
+        pos = self.pos
+        size = len(buf)
+        
+        while True:
+            start = buf.find(START_MARKER[0], pos)
+            if start < 0:
+                # Nenhum candidato: tudo é lixo
+                self.garbage_bytes += size - pos
+                pos = size
+                break
+            self.garbage_bytes += start - pos
+            pos = start
+            if size - start < 2:
+                break  # Marcador incompleto: espera mais bytes
+            
+            second = buf[start + 1]
+            if second == START_MARKER[1]:
+                msg_type = MSG_TELEMETRY
+                header = len(START_MARKER)
+                length = PACKET_SIZE
+            elif second == AUX_MARKER[1]:
+                if size - start < 4:
+                    break
+                msg_type = buf[start + 2]
+                length = buf[start + 3]
+                header = len(AUX_MARKER) + 2
+                if AUX_PAYLOAD_SIZES.get(msg_type) != length:
+                    self.garbage_bytes += 1
+                    pos = start + 1  # Marcador falso
+                    continue
+            else:
+                self.garbage_bytes += 1
+                pos = start + 1
+                continue
+            
+            frame_end = start + header + length + end_len
+            if frame_end > size:
+                break  # Quadro incompleto: espera mais bytes
+            
+            if view[frame_end - end_len:frame_end] != END_MARKER:
+                self.frames_bad += 1
+                self.garbage_bytes += 1
+                pos = start + 1  # Ressincroniza no byte seguinte
+                continue
+            
+            frames.append((msg_type, view[start + header:frame_end - end_len]))
+            self.frames_ok += 1
+            pos = frame_end
+        
+        self.pos = pos
+        view.release()  # As fatias em `frames` continuam válidas
+        return frames
+
+
+# Mesma struct de STRUCT_FORMAT como dtype NumPy (decodificação em lote)
+RAW_PACKET_DTYPE = np.dtype([
+    ('RPM', '<u2'), ('Temperatura', 'i1'), ('ThrottlePos', 'u1'), ('Lambda', '<u2'),
+    ('SteeringAngle', '<i2'), ('BrakePressure', '<u2'), ('AccelX', '<i2'), ('AccelY', '<i2'),
+    ('reserved', '<i2'),
+    ('WheelSpeed_FL', '<u2'), ('WheelSpeed_FR', '<u2'), ('WheelSpeed_RL', '<u2'), ('WheelSpeed_RR', '<u2'),
+    ('SuspensionPos_FL', '<u2'), ('SuspensionPos_FR', '<u2'), ('SuspensionPos_RL', '<u2'), ('SuspensionPos_RR', '<u2'),
+    ('timestamp_ms', '<u4'),
+])
+assert RAW_PACKET_DTYPE.itemsize == PACKET_SIZE == struct.calcsize(STRUCT_FORMAT)
+
+# Divisores aplicados por coluna (demais canais são inteiros sem escala)
+CHANNEL_SCALES = {'Lambda': 1000.0, 'SteeringAngle': 10.0, 'AccelX': 1000.0, 'AccelY': 1000.0}
+
+
+def decode_packets(buffer) -> Dict[str, np.ndarray]:
+    """
+    Decodifica N pacotes de uma vez (equivalente vetorizado de unpack_packet).
+    
+    Args:
+        buffer: Bytes contíguos com N payloads de PACKET_SIZE (sem marcadores)
+    
+    Returns:
+        Dicionário coluna → array (CHANNEL_FIELDS + 'timestamp_ms')
+    """
+    raw = np.frombuffer(buffer, dtype=RAW_PACKET_DTYPE)
+    columns = {}
+    for name in CHANNEL_FIELDS:
+        scale = CHANNEL_SCALES.get(name)
+        columns[name] = raw[name] / scale if scale else raw[name]
+    columns['timestamp_ms'] = raw['timestamp_ms']
+    return columns
+
+
+class PacketRing:
+    """
+    Anel pré-alocado (array estruturado NumPy) com todos os pacotes recebidos.
+    
+    Um escritor (thread de recepção) e leitores por cursor: o cursor é o
+    total de pacotes já lidos. write_index só cresce e é atualizado depois
+    de a linha estar gravada, então o leitor não precisa de lock.
+    """
+    
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=PACKET_DTYPE)
+        self.write_index = 0  # Total de pacotes gravados desde o início
+    
+    def extend(self, rx_time: float, late: bool, columns: Dict[str, np.ndarray]):
+        """Grava um lote decodificado por decode_packets (apenas a thread de recepção)."""
+        n = len(columns['timestamp_ms'])
+        skip = max(0, n - self.capacity)  # Lote maior que o anel: só o final cabe
+        pos = (self.write_index + skip) % self.capacity
+        first = min(n - skip, self.capacity - pos)  # Até o fim do array
+        
+        for dst, src in ((slice(pos, pos + first), slice(skip, skip + first)),
+                         (slice(0, n - skip - first), slice(skip + first, n))):
+            if dst.stop <= dst.start:
+                continue
+            block = self.data[dst]
+            block['rx_time'] = rx_time
+            block['late'] = late
+            block['timestamp_ms'] = columns['timestamp_ms'][src]
+            for name in CHANNEL_FIELDS:
+                block[name] = columns[name][src]
+        self.write_index += n
+    
+    def read_since(self, cursor: int) -> Tuple[np.ndarray, int, int]:
+        """
+        Copia as linhas gravadas depois de `cursor`.
+        
+        Returns:
+            (linhas, novo_cursor, perdidas) - perdidas > 0 se o leitor ficou
+            mais de `capacity` pacotes atrás e o anel sobrescreveu linhas
+        """
+        end = self.write_index
+        start = max(cursor, end - self.capacity)
+        if start >= end:
+            return self.data[:0].copy(), end, 0
+        
+        i0, i1 = start % self.capacity, end % self.capacity
+        if i0 < i1:
+            rows = self.data[i0:i1].copy()
+        else:
+            rows = np.concatenate((self.data[i0:], self.data[:i1]))
+        
+        # O escritor pode ter sobrescrito o início durante a cópia
+        overwritten = self.write_index - self.capacity - start
+        if overwritten > 0:
+            rows = rows[overwritten:]
+            start += overwritten
+        return rows, end, start - cursor
 
 
 class LoRaReceiver:
     """Gerenciador de recepção LoRa via Serial"""
     
-    def __init__(self, port: Optional[str] = None):
+    def __init__(self, port: Optional[str] = None, serial_conn=None, baud_rate: int = BAUD_RATE):
         """
         Inicializa o receptor LoRa.
         
         Args:
             port: Porta serial (ex: 'COM3' ou '/dev/ttyUSB0').
                   Se None, tentará detectar automaticamente.
+            serial_conn: Conexão já aberta (ex: ReplaySerial). Se informada,
+                         connect() não abre porta nenhuma.
+            baud_rate: Taxa da serial
         """
         self.port = port
-        self.serial_conn: Optional[serial.Serial] = None
+        self.baud_rate = baud_rate
+        self.serial_conn: Optional[serial.Serial] = serial_conn
         self.running = False
         self.thread: Optional[threading.Thread] = None
         
+        # Gravação opcional do fluxo bruto
+        self.recorder: Optional[StreamRecorder] = None
+        
         # Buffer de dados recebidos
         self.latest_data: Dict[str, Any] = {}
         self.data_lock = threading.Lock()
@@ -79,6 +432,28 @@ class LoRaReceiver:
         
         # Buffer circular para cálculo de Hz
         self.rx_times = deque(maxlen=50)
+        
+        # Enquadramento do fluxo serial
+        self.framer = LoRaFramer()
+        
+        # Relógio da Central → relógio local (offset + deriva) e latência de entrega
+        self.clock = ClockSync(MIN_LINK_DELAY_MS / 1000.0)
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        
+        # Histórico sem perdas (ao vivo + retransmitidos), lido por cursor
+        self.ring = PacketRing(RING_CAPACITY)
+        
+        # Store-and-forward: lacunas na sequência
+        self.backfill = BackfillTracker()
+        self.packets_backfilled = 0
+        self.nacks_sent = 0
+        
+        # Resumos de volta (chave = número da volta)
+        self.lap_summaries: Dict[int, Dict[str, Any]] = {}
+        self.new_laps: List[Dict[str, Any]] = []
+        
+        # Último timestamp ao vivo (detecta reinício da Central)
+        self.last_live_ts_ms: Optional[int] = None
     
     def list_available_ports(self) -> list:
         """Lista portas seriais disponíveis no sistema."""
@@ -130,13 +505,13 @@ class LoRaReceiver:
         try:
             self.serial_conn = serial.Serial(
                 port=self.port,
-                baudrate=BAUD_RATE,
+                baudrate=self.baud_rate,
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
                 timeout=TIMEOUT
             )
-            print(f"[LoRa] Conectado em {self.port} @ {BAUD_RATE} baud")
+            print(f"[LoRa] Conectado em {self.port} @ {self.baud_rate} baud")
             time.sleep(2)  # Aguarda estabilização da conexão
             self.serial_conn.reset_input_buffer()  # Limpa buffer antigo
             return True
@@ -179,15 +554,16 @@ class LoRaReceiver:
                 'BrakePressure': unpacked[5],
                 'AccelX': unpacked[6] / 1000.0,
                 'AccelY': unpacked[7] / 1000.0,
-                'WheelSpeed_FL': unpacked[8],
-                'WheelSpeed_FR': unpacked[9],
-                'WheelSpeed_RL': unpacked[10],
-                'WheelSpeed_RR': unpacked[11],
-                'SuspensionPos_FL': unpacked[12],
-                'SuspensionPos_FR': unpacked[13],
-                'SuspensionPos_RL': unpacked[14],
-                'SuspensionPos_RR': unpacked[15],
-                'timestamp_ms': unpacked[16]
+                # unpacked[8]: int16 reservado
+                'WheelSpeed_FL': unpacked[9],
+                'WheelSpeed_FR': unpacked[10],
+                'WheelSpeed_RL': unpacked[11],
+                'WheelSpeed_RR': unpacked[12],
+                'SuspensionPos_FL': unpacked[13],
+                'SuspensionPos_FR': unpacked[14],
+                'SuspensionPos_RL': unpacked[15],
+                'SuspensionPos_RR': unpacked[16],
+                'timestamp_ms': unpacked[17]
             }
             
             return data
@@ -196,78 +572,160 @@ class LoRaReceiver:
             print(f"[LoRa] Erro ao desempacotar: {e}")
             return None
     
-    def read_packet(self) -> Optional[bytes]:
+    def unpack_lap_summary(self, raw_data: bytes) -> Optional[Dict[str, Any]]:
+        """Desempacota um resumo de volta (MSG_LAP_SUMMARY)."""
+        if len(raw_data) != struct.calcsize(LAP_SUMMARY_FORMAT):
+            return None
+        lap, lap_time_ms, max_rpm, max_brake, max_temp, max_speed, end_ts = \
+            struct.unpack(LAP_SUMMARY_FORMAT, raw_data)
+        return {
+            'lap': lap,
+            'lap_time_s': lap_time_ms / 1000.0,
+            'max_rpm': max_rpm,
+            'max_brake': max_brake,
+            'max_temp': max_temp,
+            'max_speed': max_speed / 10.0,
+            'timestamp_ms': end_ts
+        }
+    
+    def read_frames(self) -> List[Tuple[int, memoryview]]:
         """
-        Lê um pacote completo da serial.
+        Lê tudo o que estiver disponível na serial e retorna os quadros completos.
         
-        Estratégia:
-        1. Se usar marcadores (START/END), busca por eles
-        2. Caso contrário, lê exatamente PACKET_SIZE bytes
+        Sem dados, bloqueia na própria serial (até TIMEOUT) esperando o
+        primeiro byte; com dados, lê in_waiting de uma vez (até READ_CHUNK).
+        Os payloads são válidos até a próxima chamada.
         
         Returns:
-            Bytes do pacote ou None se timeout/erro
+            Lista de (tipo, payload) - vazia em timeout/erro
         """
         if not self.serial_conn or not self.serial_conn.is_open:
-            return None
+            return []
         
         try:
-            # Opção 1: Se a Central usar marcadores START/END
-            # (comentar se a Central NÃO enviar marcadores)
-            '''
-            # Busca marcador de início
-            while self.running:
-                if self.serial_conn.read(1) == START_MARKER[0]:
-                    if self.serial_conn.read(1) == START_MARKER[1]:
-                        # Encontrou START_MARKER, lê payload
-                        payload = self.serial_conn.read(PACKET_SIZE)
-                        # Lê marcador de fim
-                        end = self.serial_conn.read(len(END_MARKER))
-                        if end == END_MARKER:
-                            return payload
-            '''
-            
-            # Opção 2: Leitura direta de bytes (SEM marcadores)
-            # Mais simples se a Central enviar pacotes com intervalo fixo
-            data = self.serial_conn.read(PACKET_SIZE)
-            if len(data) == PACKET_SIZE:
-                return data
-            
-            return None
-            
+            waiting = self.serial_conn.in_waiting
+            chunk = self.serial_conn.read(min(max(waiting, 1), READ_CHUNK))
         except serial.SerialException as e:
             print(f"[LoRa] Erro na leitura: {e}")
-            return None
+            time.sleep(TIMEOUT)  # Porta caiu: evita loop ocupado
+            return []
+        
+        if not chunk:
+            return []  # Timeout
+        if self.recorder:
+            self.recorder.write(time.time(), chunk)
+        self.framer.feed(chunk)
+        return self.framer.parse()
+    
+    def send_nack(self, start_ms: int, end_ms: int) -> bool:
+        """Pede à Central a retransmissão da faixa [start_ms, end_ms]."""
+        if not self.serial_conn or not self.serial_conn.is_open:
+            return False
+        
+        payload = struct.pack(NACK_FORMAT, start_ms, end_ms)
+        frame = AUX_MARKER + bytes((MSG_NACK, len(payload))) + payload + END_MARKER
+        try:
+            self.serial_conn.write(frame)
+            self.nacks_sent += 1
+            return True
+        except serial.SerialException as e:
+            print(f"[LoRa] Erro ao enviar NACK: {e}")
+            return False
     
     def reception_loop(self):
         """Thread principal de recepção de dados."""
         print("[LoRa] Thread de recepção iniciada")
         
         while self.running:
-            # Lê pacote
-            raw_packet = self.read_packet()
+            # Lê tudo o que chegou (bloqueia apenas se a serial estiver vazia)
+            frames = self.read_frames()
+            now = time.time()
             
-            if raw_packet:
-                # Desempacota
-                data = self.unpack_packet(raw_packet)
-                
-                if data:
-                    # Atualiza dados mais recentes (thread-safe)
-                    with self.data_lock:
-                        self.latest_data = data
-                    
-                    self.packets_received += 1
-                    self.rx_times.append(time.time())
-                    
-                    # Debug (comentar em produção)
-                    # print(f"[LoRa] RPM={data['RPM']}, Temp={data['Temperatura']}°C")
-                else:
-                    self.packets_errors += 1
+            if frames:
+                self._handle_frames(frames, now)
+            # Solta as fatias do buffer antes do próximo feed(): sem isso o
+            # del do prefixo consumido falha e o buffer é copiado a cada leitura
+            del frames
             
-            # Pequeno delay para não sobrecarregar CPU
-            time.sleep(0.01)  # 10ms = ~100Hz máximo
+            # Pede retransmissões apenas com o canal ocioso (nada chegando)
+            if ENABLE_BACKFILL and self.serial_conn and self.serial_conn.in_waiting == 0:
+                for start_ms, end_ms in self.backfill.due_requests(time.time()):
+                    self.send_nack(start_ms, end_ms)
         
         print("[LoRa] Thread de recepção finalizada")
     
+    def _handle_frames(self, frames: List[Tuple[int, memoryview]], now: float):
+        """
+        Processa um lote de quadros recebidos em `now` (relógio local).
+        
+        Os pacotes de telemetria (ao vivo e retransmitidos) são decodificados
+        juntos com decode_packets e gravados no anel de uma vez.
+        """
+        live = [payload for msg_type, payload in frames if msg_type == MSG_TELEMETRY]
+        late = [payload for msg_type, payload in frames if msg_type == MSG_BACKFILL]
+        
+        if live:
+            columns = decode_packets(b''.join(live))
+            timestamps = columns['timestamp_ms'].tolist()
+            ts = timestamps[-1]
+            
+            # Atualiza dados mais recentes (thread-safe)
+            latest = {name: columns[name][-1].item() for name in CHANNEL_FIELDS}
+            latest['timestamp_ms'] = ts
+            with self.data_lock:
+                if self.last_live_ts_ms is not None and timestamps[0] < self.last_live_ts_ms:
+                    self.clock.reset()  # Central reiniciou
+                    self.latencies_ms.clear()
+                self.latest_data = latest
+                self.last_live_ts_ms = ts
+                # O último pacote do lote foi o que menos esperou na fila
+                self.clock.update(ts / 1000.0, now)
+                latencies = self.clock.latency(columns['timestamp_ms'] / 1000.0, now) * 1000.0
+            
+            self.ring.extend(now, False, columns)
+            self.packets_received += len(timestamps)
+            self.rx_times.extend([now] * len(timestamps))
+            self.latencies_ms.extend(latencies.tolist())
+            if ENABLE_BACKFILL:
+                for t in timestamps:
+                    self.backfill.on_live(t)
+        
+        if late:
+            # Pacotes atrasados: a GUI encaixa na posição certa pelo timestamp
+            columns = decode_packets(b''.join(late))
+            self.ring.extend(now, True, columns)
+            self.packets_backfilled += len(late)
+            for t in columns['timestamp_ms'].tolist():
+                self.backfill.on_backfill(t)
+        
+        for msg_type, payload in frames:
+            if msg_type == MSG_LAP_SUMMARY:
+                lap = self.unpack_lap_summary(payload)
+                if lap is None:
+                    self.packets_errors += 1
+                else:
+                    self._store_lap_summary(lap)
+            elif msg_type not in (MSG_TELEMETRY, MSG_BACKFILL):
+                self.packets_errors += 1
+    
+    def _store_lap_summary(self, lap: Dict[str, Any]):
+        """Guarda um resumo de volta, ignorando as repetições."""
+        with self.data_lock:
+            known = self.lap_summaries.get(lap['lap'])
+            if known and known['timestamp_ms'] == lap['timestamp_ms']:
+                return  # Repetição do mesmo resumo
+            if known is None and lap['lap'] == 1 and self.lap_summaries:
+                self.lap_summaries.clear()  # Central reiniciou a contagem
+            self.lap_summaries[lap['lap']] = lap
+            self.new_laps.append(lap)
+        print(f"[LoRa] Volta {lap['lap']}: {lap['lap_time_s']:.3f} s | RPM máx {lap['max_rpm']}")
+    
+    def pop_lap_summaries(self) -> List[Dict[str, Any]]:
+        """Retorna (e esvazia) os resumos de volta recebidos desde a última chamada."""
+        with self.data_lock:
+            laps, self.new_laps = self.new_laps, []
+            return laps
+    
     def start(self) -> bool:
         """
         Inicia recepção em background.
@@ -301,9 +759,21 @@ class LoRaReceiver:
         if self.thread:
             self.thread.join(timeout=3.0)
         
+        self.stop_recording()
         self.disconnect()
         print("[LoRa] Recepção parada")
     
+    def start_recording(self, path: str):
+        """Passa a gravar os bytes lidos da serial em `path` (formato .lora)."""
+        self.stop_recording()
+        self.recorder = StreamRecorder(path)
+    
+    def stop_recording(self):
+        """Encerra a gravação do fluxo bruto, se houver."""
+        recorder, self.recorder = self.recorder, None
+        if recorder:
+            recorder.close()
+    
     def get_latest_data(self) -> Dict[str, Any]:
         """
         Retorna os dados mais recentes recebidos (thread-safe).
@@ -314,6 +784,37 @@ class LoRaReceiver:
         with self.data_lock:
             return self.latest_data.copy()
     
+    def new_cursor(self) -> int:
+        """Cursor que começa a ler a partir do próximo pacote recebido."""
+        return self.ring.write_index
+    
+    def read_new(self, cursor: int) -> Tuple[np.ndarray, int]:
+        """
+        Retorna todos os pacotes recebidos depois de `cursor` (em lote).
+        
+        Args:
+            cursor: Valor retornado por new_cursor() ou pela chamada anterior
+        
+        Returns:
+            (linhas PACKET_DTYPE em ordem de chegada, novo cursor)
+        """
+        rows, cursor, dropped = self.ring.read_since(cursor)
+        if dropped:
+            print(f"[LoRa] Leitor atrasado: {dropped} pacotes sobrescritos no anel")
+        return rows, cursor
+    
+    def local_time(self, timestamp_ms):
+        """
+        Converte timestamp(s) da Central (ms) no instante local (time.time())
+        em que a amostra foi medida, pela estimativa de offset/deriva.
+        
+        Aceita escalar ou array; retorna None antes do primeiro pacote ao vivo.
+        """
+        with self.data_lock:
+            if not self.clock.ready:
+                return None
+            return self.clock.to_local(np.asarray(timestamp_ms, dtype=np.float64) / 1000.0)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Retorna estatísticas de recepção."""
         uptime = time.time() - self.start_time
@@ -325,131 +826,138 @@ class LoRaReceiver:
             if dt > 0:
                 hz = (len(self.rx_times) - 1) / dt
         
+        latency = self.get_latency_percentiles()
+        
         return {
             'packets_received': self.packets_received,
             'packets_errors': self.packets_errors,
             'success_rate': (self.packets_received / max(self.packets_received + self.packets_errors, 1)) * 100,
             'uptime_seconds': uptime,
-            'current_hz': hz
+            'current_hz': hz,
+            'packets_backfilled': self.packets_backfilled,
+            'nacks_sent': self.nacks_sent,
+            'gaps_open': len(self.backfill.gaps),
+            'gaps_detected': self.backfill.gaps_detected,
+            'gaps_abandoned': self.backfill.gaps_abandoned,
+            'frames_bad': self.framer.frames_bad,
+            'garbage_bytes': self.framer.garbage_bytes,
+            'latency_p50_ms': latency[0],
+            'latency_p95_ms': latency[1],
+            'latency_p99_ms': latency[2],
+            'clock_offset_ms': self.clock.offset_s * 1000.0,
+            'clock_drift_ppm': self.clock.drift_ppm
         }
+    
+    def get_latency_percentiles(self) -> Tuple[float, float, float]:
+        """
+        Percentis (p50, p95, p99) da latência de entrega em ms.
+        
+        Latência = chegada - instante local da medição (ClockSync). Como os
+        relógios não são sincronizados, o pacote mais rápido da janela vale
+        MIN_LINK_DELAY_MS; os demais somam o atraso de fila, ar e leitura.
+        """
+        latencies = sorted(self.latencies_ms)
+        if not latencies:
+            return 0.0, 0.0, 0.0
+        n = len(latencies)
+        return tuple(latencies[min(n - 1, int(n * q))] for q in (0.50, 0.95, 0.99))
+
+
+def open_replay(path: str, speed: float = 1.0) -> LoRaReceiver:
+    """
+    Cria um receptor que lê uma captura .lora em vez da serial.
+    
+    Os bytes passam pelo mesmo caminho da recepção ao vivo (framer,
+    decode_packets, anel, GUI). Os NACKs são aceitos e descartados.
+    
+    Args:
+        path: Arquivo gravado com start_recording()
+        speed: 1.0 = ritmo original, 2.0 = 2x mais rápido, 0 = sem espera
+    """
+    return LoRaReceiver(port=f"replay:{os.path.basename(path)}",
+                        serial_conn=ReplaySerial(path, speed=speed, timeout=TIMEOUT))
+
+
+def new_capture_path() -> str:
+    """Nome de arquivo para uma nova captura em CAPTURE_DIRECTORY."""
+    return os.path.join(CAPTURE_DIRECTORY, f"lora_{datetime.now().strftime('%Y%m%d_%H%M%S')}.lora")
 
 
 # ========== Integração com o Dashboard ==========
 
-def start_lora_telemetry(app_instance, port: Optional[str] = None):
+def start_lora_telemetry(app_instance, port: Optional[str] = None,
+                         replay_path: Optional[str] = None, replay_speed: float = 1.0):
     """
-    Inicia telemetria LoRa e integra com o dashboard.
+    Inicia telemetria LoRa e integra com o dashboard (fonte LoRaSource no
+    caminho único de telemetry_realtime).
     
     Args:
         app_instance: Instância de AppAnalisePUCPR
         port: Porta serial (opcional, auto-detecta se None)
+        replay_path: Captura .lora para reproduzir no lugar da serial
+        replay_speed: Velocidade da reprodução (1.0 = ritmo original)
     """
-    # Cria receptor
-    app_instance.lora_receiver = LoRaReceiver(port=port)
-    
-    # Inicia recepção
-    if app_instance.lora_receiver.start():
-        app_instance.is_live_active = True
-        app_instance.start_time_live = time.time()
-        app_instance.live_data_storage = {'Time': []}
-        
-        # Atualiza UI
-        app_instance.btn_live_toggle.configure(text="⏹️ Parar LoRa", fg_color="#C62828")
-        app_instance.lbl_live_status.configure(text=f"Status: LoRa conectado ({app_instance.lora_receiver.port})")
-        
-        # Inicia loop de atualização da GUI
-        app_instance.after(100, lambda: update_lora_gui(app_instance))
-        
-        return True
-    else:
-        app_instance.lbl_live_status.configure(text="Status: ERRO ao conectar LoRa")
-        return False
+    from core.telemetry_realtime import start_live_telemetry
+    from core.telemetry_sources import LoRaSource
+    return start_live_telemetry(app_instance, LoRaSource(port=port, replay_path=replay_path,
+                                                         replay_speed=replay_speed))
 
 
 def stop_lora_telemetry(app_instance):
     """Para telemetria LoRa."""
-    if hasattr(app_instance, 'lora_receiver'):
-        app_instance.lora_receiver.stop()
-    
-    app_instance.is_live_active = False
-    app_instance.btn_live_toggle.configure(text="▶️ Iniciar LoRa", fg_color="#D32F2F")
-    app_instance.lbl_live_status.configure(text="Status: Parado")
+    from core.telemetry_realtime import stop_live_telemetry
+    stop_live_telemetry(app_instance)
 
 
-def update_lora_gui(app_instance):
-    """
-    Atualiza GUI com dados LoRa (chamado a cada 100ms via after).
-    """
-    if not app_instance.is_live_active:
+def _update_lap_panel(app_instance, receiver: LoRaReceiver, max_laps: int = 8):
+    """Mostra as últimas voltas recebidas no painel VOLTAS do dashboard."""
+    if not hasattr(app_instance, 'lbl_live_laps'):
         return
     
-    if not hasattr(app_instance, 'lora_receiver'):
+    with receiver.data_lock:
+        laps = sorted(receiver.lap_summaries.values(), key=lambda v: v['lap'])
+    if not laps:
         return
     
-    # Pega dados mais recentes
-    dados_recentes = app_instance.lora_receiver.get_latest_data()
-    
-    if dados_recentes:
-        # Calcula tempo relativo
-        current_time_rel = time.time() - app_instance.start_time_live
-        
-        # Atualiza armazenamento para gráfico
-        if 'Time' not in app_instance.live_data_storage:
-            app_instance.live_data_storage['Time'] = []
-        app_instance.live_data_storage['Time'].append(current_time_rel)
-        
-        # Sincroniza canais (mesmo código do telemetry_realtime.py)
-        target_len = len(app_instance.live_data_storage['Time'])
-        
-        canais_para_atualizar = set(app_instance.live_data_storage.keys()) | set(dados_recentes.keys()) | set(app_instance.selected_live_channels)
-        canais_para_atualizar.discard('Time')
-        
-        for canal in canais_para_atualizar:
-            if canal not in app_instance.live_data_storage:
-                app_instance.live_data_storage[canal] = []
-            
-            current_len = len(app_instance.live_data_storage[canal])
-            missing_steps = target_len - 1 - current_len
-            
-            if missing_steps > 0:
-                app_instance.live_data_storage[canal].extend([0] * missing_steps)
-            
-            valor = dados_recentes.get(canal, 0)
-            app_instance.live_data_storage[canal].append(valor)
-        
-        # Atualiza estatísticas
-        stats = app_instance.lora_receiver.get_statistics()
-        app_instance.lbl_live_status.configure(
-            text=f"Status: LoRa {stats['current_hz']:.1f} Hz | {stats['packets_received']} pkts | {stats['success_rate']:.1f}% OK"
-        )
-        
-        # Atualiza dashboards (reutiliza função existente)
-        from core.telemetry_realtime import _update_dashboard_labels
-        _update_dashboard_labels(app_instance, dados_recentes)
-        
-        # Atualiza gráfico (reutiliza código do live_plotting)
-        if not app_instance.live_freeze and len(app_instance.live_data_storage['Time']) > 1:
-            app_instance.update_live_plot_style()  # Força redesenho
-    
-    # Reagenda
-    if app_instance.is_live_active:
-        app_instance.after(100, lambda: update_lora_gui(app_instance))
+    best = min(laps, key=lambda v: v['lap_time_s'])
+    linhas = [f"{'Volta':>5} {'Tempo':>8} {'RPM':>6} {'Freio':>5} {'Temp':>4}"]
+    for lap in laps[-max_laps:]:
+        marca = ' *' if lap is best else ''
+        linhas.append(f"{lap['lap']:>5} {lap['lap_time_s']:>8.3f} {lap['max_rpm']:>6} "
+                      f"{lap['max_brake']:>5} {lap['max_temp']:>4}{marca}")
+    linhas.append(f"Melhor: volta {best['lap']} ({best['lap_time_s']:.3f} s)")
+    app_instance.lbl_live_laps.configure(text="\n".join(linhas))
 
 
 # ========== Exemplo de Uso Standalone ==========
 
 if __name__ == "__main__":
     """Teste standalone do receptor LoRa"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Teste do Receptor LoRa")
+    parser.add_argument('port', nargs='?', help="Porta serial (ex: /dev/pts/3); auto-detecta se omitida")
+    parser.add_argument('--record', metavar='ARQUIVO', help="Grava o fluxo bruto em ARQUIVO (.lora)")
+    parser.add_argument('--replay', metavar='ARQUIVO', help="Reproduz uma captura .lora no lugar da serial")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Velocidade da reprodução (1.0 = original, 0 = o mais rápido possível)")
+    args = parser.parse_args()
+    
     print("=== Teste do Receptor LoRa ===\n")
     
-    # Cria receptor
-    receiver = LoRaReceiver()
+    if args.replay:
+        receiver = open_replay(args.replay, args.speed)
+    else:
+        receiver = LoRaReceiver(port=args.port)
+        
+        # Lista portas disponíveis
+        print("Portas seriais disponíveis:")
+        for device, desc in receiver.list_available_ports():
+            print(f"  {device}: {desc}")
+        print()
     
-    # Lista portas disponíveis
-    print("Portas seriais disponíveis:")
-    for device, desc in receiver.list_available_ports():
-        print(f"  {device}: {desc}")
-    print()
+    if args.record:
+        receiver.start_recording(args.record)
     
     # Inicia recepção
     if receiver.start():
@@ -467,12 +975,23 @@ if __name__ == "__main__":
                     print(f"[{stats['current_hz']:5.1f} Hz] RPM={data.get('RPM', 0):5d} | "
                           f"Temp={data.get('Temperatura', 0):3d}°C | "
                           f"TPS={data.get('ThrottlePos', 0):3d}% | "
-                          f"Brake={data.get('BrakePressure', 0):3d} bar")
+                          f"Brake={data.get('BrakePressure', 0):3d} bar | "
+                          f"Recuperados={stats['packets_backfilled']} | "
+                          f"Lacunas={stats['gaps_open']} | "
+                          f"Latência p50/p99={stats['latency_p50_ms']:.1f}/{stats['latency_p99_ms']:.1f} ms | "
+                          f"Deriva={stats['clock_drift_ppm']:+.0f} ppm")
                 else:
                     print(f"Aguardando dados... ({stats['packets_received']} pacotes recebidos)")
+                
+                if args.replay and receiver.serial_conn.finished:
+                    print("\nFim da captura")
+                    break
         
         except KeyboardInterrupt:
             print("\n\nParando...")
     
+    stats = receiver.get_statistics()
     receiver.stop()
+    print(f"Pacotes: {stats['packets_received']} ao vivo, {stats['packets_backfilled']} recuperados, "
+          f"{stats['packets_errors']} erros, {stats['frames_bad']} quadros corrompidos")
     print("Finalizado!")
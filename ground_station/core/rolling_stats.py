@@ -0,0 +1,228 @@
+"""
+Estatísticas Móveis dos Canais Ao Vivo - PUCPR Racing
+
+Responsável por:
+- Manter mínimo, máximo, média e desvio padrão de cada canal ao vivo em
+  janelas de tempo (ex.: últimos 10 s) ou desde uma marca (ex.: volta
+  atual), sem varrer o histórico
+- Servir o Auto-Scale do eixo Y do gráfico ao vivo e o painel de
+  estatísticas
+
+Método:
+    As amostras entram em lote (um bloco por frame CAN ou lote LoRa) e são
+    agrupadas em baldes de BUCKET_S segundos com NumPy (contagem, média,
+    M2, mínimo, máximo por canal). Cada janela guarda:
+    - média/variância da janela por Welford em bloco (fórmula de Chan):
+      o balde que entra é somado, o que sai da janela é subtraído
+    - mínimo e máximo por filas monotônicas de baldes (a frente da fila é
+      sempre o extremo da janela)
+
+    O trabalho em Python é por balde (10 por segundo por canal), não por
+    amostra: a 5 kHz continua O(1) por amostra (amortizado). A borda
+    antiga da janela tem a resolução de um balde.
+
+    NaN (canal sem valor na amostra) é ignorado.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+BUCKET_S = 0.1             # Resolução das janelas (segundos)
+RESYNC_BUCKETS = 1000      # Recalcula a soma da janela após tantas remoções (erro de arredondamento)
+
+
+class WindowStats(NamedTuple):
+    n: int
+    min: float
+    max: float
+    mean: float
+    std: float
+
+
+def _merge(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """Junta dois grupos (contagem, média, M2) - Chan et al."""
+    n = n_a + n_b
+    if not n_a:
+        return n_b, mean_b, m2_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+
+def _remove(n, mean, m2, n_b, mean_b, m2_b):
+    """Inverso de _merge: tira o grupo b do total."""
+    n_a = n - n_b
+    if n_a <= 0:
+        return 0, 0.0, 0.0
+    mean_a = (n * mean - n_b * mean_b) / n_a
+    delta = mean_b - mean_a
+    return n_a, mean_a, max(m2 - m2_b - delta * delta * n_a * n_b / n, 0.0)
+
+
+class RollingWindow:
+    """Estatísticas de um canal numa janela de tempo (window_s=None: desde o último reset)."""
+
+    def __init__(self, window_s: Optional[float], bucket_s: float = BUCKET_S):
+        self.window_s = window_s
+        self.span = None if window_s is None else max(1, math.ceil(window_s / bucket_s - 1e-9))
+        self.reset()
+
+    def reset(self):
+        # Balde aberto (ainda recebe amostras)
+        self.bucket = None
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.lo, self.hi = math.inf, -math.inf
+        # Baldes fechados dentro da janela e o seu total
+        self.closed = deque()  # (balde, n, média, M2)
+        self.total = (0, 0.0, 0.0)
+        self.mins = deque()    # (balde, mínimo), mínimos crescentes
+        self.maxs = deque()    # (balde, máximo), máximos decrescentes
+        self.removed = 0
+
+    def add(self, bucket: int, n: int, mean: float, m2: float, lo: float, hi: float):
+        """Acrescenta as amostras de um balde (baldes em ordem crescente)."""
+        if bucket != self.bucket:
+            self._close()
+            self.bucket = bucket
+            self.expire(bucket)
+        self.n, self.mean, self.m2 = _merge(self.n, self.mean, self.m2, n, mean, m2)
+        if lo < self.lo:
+            self.lo = lo
+        if hi > self.hi:
+            self.hi = hi
+
+    def _close(self):
+        """Fecha o balde aberto: entra no total e nas filas de extremos."""
+        if not self.n:
+            return
+        b = self.bucket
+        self.closed.append((b, self.n, self.mean, self.m2))
+        self.total = _merge(*self.total, self.n, self.mean, self.m2)
+        while self.mins and self.mins[-1][1] >= self.lo:
+            self.mins.pop()
+        self.mins.append((b, self.lo))
+        while self.maxs and self.maxs[-1][1] <= self.hi:
+            self.maxs.pop()
+        self.maxs.append((b, self.hi))
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.lo, self.hi = math.inf, -math.inf
+
+    def expire(self, bucket: int):
+        """Tira da janela os baldes anteriores a bucket - span + 1."""
+        if self.span is None:
+            return
+        first = bucket - self.span + 1
+        if self.bucket is not None and self.bucket < first:
+            self._close()
+            self.bucket = None
+        while self.closed and self.closed[0][0] < first:
+            _, n, mean, m2 = self.closed.popleft()
+            self.total = _remove(*self.total, n, mean, m2)
+            self.removed += 1
+        while self.mins and self.mins[0][0] < first:
+            self.mins.popleft()
+        while self.maxs and self.maxs[0][0] < first:
+            self.maxs.popleft()
+        if self.removed >= RESYNC_BUCKETS:
+            self.removed = 0
+            total = (0, 0.0, 0.0)
+            for _, n, mean, m2 in self.closed:
+                total = _merge(*total, n, mean, m2)
+            self.total = total
+
+    def stats(self) -> Optional[WindowStats]:
+        n, mean, m2 = _merge(*self.total, self.n, self.mean, self.m2)
+        if not n:
+            return None
+        lo = min(self.mins[0][1] if self.mins else math.inf, self.lo)
+        hi = max(self.maxs[0][1] if self.maxs else -math.inf, self.hi)
+        return WindowStats(n, lo, hi, mean, math.sqrt(m2 / n))
+
+
+class RollingStatsEngine:
+    """
+    Estatísticas móveis de todos os canais ao vivo, em várias janelas.
+
+    `windows` mapeia nome → duração em segundos (None = desde o último
+    reset_window(nome), ex.: volta atual).
+    """
+
+    def __init__(self, windows: Mapping[str, Optional[float]], bucket_s: float = BUCKET_S):
+        self.windows = dict(windows)
+        self.bucket_s = bucket_s
+        self.channels: Dict[str, Dict[str, RollingWindow]] = {}
+
+    def _channel(self, channel: str) -> Dict[str, RollingWindow]:
+        windows = self.channels.get(channel)
+        if windows is None:
+            windows = self.channels[channel] = {
+                name: RollingWindow(window_s, self.bucket_s) for name, window_s in self.windows.items()}
+        return windows
+
+    def extend(self, t: np.ndarray, columns: Mapping[str, np.ndarray]):
+        """
+        Acrescenta um lote de amostras (mesmo eixo de tempo para todas as
+        colunas, t crescente).
+        """
+        if not len(t) or not columns:
+            return
+        names = list(columns)
+        y = np.array([columns[name] for name in names], dtype=np.float64).reshape(len(names), len(t))
+        bucket = np.floor(np.asarray(t) / self.bucket_s).astype(np.int64)
+        starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+        sizes = np.diff(np.append(starts, len(t)))
+
+        ok = ~np.isnan(y)
+        counts = np.add.reduceat(ok, starts, axis=1)
+        y0 = np.where(ok, y, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.add.reduceat(y0, starts, axis=1) / counts
+        deviation = np.where(ok, y - np.repeat(means, sizes, axis=1), 0.0)
+        m2s = np.add.reduceat(deviation * deviation, starts, axis=1)
+        los = np.fmin.reduceat(y, starts, axis=1)
+        his = np.fmax.reduceat(y, starts, axis=1)
+
+        buckets = bucket[starts].tolist()
+        rows = zip(counts.tolist(), means.tolist(), m2s.tolist(), los.tolist(), his.tolist())
+        for name, (ns, mean, m2, lo, hi) in zip(names, rows):
+            windows = self._channel(name).values()
+            for k, b in enumerate(buckets):
+                if ns[k]:
+                    for window in windows:
+                        window.add(b, ns[k], mean[k], m2[k], lo[k], hi[k])
+
+    def stats(self, channel: str, window: str, now: Optional[float] = None) -> Optional[WindowStats]:
+        """
+        Estatísticas do canal na janela (None se não houver amostras).
+
+        `now` (mesma escala de t) tira da janela o que ficou velho num
+        canal que parou de receber.
+        """
+        windows = self.channels.get(channel)
+        if windows is None:
+            return None
+        rolling = windows[window]
+        if now is not None:
+            rolling.expire(int(math.floor(now / self.bucket_s)))
+        return rolling.stats()
+
+    def range(self, channels: Iterable[str], window: str, now: Optional[float] = None) -> Tuple[float, float]:
+        """(mínimo, máximo) de vários canais na janela; (nan, nan) sem amostras."""
+        lo, hi = math.inf, -math.inf
+        for channel in channels:
+            stats = self.stats(channel, window, now)
+            if stats is not None:
+                lo, hi = min(lo, stats.min), max(hi, stats.max)
+        if lo > hi:
+            return math.nan, math.nan
+        return lo, hi
+
+    def reset_window(self, window: str):
+        """Recomeça uma janela em todos os canais (ex.: nova volta)."""
+        for windows in self.channels.values():
+            windows[window].reset()
+
+    def clear(self):
+        self.channels.clear()
@@ -0,0 +1,217 @@
+"""
+Gravação Contínua da Sessão Ao Vivo em Disco - PUCPR Racing
+
+Responsável por:
+- Copiar para o disco, a cada RECORD_FLUSH_S segundos, as amostras novas
+  do live_data_storage (todas as bases de tempo e canais, derivados
+  inclusive): se o notebook travar, a sessão até o último flush está salva
+- Nunca bloquear a GUI: ela só fatia o armazenamento e enfileira cópias;
+  uma thread própria grava e faz fsync
+- Ler a sessão (inteira ou ainda sendo gravada) direto em arrays NumPy,
+  sem passar por CSV
+
+Formato (sessao_AAAAMMDD_HHMMSS.ptl + índice .ptl.idx ao lado):
+    .ptl      MAGIC (8 bytes) + blocos em colunas, só acrescentados:
+              float64 tempo[n], depois float32 canal[n] para cada canal
+    .ptl.idx  uma linha JSON por linha de texto, só acrescentadas:
+              1ª: {"formato": 1, "inicio": time.time() do início, "fonte": ...}
+              demais: {"base": ..., "offset": ..., "n": ..., "canais": [...],
+                       "t0": ..., "t1": ..., "late": bool}
+
+    O bloco é gravado (e fsync) antes da sua linha no índice: um bloco só
+    existe para o leitor depois de completo. Uma linha cortada no fim do
+    índice (queda no meio da escrita) é ignorada.
+
+    Tempos em segundos desde o início da sessão (mesmo eixo do gráfico
+    ao vivo). Blocos late=True são amostras retransmitidas (LoRa) gravadas
+    à parte; a leitura as encaixa na ordem do tempo.
+"""
+
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from core.live_store import TIME_DTYPE, VALUE_DTYPE
+
+AUTO_RECORD = True                 # Grava toda sessão ao vivo
+RECORD_DIRECTORY = "sessoes_ao_vivo"
+RECORD_FLUSH_S = 2.0               # Intervalo entre gravações
+MAGIC = b'PUCPRLS1'
+INDEX_SUFFIX = ".idx"
+FORMAT_VERSION = 1
+
+
+def new_session_path() -> str:
+    """Nome de arquivo para uma nova sessão em RECORD_DIRECTORY."""
+    return os.path.join(RECORD_DIRECTORY, f"sessao_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ptl")
+
+
+class SessionRecorder:
+    """
+    Grava a sessão ao vivo em blocos (chamado pela thread da GUI).
+
+    flush(store) pega de cada base de tempo as amostras posteriores às já
+    gravadas; add_late() guarda as amostras retransmitidas, que entram no
+    meio do armazenamento e não seriam vistas pelo flush.
+    """
+
+    def __init__(self, path: str, started_at: float, source: str = ""):
+        self.path = path
+        self.queue: "queue.SimpleQueue[Optional[Tuple[str, np.ndarray, Dict[str, np.ndarray], bool]]]" = \
+            queue.SimpleQueue()
+        # Base de tempo → (último tempo gravado, amostras gravadas com esse tempo)
+        self.flushed_until: Dict[str, Tuple[float, int]] = {}
+        self.late: List[Tuple[str, np.ndarray, Dict[str, np.ndarray]]] = []
+        self.blocks = 0
+        self.rows = 0
+        self.error: Optional[str] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.index = open(path + INDEX_SUFFIX, 'w', encoding='utf-8')
+        self.index.write(json.dumps({'formato': FORMAT_VERSION, 'inicio': started_at, 'fonte': source}) + "\n")
+        self.file.flush()
+        self.index.flush()
+
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+        print(f"[Sessão] Gravando sessão ao vivo em {path}")
+
+    def add_late(self, timebase: str, t: np.ndarray, columns: Mapping[str, np.ndarray]):
+        """
+        Guarda (cópia) as amostras retransmitidas que caem no trecho já
+        gravado; as demais entram no armazenamento depois dele e o flush
+        as pega.
+        """
+        flushed = self.flushed_until.get(timebase)
+        if flushed is None:
+            return
+        keep = np.asarray(t) <= flushed[0]
+        if keep.any():
+            self.late.append((timebase, np.asarray(t, dtype=TIME_DTYPE)[keep],
+                              {name: np.asarray(values, dtype=VALUE_DTYPE)[keep] for name, values in columns.items()}))
+
+    def flush(self, store):
+        """Enfileira as amostras novas de cada base de tempo do MultiRateStore."""
+        for timebase, live in store.stores.items():
+            times = live.time
+            if not len(times):
+                continue
+            flushed = self.flushed_until.get(timebase)
+            i = 0
+            if flushed is not None:
+                # Tempos repetidos são possíveis (o eixo ao vivo nunca volta, só para)
+                i = int(np.searchsorted(times, flushed[0], side='left')) + flushed[1]
+            if i >= len(times):
+                continue
+            # Cópias: o armazenamento desliza e é reescrito enquanto a thread grava
+            columns = {name: live.column(name)[i:].copy() for name in live.channels}
+            self.queue.put((timebase, times[i:].copy(), columns, False))
+            last = float(times[-1])
+            self.flushed_until[timebase] = (last, len(times) - int(np.searchsorted(times, last, side='left')))
+        late, self.late = self.late, []
+        for timebase, t, columns in late:
+            self.queue.put((timebase, t, columns, True))
+
+    def _write_block(self, timebase: str, t: np.ndarray, columns: Dict[str, np.ndarray], late: bool):
+        offset = self.file.tell()
+        t.astype(TIME_DTYPE, copy=False).tofile(self.file)
+        for values in columns.values():
+            values.astype(VALUE_DTYPE, copy=False).tofile(self.file)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        entry = {'base': timebase, 'offset': offset, 'n': len(t), 'canais': list(columns),
+                 't0': float(t[0]), 't1': float(t[-1]), 'late': late}
+        self.index.write(json.dumps(entry) + "\n")
+        self.index.flush()
+        os.fsync(self.index.fileno())
+        self.blocks += 1
+        self.rows += len(t)
+
+    def _writer_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error:
+                continue
+            try:
+                self._write_block(*item)
+            except Exception as e:
+                # Disco cheio etc.: a sessão ao vivo continua, só a gravação para
+                self.error = str(e)
+                print(f"[Sessão] Erro ao gravar {self.path}: {e}")
+        self.file.close()
+        self.index.close()
+
+    def close(self, store=None):
+        """Grava o que faltar (flush final opcional) e fecha os arquivos."""
+        if store is not None:
+            self.flush(store)
+        self.queue.put(None)
+        self.thread.join(timeout=5.0)
+        print(f"[Sessão] {self.rows} amostras em {self.blocks} blocos: {self.path}")
+
+
+def read_index(path: str) -> Tuple[dict, List[dict]]:
+    """(cabeçalho, blocos completos) do índice de uma sessão .ptl."""
+    with open(path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+        lines = f.read().split("\n")
+    header = json.loads(lines[0])
+    blocks = []
+    for line in lines[1:]:
+        try:
+            blocks.append(json.loads(line))
+        except ValueError:
+            break  # Linha cortada (gravação interrompida) ou fim do arquivo
+    return header, blocks
+
+
+def read_session(path: str) -> Tuple[dict, Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]]]:
+    """
+    Lê uma sessão gravada (ou ainda em gravação).
+
+    Returns:
+        (cabeçalho do índice, {base de tempo: (tempo, {canal: valores})}),
+        cada base em ordem de tempo; canais ausentes num bloco ficam NaN
+    """
+    header, blocks = read_index(path)
+    size = os.path.getsize(path)
+    time_size = np.dtype(TIME_DTYPE).itemsize
+    value_size = np.dtype(VALUE_DTYPE).itemsize
+    by_base: Dict[str, List[Tuple[np.ndarray, Dict[str, np.ndarray], bool]]] = {}
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} não é uma sessão gravada ({MAGIC!r})")
+        for block in blocks:
+            n, names = block['n'], block['canais']
+            if block['offset'] + n * (time_size + len(names) * value_size) > size:
+                break
+            f.seek(block['offset'])
+            t = np.fromfile(f, dtype=TIME_DTYPE, count=n)
+            columns = {name: np.fromfile(f, dtype=VALUE_DTYPE, count=n) for name in names}
+            by_base.setdefault(block['base'], []).append((t, columns, block['late']))
+
+    session = {}
+    for timebase, parts in by_base.items():
+        names = list(dict.fromkeys(name for _, columns, _ in parts for name in columns))
+        t = np.concatenate([part[0] for part in parts])
+        columns = {}
+        for name in names:
+            columns[name] = np.concatenate([
+                part[1][name] if name in part[1] else np.full(len(part[0]), np.nan, dtype=VALUE_DTYPE)
+                for part in parts])
+        if any(late for _, _, late in parts):
+            order = np.argsort(t, kind='stable')
+            t = t[order]
+            columns = {name: values[order] for name, values in columns.items()}
+        session[timebase] = (t, columns)
+    return header, session
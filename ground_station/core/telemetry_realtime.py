@@ -2,141 +2,285 @@
 Módulo de Telemetria em Tempo Real - PUCPR Racing
 
 Responsável por:
-- Thread de leitura CAN via UDP multicast
-- Decodificação de mensagens usando DBC
-- Gerenciamento de dados ao vivo (armazenamento + fila)
-- Atualização da GUI (gráficos + dashboards)
+- Sessão ao vivo com qualquer fonte (core.telemetry_sources: CAN, LoRa,
+  replay de log): iniciar, parar e um único caminho de ingestão
+- Gerenciamento de dados ao vivo (armazenamento, canais derivados,
+  alarmes, estatísticas móveis e gravação contínua em disco)
+- Sessão ao vivo nas abas de análise (core.live_frame): data_frame sem
+  cópia do histórico, atualizado durante a sessão
+- Atualização da GUI (gráfico e painéis; agendamento e dashboards pelos
+  métodos do app, em gui.live_scheduler e gui.dashboards)
 """
 
 import time
-import threading
-import queue
-import platform
-import os
-try:
-    import can
-    import cantools
-except ImportError:
-    can = None
-    cantools = None
-    print("Aviso: python-can e/ou cantools não instalados. Telemetria CAN desabilitada.")
+from typing import List, Optional
+
+import numpy as np
 
 from core.constants import (
-    COLOR_ACCENT_RED, COLOR_ACCENT_GOLD, 
-    COLOR_ACCENT_GREEN, COLOR_ACCENT_CYAN
+    COLOR_ACCENT_RED, COLOR_ACCENT_GREEN
 )
+from core.alarms import AlarmEngine
+from core.decimation import DECIMATE_PX_PER_BIN, M4Decimator
+from core.derived_channels import DerivedChannelEngine
+from core.live_frame import LiveSessionView
+from core.rolling_stats import RollingStatsEngine
+from core.session_recorder import AUTO_RECORD, SessionRecorder, new_session_path
+from core.telemetry_sources import SampleBatch, TelemetrySource, criar_fonte
+
+# Gráfico ao vivo
+LIVE_WINDOW_S = 10.0        # Histórico mínimo visível com Auto-Scroll
+LIVE_SCROLL_STEP_S = 2.0    # Passo de avanço do eixo X (um desenho completo por passo)
+Y_MARGIN = 0.1              # Folga do eixo Y (fração da faixa dos dados)
+Y_MARGIN_NORMALIZED = 0.15  # Folga do primeiro eixo no modo normalizado (+0.05 por eixo)
+Y_SHRINK = 0.5              # Encolhe o Y quando os dados ocupam menos que isso da faixa
+LIVE_DECIMATE = True        # Decimação M4 das linhas (~2 pontos por pixel)
+FRAME_READOUT_S = 0.5       # Intervalo de atualização do indicador de FPS
+
+# Estatísticas móveis (core.rolling_stats): painel de estatísticas e Auto-Scale do Y
+STATS_WINDOWS = {"10 s": 10.0, "volta": None}  # None = desde a última marca de volta
+STATS_LAP_WINDOW = "volta"
+STATS_PLOT_WINDOW = "gráfico"  # Janela visível com Auto-Scroll (criada em reset_live_stats)
+STATS_PANEL_S = 0.5            # Intervalo de atualização do painel
+
+# Alarmes (core.alarms): avaliados em todas as amostras, mostrados no painel ALARMES
+ALARM_PANEL_EVENTS = 5         # Últimos eventos listados no painel
 
 
 def toggle_live_telemetry(app_instance):
-    """Alterna entre iniciar e parar a telemetria ao vivo."""
+    """Alterna entre iniciar e parar a telemetria ao vivo (fonte do telemetry_source.json)."""
     if not app_instance.is_live_active:
         start_live_telemetry(app_instance)
     else:
         stop_live_telemetry(app_instance)
 
 
-def start_live_telemetry(app_instance):
-    """Inicia a thread de leitura CAN."""
-    app_instance.is_live_active = True
-    app_instance.stop_live_event.clear()
-    
-    # Inicia dicionário de armazenamento
-    app_instance.live_data_storage = {'Time': []}
+def start_live_telemetry(app_instance, source: Optional[TelemetrySource] = None) -> bool:
+    """
+    Inicia a sessão ao vivo com `source` (padrão: a fonte configurada em
+    configure_telemetry). Retorna False se a fonte não pôde ser aberta.
+    """
+    if source is None:
+        source = criar_fonte()
     
-    app_instance.start_time_live = time.time()
+    # Limpa o histórico (capacidade fixa, reaproveita a memória)
+    app_instance.live_data_storage.clear()
+    reset_live_stats(app_instance)
+    reset_live_alarms(app_instance)
     
     # Configura gráfico inicial
     app_instance.update_live_plot_style()
     
-    app_instance.btn_live_toggle.configure(text="⏹️ Parar Telemetria", fg_color="#C62828") 
-    app_instance.lbl_live_status.configure(text="Status: Conectado (Aguardando dados UDP 239.0.0.1...)")
+    if not source.start():
+        app_instance.lbl_live_status.configure(text=f"Status: {source.error or 'ERRO ao iniciar a fonte'}")
+        return False
+    app_instance.start_time_live = time.time()  # Eixo do gráfico relativo a este instante
+    app_instance.live_source = source
+    app_instance.live_recorder = _start_recording(app_instance, source)
+    app_instance.is_live_active = True
     
-    app_instance.live_thread = threading.Thread(target=loop_leitura_can, args=(app_instance,), daemon=True)
-    app_instance.live_thread.start()
+    app_instance.btn_live_toggle.configure(text=f"⏹️ Parar {source.label}", fg_color="#C62828") 
+    app_instance.lbl_live_status.configure(text=source.waiting_text())
     
-    app_instance.after(100, lambda: update_live_gui(app_instance))
+    app_instance.start_live_scheduler()  # gui.live_scheduler: dados, gráfico, gravação, análise
+    return True
 
 
 def stop_live_telemetry(app_instance):
-    """Para a thread de leitura CAN."""
+    """Para a fonte ao vivo e o agendamento da GUI."""
     app_instance.is_live_active = False
-    app_instance.stop_live_event.set()
-    app_instance.btn_live_toggle.configure(text="▶️ Iniciar Telemetria", fg_color=COLOR_ACCENT_RED)
-    app_instance.lbl_live_status.configure(text="Status: Parado")
+    app_instance.stop_live_scheduler()
+    source = getattr(app_instance, 'live_source', None)
+    label = "Telemetria"
+    if source is not None:
+        app_instance.live_source = None
+        label = source.label
+        source.stop()
+    status = "Status: Parado"
+    recorder = getattr(app_instance, 'live_recorder', None)
+    if recorder is not None:
+        app_instance.live_recorder = None
+        recorder.close(app_instance.live_data_storage)
+        status += f" | Sessão gravada em {recorder.path}"
+    app_instance.btn_live_toggle.configure(text=f"▶️ Iniciar {label}", fg_color=COLOR_ACCENT_RED)
+    app_instance.lbl_live_status.configure(text=status)
+    # Análises com a sessão completa (o agendamento já parou)
+    update_live_analysis(app_instance)
+
+
+def _start_recording(app_instance, source: TelemetrySource) -> Optional[SessionRecorder]:
+    """Abre a gravação contínua da sessão (AUTO_RECORD); falha não impede a sessão ao vivo."""
+    if not AUTO_RECORD:
+        return None
+    try:
+        return SessionRecorder(new_session_path(), app_instance.start_time_live, source.label)
+    except OSError as e:
+        print(f"[Sessão] Gravação desativada: {e}")
+        return None
+
+
+def flush_live_recording(app_instance):
+    """Tarefa de gravação: enfileira as amostras novas para a thread de disco."""
+    recorder = getattr(app_instance, 'live_recorder', None)
+    if recorder is not None:
+        recorder.flush(app_instance.live_data_storage)
+
+
+def use_live_session(app_instance) -> bool:
+    """
+    Abas de análise passam a usar a sessão ao vivo (até um log ser aberto).
+    Retorna False se ainda não há amostras; o data_frame chega com elas.
+    """
+    app_instance.live_view = LiveSessionView(app_instance.live_data_storage, app_instance.channel_mapping)
+    return refresh_live_frame(app_instance, force=True)
+
+
+def refresh_live_frame(app_instance, force: bool = False) -> bool:
+    """
+    Troca o data_frame pela versão atual da sessão ao vivo: sempre com
+    force, senão só se o atual deixou de valer (buffer deslizou ou foi
+    reescrito). update_live_gui chama logo após a ingestão, antes que
+    qualquer callback da GUI leia o data_frame antigo.
+    """
+    view = getattr(app_instance, 'live_view', None)
+    if view is None or not (force or view.stale()):
+        return False
+    df = view.frame()
+    if df is None:
+        return False
+    app_instance.definir_data_frame_ao_vivo(df)
+    return True
+
+
+def update_live_analysis(app_instance) -> bool:
+    """Tarefa de análise: data_frame com as amostras novas e refaz as análises abertas (False = sem sessão)."""
+    if not refresh_live_frame(app_instance, force=True):
+        return False
+    app_instance.atualizar_analises_ao_vivo()
+    return True
+
+
+def _ingest_batches(app_instance, batches: List[SampleBatch]):
+    """
+    Copia os lotes da fonte para o live_data_storage e as estatísticas
+    móveis, cada lote na sua base de tempo (frame CAN, LoRa, log...): só os
+    canais do lote recebem amostra, sem repetir o valor anterior nos demais.
+    Os canais derivados (core.derived_channels) são calculados por lote e
+    entram junto com as colunas medidas; os alarmes (core.alarms) avaliam
+    todas as amostras do lote.
+    
+    Os tempos chegam no relógio local; o eixo do gráfico é relativo ao
+    início da sessão e nunca volta no tempo (a estimativa do offset do
+    relógio pode recuar alguns ms). Lotes late=True (retransmitidos) são
+    encaixados na posição do seu tempo.
+    
+    Returns:
+        (amostras ao vivo armazenadas, último valor de cada canal recebido)
+    """
+    store = app_instance.live_data_storage
+    start = app_instance.start_time_live
+    derived = getattr(app_instance, 'live_derived', None)
+    if derived is None:
+        derived = app_instance.live_derived = DerivedChannelEngine()
+    alarms = getattr(app_instance, 'live_alarms', None)
+    if alarms is None:
+        alarms = reset_live_alarms(app_instance)
+    recorder = getattr(app_instance, 'live_recorder', None)
+    dados_recentes = {}
+    amostras = 0
+    
+    for batch in batches:
+        columns = derived.apply(batch.columns)
+        if batch.late:
+            if not len(store):
+                continue
+            t_rel = batch.t - start
+            valid = t_rel >= 0
+            columns_valid = {canal: valores[valid] for canal, valores in columns.items()}
+            alarms.process(t_rel[valid], columns_valid, late=True)
+            if recorder is not None:
+                recorder.add_late(batch.timebase, t_rel[valid], columns_valid)
+            for i in np.flatnonzero(valid):
+                store.insert(batch.timebase, float(t_rel[i]),
+                             {canal: valores[i].item() for canal, valores in columns.items()})
+            continue
+        
+        t_rel = batch.t - start
+        last_time = store.timebase(batch.timebase).last_time()
+        if last_time is not None:
+            t_rel = np.maximum(t_rel, last_time)
+        t_rel = np.maximum.accumulate(t_rel)
+        store.extend(batch.timebase, t_rel, columns)
+        app_instance.live_stats.extend(t_rel, columns)
+        alarms.process(t_rel, columns)
+        
+        dados_recentes.update({canal: float(valores[-1]) for canal, valores in columns.items()})
+        amostras += len(t_rel)
+    return amostras, dados_recentes
 
 
-def loop_leitura_can(app_instance):
-    """Loop rodando em thread separada para ler CAN Bus."""
-    if can is None or cantools is None:
-        print("Erro: python-can/cantools não disponíveis. Thread CAN não iniciada.")
-        return
-    
-    db = None
-    try:
-        # Tenta carregar DBC (pasta config)
-        dbc_path = '../config/pucpr.dbc'
-        if os.path.exists(dbc_path):
-            db = cantools.database.load_file(dbc_path)
-        else:
-            print("Aviso: pucpr.dbc não encontrado. Tentando ler raw.")
-    except Exception as e:
-        print(f"Erro ao carregar DBC na thread: {e}")
+def reset_live_stats(app_instance):
+    """Estatísticas móveis novas para a sessão (CAN ou LoRa)."""
+    windows = dict(STATS_WINDOWS)
+    windows[STATS_PLOT_WINDOW] = LIVE_WINDOW_S + LIVE_SCROLL_STEP_S
+    app_instance.live_stats = RollingStatsEngine(windows)
+
+
+def reset_live_alarms(app_instance) -> AlarmEngine:
+    """Alarmes novos para a sessão (nada ativo nem retido)."""
+    app_instance.live_alarms = AlarmEngine()
+    app_instance._live_alarms_dirty = True
+    return app_instance.live_alarms
 
-    bus = None
-    try:
-        # Configuração Windows (UDP Multicast) - Igual ao simulator_carro.py / central.py
-        # Se for Linux/Rpi seria 'socketcan'
-        if platform.system() == "Windows":
-            bus = can.interface.Bus(channel='239.0.0.1', interface='udp_multicast')
-        else: 
-            # Fallback ou configuração linux (não testado aqui)
-            bus = can.interface.Bus(channel='can0', bustype='socketcan')
-
-        print("Thread CAN iniciada.")
-        while not app_instance.stop_live_event.is_set():
-            # Recebe com timeout para poder verificar o evento de parada
-            msg = bus.recv(0.5) 
-            if msg:
-                try:
-                    if db:
-                        dados = db.decode_message(msg.arbitration_id, msg.data)
-                        app_instance.live_queue.put(dados)
-                        # print(f"Dados CAN recebidos: {dados}") # Debug
-                    else:
-                        # Se não tem DBC, tenta algo genérico ou ignora
-                        pass
-                except Exception as e_decode:
-                    # print(f"Erro decode: {e_decode}")
-                    pass
-    except Exception as e:
-        print(f"Erro na conexão CAN: {e}")
-        # Pode-se enviar mensagem para GUI via queue de status se quiser
-        app_instance.stop_live_event.set()
-    finally:
-        if bus:
-            bus.shutdown()
-        print("Thread CAN finalizada.")
+
+def acknowledge_live_alarms(app_instance):
+    """Reconhece os alarmes retidos (botão do painel ALARMES)."""
+    alarms = getattr(app_instance, 'live_alarms', None)
+    if alarms is not None:
+        alarms.acknowledge()
+        app_instance._live_alarms_dirty = True
+        _update_alarm_panel(app_instance)
+
+
+def mark_live_lap(app_instance):
+    """Nova volta: recomeça a janela da volta (botão do painel ou volta da Central)."""
+    stats = getattr(app_instance, 'live_stats', None)
+    if stats is not None:
+        stats.reset_window(STATS_LAP_WINDOW)
+        app_instance._live_stats_shown_at = 0.0
+
+
+def update_live_plot(app_instance) -> bool:
+    """Tarefa do gráfico: redesenha se chegaram dados desde o último quadro (False = nada a fazer)."""
+    if not app_instance.is_live_active or app_instance.live_freeze:
+        return False
+    if not getattr(app_instance, '_live_plot_dirty', False):
+        return False
+    app_instance._live_plot_dirty = False
+    render_live_window(app_instance)
+    _update_frame_readout(app_instance)
+    return True
 
 
 def update_live_gui(app_instance):
-    """Atualiza os labels da GUI consumindo a fila."""
+    """Tarefa de dados: armazena as mensagens recebidas e atualiza status e painéis."""
     if not app_instance.is_live_active:
         return
 
+    source = app_instance.live_source
     try:
-        # Processa tudo que está na fila (esvazia para pegar o mais recente)
-        dados_recentes = {}
-        pacotes_processados = 0
         try:
-            while not app_instance.live_queue.empty():
-                d = app_instance.live_queue.get_nowait()
-                dados_recentes.update(d)
-                pacotes_processados += 1
-        except queue.Empty:
-            pass
+            pacotes_processados, dados_recentes = _ingest_batches(app_instance, source.poll())
+        finally:
+            # Antes de qualquer outro callback: data_frame da análise nunca fica com views inválidas
+            refresh_live_frame(app_instance)
+        store = app_instance.live_data_storage
+        
+        if not pacotes_processados and source.error:
+            app_instance.lbl_live_status.configure(text=f"Status: {source.error}")
         
         if pacotes_processados > 0:
-            app_instance.lbl_live_status.configure(text="Status: Recebendo dados...")
+            app_instance.lbl_live_status.configure(text=source.status_text())
 
             # Se usuário estiver usando Pan/Zoom da toolbar, não force auto-scroll
             try:
@@ -147,9 +291,8 @@ def update_live_gui(app_instance):
                         app_instance.switch_auto_scroll.deselect()
 
                     # Abre o eixo X para facilitar navegar no histórico
-                    t_data = app_instance.live_data_storage.get('Time', [])
-                    if t_data and len(t_data) >= 2:
-                        app_instance.ax_live.set_xlim(0, t_data[-1])
+                    if len(store) >= 2:
+                        app_instance.ax_live.set_xlim(0, store.last_time())
             except Exception:
                 pass
 
@@ -164,231 +307,207 @@ def update_live_gui(app_instance):
             except Exception:
                 pass
 
-        # --- ATUALIZAÇÃO DO GRÁFICO E ARMAZENAMENTO ---
-        # Sincronização robusta de dados para prevenir erros de dimensão (numpy shape mismatch)
-        current_time_rel = time.time() - app_instance.start_time_live
-        
-        if pacotes_processados > 0:
-            # 1. Atualiza o Tempo
-            if 'Time' not in app_instance.live_data_storage: 
-                app_instance.live_data_storage['Time'] = []
-            app_instance.live_data_storage['Time'].append(current_time_rel)
-            
-            target_len = len(app_instance.live_data_storage['Time'])
-            
-            # 2. Identifica todos os canais que precisamos rastrear
-            # (Os que já temos + os que chegaram agora + os que o usuário quer ver)
-            canais_para_atualizar = set(app_instance.live_data_storage.keys()) | set(dados_recentes.keys()) | set(app_instance.selected_live_channels)
-            canais_para_atualizar.discard('Time') # Remove Time da lista de canais de dados
-
-            for canal in canais_para_atualizar:
-                if canal not in app_instance.live_data_storage:
-                    app_instance.live_data_storage[canal] = []
-                
-                # 3. Padding (Preenchimento): Garante que o histórico existe (com zeros) se o canal é novo
-                current_len = len(app_instance.live_data_storage[canal])
-                missing_steps = target_len - 1 - current_len
-                
-                if missing_steps > 0:
-                    # Preenche lacunas com 0 
-                    app_instance.live_data_storage[canal].extend([0] * missing_steps)
-
-                # 4. Adiciona o valor atual
-                valor = dados_recentes.get(canal)
-                if valor is None:
-                    # Hold Last Value (Manter anterior) ou 0 se não tiver anterior
-                    if len(app_instance.live_data_storage[canal]) > 0:
-                        valor = app_instance.live_data_storage[canal][-1]
-                    else:
-                        valor = 0
-                app_instance.live_data_storage[canal].append(valor)
-
-            # --- PLOTAGEM DE PERFORMANCE (SLICING) ---
-            # Se estiver congelado, não redesenha (mas continua armazenando dados)
-            if not app_instance.live_freeze:
-                t_data_full = app_instance.live_data_storage['Time']
-                start_idx = 0
-                
-                # Otimização: Se tiver muitos pontos e Auto-Scroll ligado, plota apenas a janela visível + margem
-                if app_instance.auto_scroll and len(t_data_full) > 300:
-                    window_secs = 12.0 # Janela de 10s + margem
-                    last_time = t_data_full[-1]
-                    target_time = last_time - window_secs
-                    for i in range(len(t_data_full)-1, -1, -1):
-                        if t_data_full[i] < target_time:
-                            start_idx = i
-                            break
-
-                t_data_plot = t_data_full[start_idx:]
-
-                if app_instance.switch_normalize.get() == 1:
-                    for canal in app_instance.selected_live_channels:
-                        if canal in app_instance.live_data_storage and canal in app_instance.live_lines:
-                            line = app_instance.live_lines[canal]
-                            y_data_full = app_instance.live_data_storage[canal]
-                            if len(t_data_full) == len(y_data_full):
-                                line.set_data(t_data_plot, y_data_full[start_idx:])
-                                if canal in app_instance.live_axes:
-                                    ax = app_instance.live_axes[canal]
-                                    ax.relim(); ax.autoscale_view(scalex=False, scaley=True)
-                                else:
-                                    app_instance.ax_live.relim(); app_instance.ax_live.autoscale_view(scalex=False, scaley=True)
-                else:
-                    for canal, line in app_instance.live_lines.items():
-                        if canal in app_instance.live_data_storage:
-                            y_data_full = app_instance.live_data_storage[canal]
-                            if len(t_data_full) == len(y_data_full):
-                                line.set_data(t_data_plot, y_data_full[start_idx:])
-
-                    app_instance.ax_live.relim()
-                    app_instance.ax_live.autoscale_view(scalex=False, scaley=True)
-                
-                # Não sobrescreve o eixo X se o usuário estiver navegando (pan/zoom)
-                try:
-                    toolbar_mode = getattr(app_instance.toolbar_live, 'mode', '') if hasattr(app_instance, 'toolbar_live') else ''
-                except Exception:
-                    toolbar_mode = ''
-
-                if app_instance.auto_scroll and not toolbar_mode:
-                    window_size = 10.0
-                    if current_time_rel > window_size:
-                        app_instance.ax_live.set_xlim(current_time_rel - window_size, current_time_rel)
-                    else:
-                        app_instance.ax_live.set_xlim(0, max(current_time_rel, window_size))
-                
-                app_instance.canvas_live.draw_idle()
-
-        # Atualiza labels e dashboard
-        _update_dashboard_labels(app_instance, dados_recentes)
+            # O gráfico é redesenhado na cadência dele (update_live_plot)
+            app_instance._live_plot_dirty = True
+
+        # Atualiza labels e dashboard (sem dados novos libera valores segurados pela taxa máxima)
+        app_instance.update_live_dashboards(dados_recentes)
+        source.update_panels(app_instance)
+        _update_stats_panel(app_instance)
+        _update_alarm_panel(app_instance)
     
     except Exception as e:
         print(f"Erro no update_live_gui (Recuperado): {e}")
 
-    # Reagendar a si mesmo com taxa menor (10 FPS) para economizar CPU
-    if app_instance.is_live_active:
-        app_instance.after(100, lambda: update_live_gui(app_instance))
 
+def render_live_window(app_instance):
+    """
+    Redesenha o gráfico ao vivo com o que estiver no live_data_storage
+    (cada canal na sua base de tempo).
+    
+    Os limites dos eixos só mudam quando precisam: o eixo X avança em
+    passos de LIVE_SCROLL_STEP_S e o Y só cresce quando os dados saem da
+    faixa (ou encolhe quando ocupam menos de Y_SHRINK dela). Com limites
+    parados o live_renderer faz blit só das linhas; quando mudam, faz um
+    desenho completo.
+    
+    Cada linha recebe no máximo ~2 pontos por pixel (M4, mantém os picos);
+    as colunas já completas ficam em cache entre quadros.
+    """
+    started = time.perf_counter()
+    store = app_instance.live_data_storage
+    current_time_rel = store.last_time()
+    if current_time_rel is None:
+        return
+    
+    # Não mexe nos limites se o usuário estiver navegando (pan/zoom)
+    try:
+        toolbar_mode = getattr(app_instance.toolbar_live, 'mode', '') if hasattr(app_instance, 'toolbar_live') else ''
+    except Exception:
+        toolbar_mode = ''
 
-def _update_dashboard_labels(app_instance, dados_recentes):
-    """Atualiza labels dos dashboards com os dados mais recentes."""
+    if app_instance.auto_scroll and not toolbar_mode:
+        _scroll_x(app_instance.ax_live, current_time_rel)
+    x0, x1 = app_instance.ax_live.get_xlim()
     
-    # Motor/ECU
-    if 'RPM' in dados_recentes:
-        txt = f"{dados_recentes['RPM']:.0f}"
-        app_instance.lbl_val_rpm.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_rpm'): 
-            app_instance.lbl_dash_rpm.configure(text=txt)
-        # Atualiza barra de progresso (RPM max ~13000)
-        if hasattr(app_instance, 'prog_dash_rpm'):
-            rpm_val = dados_recentes['RPM']
-            rpm_normalized = min(rpm_val / 13000.0, 1.0)
-            app_instance.prog_dash_rpm.set(rpm_normalized)
-            # Cor dinâmica: verde <8000, amarelo 8000-11000, vermelho >11000
-            if rpm_val < 8000:
-                app_instance.prog_dash_rpm.configure(progress_color=COLOR_ACCENT_GREEN)
-            elif rpm_val < 11000:
-                app_instance.prog_dash_rpm.configure(progress_color=COLOR_ACCENT_GOLD)
-            else:
-                app_instance.prog_dash_rpm.configure(progress_color=COLOR_ACCENT_RED)
-
-    if 'Temperatura' in dados_recentes:
-        txt = f"{dados_recentes['Temperatura']:.0f}"
-        app_instance.lbl_val_temp.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_temp'): 
-            app_instance.lbl_dash_temp.configure(text=txt)
-
-    if 'ThrottlePos' in dados_recentes:
-        tps_val = dados_recentes['ThrottlePos']
-        txt = f"{tps_val:.0f}%"
-        app_instance.lbl_val_tps.configure(text=txt.replace('%', ''))
-        if hasattr(app_instance, 'lbl_dash_tps'): 
-            app_instance.lbl_dash_tps.configure(text=txt)
-        # Atualiza barra de progresso TPS (0-100%)
-        if hasattr(app_instance, 'prog_dash_tps'):
-            app_instance.prog_dash_tps.set(min(tps_val / 100.0, 1.0))
-
-    if 'Lambda' in dados_recentes:
-        txt = f"{dados_recentes['Lambda']:.2f}"
-        app_instance.lbl_val_lambda.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_lambda'): 
-            app_instance.lbl_dash_lambda.configure(text=txt)
-
-    # Pilotagem / IMU
-    if 'SteeringAngle' in dados_recentes:
-        txt = f"{dados_recentes['SteeringAngle']:.1f}"
-        app_instance.lbl_val_steer.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_steer'): 
-            app_instance.lbl_dash_steer.configure(text=txt)
-
-    if 'BrakePressure' in dados_recentes:
-        brake_val = dados_recentes['BrakePressure']
-        txt = f"{brake_val:.0f}"
-        app_instance.lbl_val_brake.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_brake'): 
-            app_instance.lbl_dash_brake.configure(text=txt)
-        # Atualiza barra de progresso Brake (max ~200 bar)
-        if hasattr(app_instance, 'prog_dash_brake'):
-            brake_normalized = min(brake_val / 200.0, 1.0)
-            app_instance.prog_dash_brake.set(brake_normalized)
-
-    if 'AccelX' in dados_recentes:
-        txt = f"{dados_recentes['AccelX']:.2f}"
-        app_instance.lbl_val_accel_x.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_accel_x'): 
-            app_instance.lbl_dash_accel_x.configure(text=txt)
-
-    if 'AccelY' in dados_recentes:
-        txt = f"{dados_recentes['AccelY']:.2f}"
-        app_instance.lbl_val_accel_y.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_accel_y'): 
-            app_instance.lbl_dash_accel_y.configure(text=txt)
+    # Com Auto-Scroll, plota apenas a janela visível + margem (busca binária)
+    t_from = x0 - 1.0 if app_instance.auto_scroll else float('-inf')
+    series = store.window(t_from, app_instance.live_lines.keys())
+
+    decimators = getattr(app_instance, 'live_decimators', None)
+    if decimators is None:
+        decimators = app_instance.live_decimators = {}
+    bins = max(1.0, app_instance.ax_live.bbox.width / DECIMATE_PX_PER_BIN)
+    dx = round(x1 - x0, 6) / bins  # Arredondado: a janela rola sem mudar dx (cache válido)
+
+    visible_by_axis = {}
+    for canal, line in app_instance.live_lines.items():
+        if canal in series:
+            t, y = series[canal]
+            if LIVE_DECIMATE and len(t) > 4 * bins:
+                t, y = decimators.setdefault(canal, M4Decimator()).update(
+                    t, y, dx, x0, x1, store.revision(canal))
+            line.set_data(t, y)
+            i0, i1 = np.searchsorted(t, (x0, x1))
+            ax = app_instance.live_axes.get(canal, app_instance.ax_live)
+            visible_by_axis.setdefault(ax, []).append(y[i0:i1])
+
+    if not toolbar_mode:
+        normalized = app_instance.switch_normalize.get() == 1
+        # Com Auto-Scroll a faixa vem das estatísticas móveis (sem varrer as linhas)
+        stats = getattr(app_instance, 'live_stats', None) if app_instance.auto_scroll else None
+        for i, ax in enumerate(dict.fromkeys(app_instance.live_axes.values())):
+            if ax in visible_by_axis:
+                # Margem progressiva no modo normalizado (espalha as linhas)
+                margin = Y_MARGIN_NORMALIZED + 0.05 * i if normalized else Y_MARGIN
+                if stats is not None:
+                    canais = [canal for canal, eixo in app_instance.live_axes.items() if eixo is ax]
+                    lo, hi = stats.range(canais, STATS_PLOT_WINDOW, current_time_rel)
+                else:
+                    lo, hi = _visible_range(visible_by_axis[ax])
+                _fit_y(ax, lo, hi, margin)
     
-    # Rodas
-    if 'WheelSpeed_FL' in dados_recentes:
-        txt = f"{dados_recentes['WheelSpeed_FL']:.0f}"
-        app_instance.lbl_val_ws_fl.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_ws_fl'): 
-            app_instance.lbl_dash_ws_fl.configure(text=txt)
-
-    if 'WheelSpeed_FR' in dados_recentes:
-        txt = f"{dados_recentes['WheelSpeed_FR']:.0f}"
-        app_instance.lbl_val_ws_fr.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_ws_fr'): 
-            app_instance.lbl_dash_ws_fr.configure(text=txt)
-
-    if 'WheelSpeed_RL' in dados_recentes:
-        txt = f"{dados_recentes['WheelSpeed_RL']:.0f}"
-        app_instance.lbl_val_ws_rl.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_ws_rl'): 
-            app_instance.lbl_dash_ws_rl.configure(text=txt)
-
-    if 'WheelSpeed_RR' in dados_recentes:
-        txt = f"{dados_recentes['WheelSpeed_RR']:.0f}"
-        app_instance.lbl_val_ws_rr.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_ws_rr'): 
-            app_instance.lbl_dash_ws_rr.configure(text=txt)
-
-    # Suspensão
-    if 'SuspensionPos_FL' in dados_recentes:
-        txt = f"{dados_recentes['SuspensionPos_FL']:.0f}"
-        app_instance.lbl_val_susp_fl.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_susp_fl'): 
-            app_instance.lbl_dash_susp_fl.configure(text=txt)
-
-    if 'SuspensionPos_FR' in dados_recentes:
-        txt = f"{dados_recentes['SuspensionPos_FR']:.0f}"
-        app_instance.lbl_val_susp_fr.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_susp_fr'): 
-            app_instance.lbl_dash_susp_fr.configure(text=txt)
-
-    if 'SuspensionPos_RL' in dados_recentes:
-        txt = f"{dados_recentes['SuspensionPos_RL']:.0f}"
-        app_instance.lbl_val_susp_rl.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_susp_rl'): 
-            app_instance.lbl_dash_susp_rl.configure(text=txt)
-
-    if 'SuspensionPos_RR' in dados_recentes:
-        txt = f"{dados_recentes['SuspensionPos_RR']:.0f}"
-        app_instance.lbl_val_susp_rr.configure(text=txt)
-        if hasattr(app_instance, 'lbl_dash_susp_rr'): 
-            app_instance.lbl_dash_susp_rr.configure(text=txt)
+    renderer = getattr(app_instance, 'live_renderer', None)
+    if renderer is not None:
+        renderer.render(started)
+    else:
+        app_instance.canvas_live.draw_idle()
+
+
+def _scroll_x(ax, t_now: float):
+    """
+    Janela de LIVE_WINDOW_S + LIVE_SCROLL_STEP_S segundos que avança em
+    passos de LIVE_SCROLL_STEP_S (um desenho completo por passo).
+    """
+    span = LIVE_WINDOW_S + LIVE_SCROLL_STEP_S
+    x0, x1 = ax.get_xlim()
+    if abs((x1 - x0) - span) < 1e-9:
+        if x0 == 0.0 and t_now <= x1:
+            return  # Início da sessão: janela fixa em [0, span]
+        if x1 - LIVE_SCROLL_STEP_S <= t_now <= x1:
+            return
+    right = max(span, t_now + LIVE_SCROLL_STEP_S)
+    ax.set_xlim(right - span, right)
+
+
+def _visible_range(arrays):
+    """(mínimo, máximo) dos trechos visíveis das linhas (NaN ignorado)."""
+    lo = min((float(np.fmin.reduce(y)) for y in arrays if len(y)), default=np.nan)
+    hi = max((float(np.fmax.reduce(y)) for y in arrays if len(y)), default=np.nan)
+    return lo, hi
+
+
+def _fit_y(ax, lo: float, hi: float, margin: float):
+    """Ajusta o Y do eixo à faixa [lo, hi] dos dados, com histerese."""
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        return
+    y0, y1 = ax.get_ylim()
+    span = hi - lo
+    if y0 <= lo and hi <= y1 and span >= Y_SHRINK * (y1 - y0):
+        return
+    pad = span * margin if span > 0 else max(abs(hi) * 0.05, 1.0)
+    ax.set_ylim(lo - pad, hi + pad)
+
+
+def _update_frame_readout(app_instance):
+    """Mostra FPS e tempo de quadro do gráfico ao vivo (no máximo a cada FRAME_READOUT_S)."""
+    renderer = getattr(app_instance, 'live_renderer', None)
+    label = getattr(app_instance, 'lbl_live_fps', None)
+    if renderer is None or label is None:
+        return
+    now = time.perf_counter()
+    if now - getattr(app_instance, '_live_fps_shown_at', 0.0) < FRAME_READOUT_S:
+        return
+    app_instance._live_fps_shown_at = now
+    stats = renderer.stats()
+    if stats is not None:
+        fps, frame_ms, frame_max_ms, full = stats
+        text = (f"{fps:.0f} FPS | quadro {frame_ms:.1f} ms (máx {frame_max_ms:.0f}) | "
+                f"{full * 100:.0f}% completos")
+        binder = getattr(app_instance, 'dashboard_binder', None)
+        if binder is not None:
+            text += f" | painéis {binder.stats():.0f} chamadas Tk/s"
+        scheduler = getattr(app_instance, 'live_scheduler', None)
+        if scheduler is not None:
+            text += f" | {scheduler.summary()}"
+        label.configure(text=text)
+
+
+def _update_stats_panel(app_instance):
+    """
+    Painel de estatísticas: mínimo/média/máximo/desvio dos canais do
+    gráfico em cada janela de STATS_WINDOWS (no máximo a cada STATS_PANEL_S).
+    """
+    label = getattr(app_instance, 'lbl_live_stats', None)
+    stats = getattr(app_instance, 'live_stats', None)
+    if label is None or stats is None:
+        return
+    now = time.perf_counter()
+    if now - getattr(app_instance, '_live_stats_shown_at', 0.0) < STATS_PANEL_S:
+        return
+    app_instance._live_stats_shown_at = now
+
+    t_now = app_instance.live_data_storage.last_time()
+    linhas = []
+    for canal in app_instance.selected_live_channels:
+        linhas.append(canal)
+        for janela in STATS_WINDOWS:
+            st = stats.stats(canal, janela, t_now)
+            if st is None:
+                linhas.append(f"  {janela:>6}  --")
+            else:
+                linhas.append(f"  {janela:>6} {st.min:>8.4g} {st.mean:>8.4g} {st.max:>8.4g} ±{st.std:.3g}")
+    text = "\n".join([f"{'':>8} {'mín':>8} {'méd':>8} {'máx':>8}"] + linhas) if linhas else "Nenhum canal no gráfico"
+    if text != getattr(app_instance, '_live_stats_text', None):
+        app_instance._live_stats_text = text
+        label.configure(text=text)
+
+
+def _update_alarm_panel(app_instance):
+    """
+    Painel ALARMES: alarmes ativos, retidos (até reconhecer) e os últimos
+    eventos com o tempo da amostra. Só redesenha quando há evento novo.
+    """
+    label = getattr(app_instance, 'lbl_live_alarms', None)
+    alarms = getattr(app_instance, 'live_alarms', None)
+    if label is None or alarms is None:
+        return
+    if not alarms.pop_events() and not getattr(app_instance, '_live_alarms_dirty', False):
+        return
+    app_instance._live_alarms_dirty = False
+
+    ativos = alarms.active()
+    linhas = [f"🔴 {nome} ATIVO" for nome in ativos]
+    for nome, evento in alarms.latched.items():
+        if nome not in ativos:
+            linhas.append(f"🟠 {nome} retido (t={evento.t:.3f} s, {evento.value:.4g})")
+    if not linhas:
+        linhas.append("Nenhum alarme")
+    recentes = list(alarms.history)[-ALARM_PANEL_EVENTS:]
+    if recentes:
+        linhas.append("")
+        for evento in reversed(recentes):
+            origem = " (retr.)" if evento.late else ""
+            linhas.append(f"{evento.t:9.3f} s {evento.rule} {evento.kind} {evento.value:.4g}{origem}")
+    cor = COLOR_ACCENT_RED if ativos or alarms.latched else COLOR_ACCENT_GREEN
+    label.configure(text="\n".join(linhas), text_color=cor)
@@ -0,0 +1,450 @@
+"""
+Fontes de Telemetria Ao Vivo - PUCPR Racing
+
+Responsável por:
+- Uma interface única (TelemetrySource) para todas as fontes ao vivo:
+  CAN (UDP multicast, SocketCAN ou outra interface do python-can), LoRa
+  (serial ou captura .lora) e replay de um log CSV
+- Entregar a GUI lotes de amostras em colunas (SampleBatch), já no relógio
+  local: a GUI tem um único caminho de ingestão e desenho
+  (telemetry_realtime.update_live_gui) para qualquer fonte
+- Criar a fonte escolhida em configure_telemetry.SOURCES (criar_fonte)
+
+Contrato de uma fonte:
+    start()  -> bool        abre a conexão/threads (False = falhou)
+    poll()   -> [SampleBatch] chamado pela GUI a cada tick; os arrays
+                             valem até o próximo poll() (podem ser views
+                             de blocos reaproveitados)
+    stop()                   encerra tudo
+    status_text()            texto do label de status (latência etc.)
+    update_panels(app)       painéis próprios da fonte (ex.: voltas LoRa)
+
+    Os tempos de SampleBatch.t são absolutos no relógio local
+    (time.time()), crescentes dentro do lote. Lotes com late=True são
+    amostras retransmitidas, encaixadas na posição do seu tempo.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+from core.block_handoff import BlockHandoff
+from core.can_process import CanDecoderProcess, DBC_PATH, abrir_barramento_can
+from core.clock_sync import ClockSync
+
+LATENCY_WINDOW = 500         # Mensagens CAN usadas na mediana de latência
+CAN_DECODER_PROCESS = False  # Recepção + decodificação num processo separado (GUI nunca atrasa a leitura)
+REPLAY_MAX_ROWS = 5000       # Linhas por poll() no replay sem espera (speed=0)
+REPLAY_TIMEBASE = 'Log'
+
+# Canal ao vivo → nome interno no [CHANNELS] do config (replay de log CSV)
+REPLAY_CHANNELS = {
+    'RPM': 'enginerpm', 'Temperatura': 'coolanttemp', 'ThrottlePos': 'throttlepos',
+    'Lambda': 'lambda', 'SteeringAngle': 'steerangle', 'BrakePressure': 'brakepressf',
+    'AccelX': 'lataccel', 'AccelY': 'lonaccel',
+    'WheelSpeed_FL': 'wheelspeedfl', 'WheelSpeed_FR': 'wheelspeedfr',
+    'WheelSpeed_RL': 'wheelspeedrl', 'WheelSpeed_RR': 'wheelspeedrr',
+    'SuspensionPos_FL': 'suspposfl', 'SuspensionPos_FR': 'suspposfr',
+    'SuspensionPos_RL': 'suspposrl', 'SuspensionPos_RR': 'suspposrr',
+    'GPS_Lat': 'gpslat', 'GPS_Lon': 'gpslon', 'GPS_Speed': 'gpsspeed',
+}
+
+
+class SampleBatch(NamedTuple):
+    """Lote de amostras de uma base de tempo (t no relógio local, em segundos)."""
+    timebase: str
+    t: np.ndarray
+    columns: Mapping[str, np.ndarray]
+    late: bool = False
+
+
+class TelemetrySource:
+    """Base das fontes ao vivo (ver contrato no topo do módulo)."""
+
+    label = "Telemetria"  # Texto dos botões Iniciar/Parar
+
+    def __init__(self):
+        self.error: Optional[str] = None
+
+    def start(self) -> bool:
+        return True
+
+    def poll(self) -> List[SampleBatch]:
+        return []
+
+    def stop(self):
+        pass
+
+    def waiting_text(self) -> str:
+        """Status logo após iniciar, antes do primeiro lote."""
+        return "Status: Conectado (aguardando dados...)"
+
+    def status_text(self) -> str:
+        """Status com dados chegando."""
+        return "Status: Recebendo dados..."
+
+    def update_panels(self, app_instance):
+        """Painéis próprios da fonte (chamado a cada tick de dados)."""
+
+
+# ========== CAN ==========
+
+def carregar_dbc(path: str = DBC_PATH):
+    """Carrega o DBC da pasta config (None se ausente ou inválido)."""
+    try:
+        import cantools
+        if os.path.exists(path):
+            return cantools.database.load_file(path)
+        print("Aviso: pucpr.dbc não encontrado. Tentando ler raw.")
+    except Exception as e:
+        print(f"Erro ao carregar DBC: {e}")
+    return None
+
+
+def ler_can(bus, db, handoff: BlockHandoff, stop_event: threading.Event):
+    """
+    Lê o barramento e publica os sinais decodificados em blocos (thread CAN).
+
+    Cada mensagem vira uma linha no bloco do seu frame, com msg.timestamp
+    (instante de captura no barramento; 0 se a interface não informa) e o
+    instante de chegada. Com linhas pendentes, o recv espera no máximo
+    BLOCK_MAX_AGE, para o bloco parcial não ficar parado sem tráfego.
+    """
+    frames = {}  # arbitration_id -> (nome do frame, sinais, decode)
+    while not stop_event.is_set():
+        # Recebe com timeout para poder verificar o evento de parada
+        msg = bus.recv(handoff.max_age if handoff.pending else 0.5)
+        rx_time = time.time()
+        if msg is not None:
+            entry = frames.get(msg.arbitration_id)
+            try:
+                if entry is None:
+                    frame = db.get_message_by_frame_id(msg.arbitration_id)
+                    entry = frames[msg.arbitration_id] = (
+                        frame.name, tuple(sig.name for sig in frame.signals), frame.decode)
+                nome, sinais, decode = entry
+                dados = decode(msg.data, decode_choices=False)
+                handoff.add(nome, sinais, msg.timestamp or rx_time, rx_time,
+                            [dados[sinal] for sinal in sinais])
+            except Exception:
+                pass  # Frame fora do DBC ou payload inválido
+        handoff.flush(rx_time)
+    handoff.flush(time.time(), force=True)
+
+
+class CanSource(TelemetrySource):
+    """
+    Barramento CAN decodificado pelo DBC, numa thread (BlockHandoff) ou
+    num processo separado (CanDecoderProcess, anel compartilhado).
+
+    Cada frame do DBC é uma base de tempo. msg.timestamp (relógio de quem
+    envia) vira tempo local pelo ClockSync.
+    """
+
+    def __init__(self, bus_kwargs: Optional[dict] = None, use_process: bool = None,
+                 bus=None, db=None, dbc_path: str = DBC_PATH):
+        """
+        Args:
+            bus_kwargs: argumentos do can.interface.Bus (interface, channel);
+                vazio = padrão da plataforma (abrir_barramento_can)
+            use_process: decodifica num processo separado (padrão
+                CAN_DECODER_PROCESS)
+            bus, db: barramento já aberto e DBC já carregado (testes e
+                benchmarks); com `bus` a leitura é sempre numa thread
+        """
+        super().__init__()
+        self.bus_kwargs = dict(bus_kwargs or {})
+        self.use_process = CAN_DECODER_PROCESS if use_process is None else use_process
+        self.bus = bus
+        self.db = db
+        self.dbc_path = dbc_path
+        self.handoff = BlockHandoff()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.decoder: Optional[CanDecoderProcess] = None
+        self.clock = ClockSync()
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self._blocks = []
+
+    def start(self) -> bool:
+        if self.db is None:
+            self.db = carregar_dbc(self.dbc_path)
+        if self.use_process and self.bus is None and self.db is not None and self._start_process():
+            return True
+        self.thread = threading.Thread(target=self._loop, name="can-reader", daemon=True)
+        self.thread.start()
+        return True
+
+    def _start_process(self) -> bool:
+        """Processo decodificador: o handoff passa a ser o leitor do anel (mesma interface)."""
+        try:
+            decoder = CanDecoderProcess(self.db, self.dbc_path, bus_kwargs=self.bus_kwargs or None)
+            decoder.start()
+        except Exception as e:
+            print(f"[CAN-Proc] Não foi possível iniciar o processo decodificador: {e}")
+            return False
+        self.decoder = decoder
+        self.handoff = decoder.reader
+        return True
+
+    def _loop(self):
+        """Thread de leitura CAN."""
+        bus = self.bus
+        try:
+            if bus is None:
+                bus = abrir_barramento_can(**self.bus_kwargs)
+            print("Thread CAN iniciada.")
+            if self.db:
+                ler_can(bus, self.db, self.handoff, self.stop_event)
+            else:
+                # Sem DBC não há como decodificar: só espera o pedido de parada
+                self.stop_event.wait()
+        except Exception as e:
+            print(f"Erro na conexão CAN: {e}")
+            self.error = f"Erro na conexão CAN: {e}"
+            self.stop_event.set()
+        finally:
+            if bus is not None and self.bus is None:
+                bus.shutdown()
+            print("Thread CAN finalizada.")
+
+    def poll(self) -> List[SampleBatch]:
+        if self.decoder is not None and self.decoder.failed:
+            self.error = "Erro no processo decodificador CAN"
+        self.handoff.release(self._blocks)
+        self._blocks = self.handoff.drain()
+        batches = []
+        for block in self._blocks:
+            n = block.n
+            timestamps = block.timestamps[:n]
+            rx_times = block.rx_times[:n]
+            self.clock.update_many(timestamps, rx_times)
+            self.latencies_ms.extend((self.clock.latency(timestamps, rx_times) * 1000.0).tolist())
+            batches.append(SampleBatch(block.timebase, self.clock.to_local(timestamps), block.columns()))
+        return batches
+
+    def stop(self):
+        self.stop_event.set()
+        decoder, self.decoder = self.decoder, None
+        if decoder is not None:
+            decoder.stop()
+        self._blocks = []
+
+    def waiting_text(self) -> str:
+        destino = self.bus_kwargs.get('channel', 'interface padrão')
+        return f"Status: Conectado (Aguardando dados CAN {destino}...)"
+
+    def status_text(self) -> str:
+        latencia = float(np.median(self.latencies_ms)) if self.latencies_ms else 0.0
+        return (f"Status: Recebendo dados... | Latência {latencia:.0f} ms"
+                f" | Deriva {self.clock.drift_ppm:+.0f} ppm")
+
+
+# ========== LoRa ==========
+
+class LoRaSource(TelemetrySource):
+    """
+    Receptor LoRa (serial ou captura .lora reproduzida).
+
+    Uma base de tempo (todos os canais no mesmo pacote), no relógio local
+    pelo ClockSync do receptor. Pacotes retransmitidos saem em lotes
+    late=True. Os resumos de volta da Central vão para o painel VOLTAS e
+    recomeçam a janela da volta nas estatísticas.
+    """
+
+    label = "LoRa"
+
+    def __init__(self, port: Optional[str] = None, baud_rate: Optional[int] = None,
+                 replay_path: Optional[str] = None, replay_speed: float = 1.0):
+        super().__init__()
+        from core import lora_receiver
+        self.lora = lora_receiver
+        if replay_path:
+            self.receiver = lora_receiver.open_replay(replay_path, replay_speed)
+        else:
+            self.receiver = lora_receiver.LoRaReceiver(port=port, baud_rate=baud_rate or lora_receiver.BAUD_RATE)
+        self.replay = bool(replay_path)
+        self.cursor = 0
+
+    def start(self) -> bool:
+        lora = self.lora
+        if lora.RECORD_RAW_STREAM and not self.replay:
+            self.receiver.start_recording(lora.new_capture_path())
+        if not self.receiver.start():
+            self.receiver.stop_recording()
+            self.error = "ERRO ao conectar LoRa"
+            return False
+        self.cursor = self.receiver.new_cursor()
+        return True
+
+    def poll(self) -> List[SampleBatch]:
+        lora = self.lora
+        rows, self.cursor = self.receiver.read_new(self.cursor)
+        if not len(rows):
+            return []
+        late_mask = rows['late'].astype(bool)
+        batches = []
+        for late in (False, True):
+            part = rows[late_mask == late]
+            if not len(part):
+                continue
+            t = self.receiver.local_time(part['timestamp_ms'])
+            if t is None:
+                if late:
+                    continue  # Sem estimativa de relógio não há onde encaixar
+                t = part['rx_time']
+            batches.append(SampleBatch(lora.LIVE_TIMEBASE, np.atleast_1d(t),
+                                       {canal: part[canal] for canal in lora.CHANNEL_FIELDS}, late))
+        return batches
+
+    def stop(self):
+        self.receiver.stop()
+
+    def waiting_text(self) -> str:
+        return f"Status: LoRa conectado ({self.receiver.port})"
+
+    def status_text(self) -> str:
+        stats = self.receiver.get_statistics()
+        return (f"Status: LoRa {stats['current_hz']:.1f} Hz | {stats['packets_received']} pkts"
+                f" | {stats['success_rate']:.1f}% OK"
+                f" | {stats['packets_backfilled']} recuperados"
+                f" | Latência {stats['latency_p50_ms']:.0f}/{stats['latency_p99_ms']:.0f} ms (p50/p99)"
+                f" | Deriva {stats['clock_drift_ppm']:+.0f} ppm")
+
+    def update_panels(self, app_instance):
+        if self.receiver.pop_lap_summaries():
+            self.lora._update_lap_panel(app_instance, self.receiver)
+            from core.telemetry_realtime import mark_live_lap
+            mark_live_lap(app_instance)
+
+
+# ========== Replay de log ==========
+
+class LogReplaySource(TelemetrySource):
+    """
+    Reproduz um log CSV (mesmo formato da aba de análise) como se fosse ao
+    vivo, no ritmo original ou acelerado.
+
+    Os canais do log são renomeados para os nomes ao vivo por
+    REPLAY_CHANNELS + [CHANNELS] do config. Não há thread: cada poll()
+    entrega as linhas cujo tempo já passou (busca binária no eixo do log).
+
+    Os tempos entregues seguem o eixo do log (início da sessão + tempo no
+    log): com speed=4 o gráfico rola 4x mais rápido, mas os eixos e as
+    janelas de estatística continuam em segundos do log.
+    """
+
+    label = "Replay"
+
+    def __init__(self, path: str, speed: float = 1.0, channel_mapping: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.channel_mapping = channel_mapping
+        self.t_log = np.empty(0)
+        self.columns: Dict[str, np.ndarray] = {}
+        self.started_at: Optional[float] = None
+        self.cursor = 0
+
+    def _load(self):
+        import pandas as pd
+        from config_manager import get_channel_name, load_config
+
+        mapping = self.channel_mapping
+        if mapping is None:
+            mapping = load_config()[0]
+        df = pd.read_csv(self.path, sep=None, engine='python')
+        time_col = get_channel_name(mapping, 'timestamp', df.columns)
+        if time_col is None:
+            raise ValueError(f"coluna de tempo '{mapping.get('timestamp', 'Timestamp')}' não encontrada")
+        t = pd.to_numeric(df[time_col], errors='coerce').to_numpy(dtype=np.float64)
+        ok = np.isfinite(t)
+        t = t[ok]
+        if not len(t):
+            raise ValueError("coluna de tempo sem valores numéricos")
+        self.t_log = np.maximum.accumulate(t - t[0])
+        self.columns = {}
+        for canal, interno in REPLAY_CHANNELS.items():
+            coluna = get_channel_name(mapping, interno, df.columns) or get_channel_name(mapping, canal, df.columns)
+            if coluna is not None:
+                valores = pd.to_numeric(df[coluna], errors='coerce').to_numpy(dtype=np.float32)
+                self.columns[canal] = valores[ok]
+
+    def start(self) -> bool:
+        try:
+            self._load()
+        except Exception as e:
+            print(f"[Replay] Erro ao carregar {self.path}: {e}")
+            self.error = f"ERRO no replay: {e}"
+            return False
+        print(f"[Replay] {os.path.basename(self.path)}: {len(self.t_log)} linhas, "
+              f"{self.t_log[-1]:.1f} s, canais {list(self.columns)}")
+        self.started_at = None  # O relógio do replay começa no primeiro poll()
+        self.cursor = 0
+        return True
+
+    def poll(self) -> List[SampleBatch]:
+        start = self.cursor
+        if start >= len(self.t_log):
+            return []
+        if self.started_at is None:
+            self.started_at = time.time()
+        if self.speed > 0:
+            elapsed = (time.time() - self.started_at) * self.speed
+            end = int(np.searchsorted(self.t_log, elapsed, side='right'))
+            end = min(end, start + REPLAY_MAX_ROWS)
+        else:
+            end = start + REPLAY_MAX_ROWS
+        end = min(end, len(self.t_log))
+        if end <= start:
+            return []
+        self.cursor = end
+        return [SampleBatch(REPLAY_TIMEBASE, self.started_at + self.t_log[start:end],
+                            {canal: valores[start:end] for canal, valores in self.columns.items()})]
+
+    def waiting_text(self) -> str:
+        return f"Status: Replay de {os.path.basename(self.path)}"
+
+    def status_text(self) -> str:
+        total = self.t_log[-1] if len(self.t_log) else 0.0
+        atual = self.t_log[self.cursor - 1] if self.cursor else 0.0
+        fim = " (fim)" if self.cursor >= len(self.t_log) else ""
+        return (f"Status: Replay {os.path.basename(self.path)} | {atual:.1f}/{total:.1f} s"
+                f" | {self.speed:g}x{fim}")
+
+
+# ========== Fábrica ==========
+
+def criar_fonte(source_key: Optional[str] = None, overrides: Optional[dict] = None) -> TelemetrySource:
+    """
+    Cria a fonte configurada em configure_telemetry (telemetry_source.json).
+
+    Args:
+        source_key: chave de SOURCES; None = a salva no telemetry_source.json
+        overrides: substitui valores de SOURCES[chave]['config']
+    """
+    from configure_telemetry import SOURCES, load_config as load_source_config
+
+    saved = load_source_config()
+    if source_key is None:
+        source_key = saved.get('source', 'simulator')
+        overrides = {**saved.get('config', {}), **(overrides or {})}
+    info = SOURCES.get(source_key)
+    if info is None:
+        print(f"[Fontes] Fonte desconhecida '{source_key}', usando o simulador CAN")
+        source_key, info = 'simulator', SOURCES['simulator']
+    config = {**info['config'], **(overrides or {})}
+
+    kind = info['kind']
+    if kind == 'can':
+        return CanSource(bus_kwargs={key: value for key, value in config.items() if value is not None})
+    if kind == 'lora':
+        return LoRaSource(port=config.get('port'), baud_rate=config.get('baud_rate'),
+                          replay_path=config.get('replay_path'), replay_speed=config.get('speed', 1.0))
+    if kind == 'replay_log':
+        return LogReplaySource(config['path'], speed=config.get('speed', 1.0))
+    raise ValueError(f"Tipo de fonte desconhecido: {kind}")
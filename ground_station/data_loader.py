@@ -67,4 +67,55 @@ def carregar_log_csv(filepath: str, config_map: Dict[str, str]) -> Optional[pd.D
          return None
     except Exception as e:
         messagebox.showerror("Erro", f"Erro ao carregar dados: {e}\nVerifique o formato e o nome das colunas.")
-        return None
\ No newline at end of file
+        return None
+
+def carregar_sessao_ao_vivo(filepath: str, config_map: Dict[str, str]) -> Optional[pd.DataFrame]:
+    """
+    Carrega uma sessão gravada pela telemetria ao vivo (.ptl), mesmo que
+    ainda esteja sendo gravada, no mesmo formato de carregar_log_csv.
+
+    As bases de tempo (frames CAN, LoRa...) são unidas num único eixo: cada
+    canal mantém o último valor recebido até a amostra seguinte. Os canais
+    recebem os nomes de coluna do [CHANNELS] do config (canais sem
+    correspondência, como os derivados, mantêm o nome ao vivo).
+
+    Args:
+        filepath: Caminho para o arquivo .ptl (índice .ptl.idx ao lado).
+        config_map: Dicionário de mapeamento de canais.
+
+    Returns:
+        DataFrame com índice de tempo, ou None em caso de erro.
+    """
+    import numpy as np
+    from core.live_frame import live_column_name
+    from core.session_recorder import read_session
+
+    try:
+        header, session = read_session(filepath)
+        if not session:
+            messagebox.showerror("Erro", f"Sessão sem amostras gravadas: {filepath}")
+            return None
+
+        t_all = np.unique(np.concatenate([t for t, _ in session.values()]))
+        timestamp_col = config_map.get('timestamp', 'Timestamp')
+        data = {timestamp_col: header.get('inicio', 0.0) + t_all}
+        for t, columns in session.values():
+            idx = np.searchsorted(t, t_all, side='right') - 1  # Última amostra até cada instante
+            valid = idx >= 0
+            for canal, valores in columns.items():
+                coluna = live_column_name(canal, config_map)
+                serie = np.full(len(t_all), np.nan, dtype=valores.dtype)
+                serie[valid] = valores[idx[valid]]
+                data[coluna] = serie
+
+        df = pd.DataFrame(data)
+        df['Timestamp_dt'] = pd.to_datetime(df[timestamp_col], unit='s')
+        df = df.set_index('Timestamp_dt')
+        print(f"Sessão ao vivo carregada ({len(session)} bases de tempo). Colunas disponíveis: {df.columns.tolist()}")
+        return df
+    except FileNotFoundError:
+        messagebox.showerror("Erro", f"Arquivo (ou índice .idx) não encontrado: {filepath}")
+        return None
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao carregar sessão: {e}")
+        return None
@@ -0,0 +1,119 @@
+"""
+Camada de ligação canal → widget dos dashboards ao vivo.
+
+Cada widget (label, barra de progresso) é ligado a um canal com o seu
+formato e uma taxa máxima de atualização. A cada tick o DashboardBinder
+recebe os valores mais recentes e:
+- guarda o último valor de cada ligação (um valor novo substitui o
+  anterior ainda não mostrado);
+- só chama o Tk quando a ligação pode atualizar (max_hz) e o texto
+  formatado, a posição da barra ou a cor realmente mudaram.
+
+Todo configure/set conta como uma chamada Tk (cada uma dispara layout e
+redesenho do widget no CustomTkinter); stats() devolve as chamadas por
+segundo, para o indicador da aba ao vivo.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+TEXT_MAX_HZ = 10.0       # Labels: acima disso o número fica ilegível
+PROGRESS_MAX_HZ = 20.0   # Barras: movimento suave
+PROGRESS_STEP = 0.005    # Resolução da barra (200 posições)
+NO_VALUE_TEXT = "--"     # Texto para canal sem valor (NaN, ex.: escorregamento parado)
+
+
+class WidgetBinding:
+    """Um widget ligado a um canal (texto ou barra de progresso)."""
+
+    __slots__ = ('widget', 'fmt', 'full_scale', 'color_fn', 'min_interval',
+                 'value', 'next_at', 'last_text', 'last_position', 'last_color')
+
+    def __init__(self, widget, fmt: Optional[str] = None, full_scale: Optional[float] = None,
+                 color_fn: Optional[Callable[[float], str]] = None, max_hz: float = TEXT_MAX_HZ):
+        self.widget = widget
+        self.fmt = fmt
+        self.full_scale = full_scale
+        self.color_fn = color_fn
+        self.min_interval = 1.0 / max_hz if max_hz else 0.0
+        self.value = None
+        self.next_at = 0.0
+        self.last_text = None
+        self.last_position = None
+        self.last_color = None
+
+
+class DashboardBinder:
+    """Atualiza os widgets ligados só com o que mudou, respeitando a taxa de cada um."""
+
+    def __init__(self):
+        self.bindings: Dict[str, List[WidgetBinding]] = {}
+        self.pending: Dict[WidgetBinding, None] = {}  # Conjunto ordenado
+        self.tk_calls = 0
+        self.skipped = 0          # Valores descartados sem mudança visível
+        self._stats_at = time.perf_counter()
+        self._stats_calls = 0
+
+    def bind_text(self, channel: str, widget, fmt: str, max_hz: float = TEXT_MAX_HZ):
+        """Label que mostra fmt.format(valor)."""
+        if widget is not None:
+            self.bindings.setdefault(channel, []).append(WidgetBinding(widget, fmt=fmt, max_hz=max_hz))
+
+    def bind_progress(self, channel: str, widget, full_scale: float,
+                      color_fn: Optional[Callable[[float], str]] = None, max_hz: float = PROGRESS_MAX_HZ):
+        """Barra de progresso em valor / full_scale (e cor opcional por faixa de valor)."""
+        if widget is not None:
+            self.bindings.setdefault(channel, []).append(
+                WidgetBinding(widget, full_scale=full_scale, color_fn=color_fn, max_hz=max_hz))
+
+    def update(self, values: Dict[str, float], now: Optional[float] = None):
+        """Recebe os valores mais recentes e aplica o que estiver liberado pela taxa."""
+        if now is None:
+            now = time.perf_counter()
+        for channel, value in values.items():
+            for binding in self.bindings.get(channel, ()):
+                binding.value = value
+                self.pending[binding] = None
+        for binding in list(self.pending):
+            if now >= binding.next_at:
+                del self.pending[binding]
+                self._apply(binding, now)
+
+    def _apply(self, binding: WidgetBinding, now: float):
+        value = binding.value
+        changed = False
+        if binding.fmt is not None:
+            text = binding.fmt.format(value) if value == value else NO_VALUE_TEXT
+            if text != binding.last_text:
+                binding.widget.configure(text=text)
+                binding.last_text = text
+                self.tk_calls += 1
+                changed = True
+        elif value == value:  # NaN: barra fica onde estava
+            position = min(max(value / binding.full_scale, 0.0), 1.0)
+            position = round(position / PROGRESS_STEP) * PROGRESS_STEP
+            if position != binding.last_position:
+                binding.widget.set(position)
+                binding.last_position = position
+                self.tk_calls += 1
+                changed = True
+            if binding.color_fn is not None:
+                color = binding.color_fn(value)
+                if color != binding.last_color:
+                    binding.widget.configure(progress_color=color)
+                    binding.last_color = color
+                    self.tk_calls += 1
+                    changed = True
+        if changed:
+            binding.next_at = now + binding.min_interval
+        else:
+            self.skipped += 1
+
+    def stats(self) -> float:
+        """Chamadas Tk por segundo desde a chamada anterior."""
+        now = time.perf_counter()
+        dt = now - self._stats_at
+        rate = (self.tk_calls - self._stats_calls) / dt if dt > 0 else 0.0
+        self._stats_at = now
+        self._stats_calls = self.tk_calls
+        return rate
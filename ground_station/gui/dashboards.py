@@ -1,6 +1,7 @@
 """
 Módulo de criação de dashboards de tempo real para telemetria.
-Contém funções para criar as interfaces visuais dos dashboards (Motor/ECU, Pilotagem, Rodas, Suspensão).
+Contém funções para criar as interfaces visuais dos dashboards (Motor/ECU, Pilotagem, Rodas, Suspensão)
+e as ligações canal → widget (DashboardBinder) atualizadas a cada tick da telemetria ao vivo.
 """
 
 import customtkinter as ctk
@@ -9,6 +10,7 @@ from core.constants import (
     COLOR_ACCENT_RED, COLOR_ACCENT_GOLD, COLOR_ACCENT_CYAN, COLOR_ACCENT_GREEN,
     COLOR_TEXT_PRIMARY, COLOR_TEXT_SECONDARY, COLOR_BORDER
 )
+from gui.dashboard_bindings import DashboardBinder
 
 
 def criar_conteudo_dashboards_tempo_real(app_instance):
@@ -352,3 +354,67 @@ def criar_card_sensor(app_instance, parent, row, col, titulo, valor_inicial, uni
                  text_color=COLOR_TEXT_SECONDARY).pack(pady=(0, 10))
     
     return lbl_valor
+
+
+# Ligações canal → widget dos dashboards: (canal, atributo do app, formato, taxa máx. em Hz)
+# lbl_val_* são os cards da aba ao vivo; lbl_dash_* a aba Dashboards
+DASHBOARD_LABELS = [
+    ('RPM', 'lbl_val_rpm', '{:.0f}', 5.0), ('RPM', 'lbl_dash_rpm', '{:.0f}', 10.0),
+    ('Temperatura', 'lbl_val_temp', '{:.0f}', 5.0), ('Temperatura', 'lbl_dash_temp', '{:.0f}', 10.0),
+    ('ThrottlePos', 'lbl_val_tps', '{:.0f}', 5.0), ('ThrottlePos', 'lbl_dash_tps', '{:.0f}%', 10.0),
+    ('Lambda', 'lbl_val_lambda', '{:.2f}', 5.0), ('Lambda', 'lbl_dash_lambda', '{:.2f}', 10.0),
+    ('SteeringAngle', 'lbl_val_steer', '{:.1f}', 5.0), ('SteeringAngle', 'lbl_dash_steer', '{:.1f}', 10.0),
+    ('BrakePressure', 'lbl_val_brake', '{:.0f}', 5.0), ('BrakePressure', 'lbl_dash_brake', '{:.0f}', 10.0),
+    ('AccelX', 'lbl_val_accel_x', '{:.2f}', 5.0), ('AccelX', 'lbl_dash_accel_x', '{:.2f}', 10.0),
+    ('AccelY', 'lbl_val_accel_y', '{:.2f}', 5.0), ('AccelY', 'lbl_dash_accel_y', '{:.2f}', 10.0),
+    ('WheelSpeed_FL', 'lbl_val_ws_fl', '{:.0f}', 5.0), ('WheelSpeed_FL', 'lbl_dash_ws_fl', '{:.0f}', 10.0),
+    ('WheelSpeed_FR', 'lbl_val_ws_fr', '{:.0f}', 5.0), ('WheelSpeed_FR', 'lbl_dash_ws_fr', '{:.0f}', 10.0),
+    ('WheelSpeed_RL', 'lbl_val_ws_rl', '{:.0f}', 5.0), ('WheelSpeed_RL', 'lbl_dash_ws_rl', '{:.0f}', 10.0),
+    ('WheelSpeed_RR', 'lbl_val_ws_rr', '{:.0f}', 5.0), ('WheelSpeed_RR', 'lbl_dash_ws_rr', '{:.0f}', 10.0),
+    ('SuspensionPos_FL', 'lbl_val_susp_fl', '{:.0f}', 5.0), ('SuspensionPos_FL', 'lbl_dash_susp_fl', '{:.0f}', 10.0),
+    ('SuspensionPos_FR', 'lbl_val_susp_fr', '{:.0f}', 5.0), ('SuspensionPos_FR', 'lbl_dash_susp_fr', '{:.0f}', 10.0),
+    ('SuspensionPos_RL', 'lbl_val_susp_rl', '{:.0f}', 5.0), ('SuspensionPos_RL', 'lbl_dash_susp_rl', '{:.0f}', 10.0),
+    ('SuspensionPos_RR', 'lbl_val_susp_rr', '{:.0f}', 5.0), ('SuspensionPos_RR', 'lbl_dash_susp_rr', '{:.0f}', 10.0),
+    ('SlipRatio', 'lbl_val_slip', '{:+.1f}', 5.0),
+    ('CombinedG', 'lbl_val_combined_g', '{:.2f}', 5.0),
+    ('RideHeightDelta', 'lbl_val_ride_delta', '{:+.1f}', 5.0),
+    ('LambdaError', 'lbl_val_lambda_err', '{:+.3f}', 5.0),
+]
+
+
+def _rpm_color(rpm: float) -> str:
+    """Cor da barra de RPM: verde <8000, amarelo 8000-11000, vermelho >11000."""
+    if rpm < 8000:
+        return COLOR_ACCENT_GREEN
+    if rpm < 11000:
+        return COLOR_ACCENT_GOLD
+    return COLOR_ACCENT_RED
+
+
+# (canal, atributo do app, fundo de escala, cor por valor)
+DASHBOARD_BARS = [
+    ('RPM', 'prog_dash_rpm', 13000.0, _rpm_color),
+    ('ThrottlePos', 'prog_dash_tps', 100.0, None),
+    ('BrakePressure', 'prog_dash_brake', 200.0, None),
+]
+
+
+def _build_dashboard_binder(app_instance) -> DashboardBinder:
+    """Liga os widgets que existirem no app aos seus canais."""
+    binder = DashboardBinder()
+    for canal, attr, fmt, max_hz in DASHBOARD_LABELS:
+        binder.bind_text(canal, getattr(app_instance, attr, None), fmt, max_hz)
+    for canal, attr, full_scale, color_fn in DASHBOARD_BARS:
+        binder.bind_progress(canal, getattr(app_instance, attr, None), full_scale, color_fn)
+    return binder
+
+
+def update_dashboard_labels(app_instance, dados_recentes):
+    """
+    Atualiza os dashboards com os dados mais recentes (chamar a cada tick,
+    mesmo sem dados novos: valores segurados pela taxa máxima saem depois).
+    """
+    binder = getattr(app_instance, 'dashboard_binder', None)
+    if binder is None:
+        binder = app_instance.dashboard_binder = _build_dashboard_binder(app_instance)
+    binder.update(dados_recentes)
@@ -0,0 +1,126 @@
+"""
+Agendador de quadros da telemetria ao vivo (orçamento adaptativo).
+
+Substitui os after(100) fixos: cada tarefa (dados + painéis, gráfico) tem
+a sua cadência, calculada a partir do custo medido de cada execução:
+
+    intervalo = custo médio / orçamento   (limitado a [min_ms, max_ms])
+
+O orçamento é a fração do tempo da thread do Tk que a tarefa pode usar
+(ex.: 0.45 = gráfico ocupa no máximo 45% da thread). Num notebook lento o
+intervalo cresce sozinho e sobra tempo para os eventos da janela; num
+rápido ele desce até min_ms.
+
+Com a janela minimizada/oculta todas as tarefas caem para
+HIDDEN_INTERVAL_MS. Tarefas só visuais recebem `paused` (ex.: gráfico
+fora da aba visível) e não rodam enquanto ele for verdadeiro nem com a
+janela oculta; as demais (ex.: drenar os dados recebidos) continuam.
+
+Uma tarefa que retorna False não fez nada (ex.: gráfico sem dados novos):
+essa execução não entra na média do custo, que mede só o trabalho real.
+"""
+
+import time
+from typing import Callable, List, Optional
+
+HIDDEN_INTERVAL_MS = 1000.0  # Cadência com a janela minimizada/oculta
+COST_SMOOTHING = 0.2         # Peso da última medição na média do custo
+
+
+class FrameTask:
+    """Uma tarefa periódica com orçamento próprio."""
+
+    __slots__ = ('name', 'callback', 'budget', 'min_ms', 'max_ms', 'paused',
+                 'cost_ms', 'interval_ms', 'next_at', 'runs')
+
+    def __init__(self, name: str, callback: Callable[[], Optional[bool]], budget: float,
+                 min_ms: float, max_ms: float, paused: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.callback = callback
+        self.budget = budget
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.paused = paused
+        self.cost_ms = 0.0
+        self.interval_ms = min_ms
+        self.next_at = 0.0
+        self.runs = 0
+
+
+class FrameScheduler:
+    """Executa as tarefas no loop do Tk (after), cada uma na sua cadência."""
+
+    def __init__(self, root):
+        self.root = root
+        self.tasks: List[FrameTask] = []
+        self.running = False
+        self.hidden = False
+        self._after_id = None
+
+    def add(self, name: str, callback: Callable[[], Optional[bool]], budget: float,
+            min_ms: float, max_ms: float, paused: Optional[Callable[[], bool]] = None) -> FrameTask:
+        task = FrameTask(name, callback, budget, min_ms, max_ms, paused)
+        self.tasks.append(task)
+        return task
+
+    def start(self):
+        self.running = True
+        now = time.perf_counter()
+        for task in self.tasks:
+            task.next_at = now
+        self._schedule(0)
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _window_hidden(self) -> bool:
+        try:
+            return self.root.state() in ('iconic', 'withdrawn') or not self.root.winfo_viewable()
+        except Exception:
+            return False
+
+    def _schedule(self, delay_ms: float):
+        self._after_id = self.root.after(max(1, int(delay_ms)), self._tick)
+
+    def _run(self, task: FrameTask, started: float):
+        try:
+            if task.callback() is False:
+                return  # Nada a fazer: custo quase zero não representa a tarefa
+        except Exception as e:
+            print(f"[Agendador] Erro na tarefa '{task.name}' (recuperado): {e}")
+        cost = (time.perf_counter() - started) * 1000.0
+        task.cost_ms = cost if not task.runs else task.cost_ms + COST_SMOOTHING * (cost - task.cost_ms)
+        task.runs += 1
+
+    def _tick(self):
+        self._after_id = None
+        if not self.running:
+            return
+        self.hidden = self._window_hidden()
+        for task in self.tasks:
+            now = time.perf_counter()
+            if now < task.next_at:
+                continue
+            if not (task.paused and (self.hidden or task.paused())):
+                self._run(task, now)
+                if not self.running:
+                    return  # A tarefa parou a telemetria
+            interval = min(max(task.cost_ms / task.budget, task.min_ms), task.max_ms)
+            if self.hidden:
+                interval = max(interval, HIDDEN_INTERVAL_MS)
+            task.interval_ms = interval
+            task.next_at = now + interval / 1000.0
+        next_at = min(task.next_at for task in self.tasks)
+        self._schedule((next_at - time.perf_counter()) * 1000.0)
+
+    def summary(self) -> str:
+        """Cadência atual de cada tarefa (para o indicador da aba ao vivo)."""
+        if self.hidden:
+            return "janela oculta"
+        return " · ".join(f"{task.name} {task.interval_ms:.0f} ms" for task in self.tasks)
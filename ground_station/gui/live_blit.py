@@ -0,0 +1,111 @@
+"""
+Renderizador com Blitting para o gráfico ao vivo.
+
+A cada quadro só as linhas são redesenhadas sobre um fundo guardado em
+cache (eixos, grade, ticks, rótulos, spines dos eixos twin). Artistas que
+precisam ficar por cima das linhas (a legenda) fazem parte do fundo e têm
+os seus pixels colados de volta depois das linhas, sem re-layout de texto.
+
+A figura inteira só é redesenhada quando algum limite de eixo mudou desde
+o último desenho completo, ou quando o matplotlib redesenha por conta
+própria (resize, toolbar, hover) - nesse caso o fundo é recapturado no
+draw_event.
+
+Também mede o tempo de cada quadro (atualização dos dados + desenho), para
+o indicador de FPS da aba ao vivo.
+"""
+
+import time
+from collections import deque
+
+FRAME_HISTORY = 90  # Quadros usados no indicador (~3 s a 30 FPS)
+
+
+class LiveBlitRenderer:
+    """Blitting das linhas ao vivo sobre um fundo em cache."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.artists = []
+        self.overlays = []
+        self.overlay_regions = []
+        self.background = None
+        self.drawn_limits = None
+        self.frame_ms = deque(maxlen=FRAME_HISTORY)
+        self.frame_at = deque(maxlen=FRAME_HISTORY)
+        self.frame_full = deque(maxlen=FRAME_HISTORY)
+        self.supports_blit = bool(getattr(canvas, 'supports_blit', False))
+        self._cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def set_artists(self, artists, overlays=()):
+        """
+        Define os artistas animados (chamar após recriar a figura).
+
+        `overlays` são artistas estáticos que ficam por cima das linhas
+        (ex.: legenda).
+        """
+        self.artists = [artist for artist in artists if artist is not None]
+        for artist in self.artists:
+            artist.set_animated(self.supports_blit)
+        self.overlays = [artist for artist in overlays if artist is not None]
+        self.background = None
+
+    def _limits(self):
+        return tuple((ax.get_xlim(), ax.get_ylim()) for ax in self.figure.axes)
+
+    def _on_draw(self, event):
+        """Desenho completo: guarda o fundo (sem as linhas) e desenha as linhas por cima."""
+        if not self.supports_blit:
+            return
+        # Ao salvar a figura o renderer é outro: só desenha as linhas nele
+        if self.canvas.is_saving():
+            for artist in self.artists + self.overlays:
+                artist.draw(event.renderer)
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.overlay_regions = [self.canvas.copy_from_bbox(artist.get_window_extent(event.renderer))
+                                for artist in self.overlays if artist.get_visible()]
+        self.drawn_limits = self._limits()
+        for artist in self.artists:
+            artist.draw(event.renderer)
+        for region in self.overlay_regions:
+            self.canvas.restore_region(region)
+
+    def render(self, started: float = None):
+        """
+        Mostra o estado atual das linhas.
+
+        Args:
+            started: perf_counter() do início do quadro (inclui a atualização
+                dos dados no tempo medido); padrão = agora
+        """
+        if started is None:
+            started = time.perf_counter()
+        full = (not self.supports_blit or self.background is None
+                or self._limits() != self.drawn_limits)
+        if not self.supports_blit:
+            self.canvas.draw_idle()
+        elif full:
+            self.canvas.draw()  # O _on_draw recaptura o fundo
+        else:
+            self.canvas.restore_region(self.background)
+            for artist in self.artists:
+                self.figure.draw_artist(artist)
+            for region in self.overlay_regions:
+                self.canvas.restore_region(region)
+            self.canvas.blit(self.figure.bbox)
+        now = time.perf_counter()
+        self.frame_ms.append((now - started) * 1000.0)
+        self.frame_at.append(now)
+        self.frame_full.append(full)
+
+    def stats(self):
+        """(FPS, tempo de quadro mediano em ms, máximo em ms, fração de desenhos completos) ou None."""
+        n = len(self.frame_at)
+        if n < 2:
+            return None
+        span = self.frame_at[-1] - self.frame_at[0]
+        fps = (n - 1) / span if span > 0 else 0.0
+        ordered = sorted(self.frame_ms)
+        return fps, ordered[n // 2], ordered[-1], sum(self.frame_full) / n
@@ -7,6 +7,8 @@ import numpy as np
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
+from core.decimation import decimate_to_width
+from core.derived_channels import DERIVED_CHANNELS
 from core.constants import (
     COLOR_BG_SECONDARY, COLOR_BG_TERTIARY,
     COLOR_ACCENT_RED, COLOR_ACCENT_GOLD,
@@ -22,6 +24,8 @@ def format_hover_value(v):
         av = abs(float(v))
     except (ValueError, TypeError):
         return str(v)
+    if np.isnan(av):
+        return "N/A"
     
     if av >= 1000:
         return f"{v:.0f}"
@@ -149,6 +153,34 @@ def setup_live_hover_artists(app_instance):
         app_instance._live_hover_text = None
 
 
+def live_values_at(app_instance, x):
+    """
+    Valores dos canais selecionados no instante mais próximo de x.
+    
+    O instante é o da amostra mais próxima do primeiro canal selecionado;
+    cada um dos demais canais mostra a sua amostra mais próxima desse
+    instante (na sua própria base de tempo).
+    
+    Returns:
+        (índice no canal de referência, tempo, linhas do tooltip) ou None
+    """
+    store = app_instance.live_data_storage
+    ref = next((canal for canal in app_instance.selected_live_channels if canal in store), None)
+    if ref is None:
+        return None
+    hit = store.nearest(ref, x)
+    if hit is None:
+        return None
+    idx, t_val, _ = hit
+
+    lines = [f"t = {t_val:.2f} s"]
+    for canal in app_instance.selected_live_channels:
+        sample = store.nearest(canal, t_val)
+        if sample is not None:
+            lines.append(f"{canal}: {format_hover_value(sample[2])}")
+    return idx, t_val, lines
+
+
 def on_live_plot_hover(app_instance, event):
     """Mostra tooltip com valores dos canais selecionados no X do cursor."""
     try:
@@ -167,42 +199,17 @@ def on_live_plot_hover(app_instance, event):
             app_instance.canvas_live.draw_idle()
             return
 
-        if 'Time' not in app_instance.live_data_storage:
-            hide_live_hover(app_instance)
-            app_instance.canvas_live.draw_idle()
-            return
-
-        t_list = app_instance.live_data_storage.get('Time', [])
-        if not t_list or len(t_list) < 2:
+        hit = live_values_at(app_instance, float(event.xdata))
+        if hit is None:
             hide_live_hover(app_instance)
             app_instance.canvas_live.draw_idle()
             return
-
-        x = float(event.xdata)
-        t_arr = np.asarray(t_list, dtype=float)
-        idx = int(np.searchsorted(t_arr, x, side='left'))
-        if idx <= 0:
-            idx = 0
-        elif idx >= len(t_arr):
-            idx = len(t_arr) - 1
-        else:
-            # Escolhe o mais próximo entre idx-1 e idx
-            if abs(t_arr[idx] - x) > abs(x - t_arr[idx - 1]):
-                idx = idx - 1
+        idx, t_val, lines = hit
 
         if app_instance._live_hover_last_idx == idx and app_instance._live_hover_text is not None and app_instance._live_hover_text.get_visible():
             return
         app_instance._live_hover_last_idx = idx
 
-        t_val = t_arr[idx]
-        lines = [f"t = {t_val:.2f} s"]
-        for canal in app_instance.selected_live_channels:
-            y_list = app_instance.live_data_storage.get(canal)
-            if not y_list or idx >= len(y_list):
-                continue
-            y_val = y_list[idx]
-            lines.append(f"{canal}: {format_hover_value(y_val)}")
-
         # Atualiza posição da linha
         if app_instance._live_hover_vline is not None:
             app_instance._live_hover_vline.set_xdata([t_val, t_val])
@@ -228,14 +235,18 @@ def toggle_auto_scroll(app_instance):
 
         # Ao desligar, abre o eixo X para facilitar navegar no histórico
         try:
-            t_data = app_instance.live_data_storage.get('Time', [])
-            if t_data and len(t_data) >= 2:
-                app_instance.ax_live.set_xlim(0, t_data[-1])
+            if len(app_instance.live_data_storage) >= 2:
+                app_instance.ax_live.set_xlim(0, app_instance.live_data_storage.last_time())
                 app_instance.canvas_live.draw_idle()
         except Exception:
             pass
 
 
+def _history(app_instance, series):
+    """Histórico completo de um canal, decimado (M4) para a largura do gráfico."""
+    return decimate_to_width(*series, app_instance.ax_live.bbox.width)
+
+
 def update_live_plot_style(app_instance):
     """Reconfigura completamente o gráfico ao vivo com base nos canais selecionados."""
     print(f"[DEBUG] update_live_plot_style chamado. Canais: {app_instance.selected_live_channels}")
@@ -245,6 +256,7 @@ def update_live_plot_style(app_instance):
     app_instance.ax_live = app_instance.fig_live.add_subplot(111)
     app_instance.live_lines = {}
     app_instance.live_axes = {}
+    app_instance.live_decimators = {}  # Linhas novas: cache M4 recomeça
     
     # Configuração base do eixo X
     app_instance.ax_live.set_xlabel('Tempo (s)', color=COLOR_TEXT_SECONDARY, fontsize=9)
@@ -276,11 +288,9 @@ def update_live_plot_style(app_instance):
             app_instance.live_axes[canal] = app_instance.ax_live
             
             # Restaura dados históricos se existirem
-            if canal in app_instance.live_data_storage and 'Time' in app_instance.live_data_storage:
-                t_data = app_instance.live_data_storage['Time']
-                y_data = app_instance.live_data_storage[canal]
-                if len(t_data) == len(y_data) and len(t_data) > 0:
-                    line.set_data(t_data, y_data)
+            series = app_instance.live_data_storage.series(canal)
+            if series is not None and len(series[0]) > 0:
+                line.set_data(*_history(app_instance, series))
         
         # Ajusta limites
         app_instance.ax_live.relim()
@@ -309,15 +319,13 @@ def update_live_plot_style(app_instance):
         app_instance.live_axes[app_instance.selected_live_channels[0]] = host
         
         # Restaura dados do primeiro canal
-        if app_instance.selected_live_channels[0] in app_instance.live_data_storage and 'Time' in app_instance.live_data_storage:
-            t_data = app_instance.live_data_storage['Time']
-            y_data = app_instance.live_data_storage[app_instance.selected_live_channels[0]]
-            if len(t_data) == len(y_data) and len(t_data) > 0:
-                line0.set_data(t_data, y_data)
-                host.relim()
-                host.autoscale_view()
-                # Adiciona margem vertical diferenciada para cada canal
-                host.margins(y=0.15)
+        series = app_instance.live_data_storage.series(app_instance.selected_live_channels[0])
+        if series is not None and len(series[0]) > 0:
+            line0.set_data(*_history(app_instance, series))
+            host.relim()
+            host.autoscale_view()
+            # Adiciona margem vertical diferenciada para cada canal
+            host.margins(y=0.15)
         
         # Cria eixos adicionais e plota
         for i in range(1, n_channels):
@@ -363,16 +371,14 @@ def update_live_plot_style(app_instance):
             app_instance.live_axes[canal] = ax
             
             # Restaura dados
-            if canal in app_instance.live_data_storage and 'Time' in app_instance.live_data_storage:
-                t_data = app_instance.live_data_storage['Time']
-                y_data = app_instance.live_data_storage[canal]
-                if len(t_data) == len(y_data) and len(t_data) > 0:
-                    line.set_data(t_data, y_data)
-                    ax.relim()
-                    ax.autoscale_view()
-                    # Margem vertical progressiva para "espalhar" as linhas visualmente
-                    margin = 0.15 + (i * 0.05)
-                    ax.margins(y=margin)
+            series = app_instance.live_data_storage.series(canal)
+            if series is not None and len(series[0]) > 0:
+                line.set_data(*_history(app_instance, series))
+                ax.relim()
+                ax.autoscale_view()
+                # Margem vertical progressiva para "espalhar" as linhas visualmente
+                margin = 0.15 + (i * 0.05)
+                ax.margins(y=margin)
     
     # ===== LEGENDA UNIVERSAL =====
     all_lines = []
@@ -383,6 +389,7 @@ def update_live_plot_style(app_instance):
             all_lines.append(app_instance.live_lines[canal])
             all_labels.append(canal)
     
+    legend = None
     if all_lines:
         legend = app_instance.ax_live.legend(
             all_lines,
@@ -401,6 +408,10 @@ def update_live_plot_style(app_instance):
     # Recria elementos do hover (a figura foi limpa)
     setup_live_hover_artists(app_instance)
 
+    # Linhas redesenhadas por blitting; a legenda continua por cima delas
+    if hasattr(app_instance, 'live_renderer'):
+        app_instance.live_renderer.set_artists(all_lines, overlays=[legend])
+
     print(f"[DEBUG] Gráfico reconfigurado com {len(app_instance.live_lines)} linhas.")
     app_instance.canvas_live.draw_idle()
 
@@ -411,6 +422,7 @@ def abrir_seletor_canais_live(app_instance):
                                'SteeringAngle', 'BrakePressure', 'AccelX', 'AccelY',
                                'WheelSpeed_FL', 'WheelSpeed_FR', 'WheelSpeed_RL', 'WheelSpeed_RR',
                                'SuspensionPos_FL', 'SuspensionPos_FR', 'SuspensionPos_RL', 'SuspensionPos_RR'])
+    canais_possiveis += [canal.name for canal in DERIVED_CHANNELS]  # Calculados por lote (core.derived_channels)
     
     popup = ctk.CTkToplevel(app_instance)
     popup.title("Selecionar Canais - Live Plot")
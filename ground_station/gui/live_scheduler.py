@@ -0,0 +1,58 @@
+"""
+Agendamento da sessão ao vivo na GUI - PUCPR Racing
+
+Liga as tarefas da telemetria ao vivo (core.telemetry_realtime) a um
+FrameScheduler no loop do Tk: drenar a fonte e atualizar os painéis,
+redesenhar o gráfico, gravar a sessão em disco e atualizar as abas de
+análise com a sessão ao vivo, cada uma com a sua cadência.
+"""
+
+from core.session_recorder import RECORD_FLUSH_S
+from core.telemetry_realtime import (flush_live_recording, update_live_analysis,
+                                     update_live_gui, update_live_plot)
+from gui.frame_scheduler import FrameScheduler
+
+# Fração da thread do Tk e limites do intervalo, por tarefa
+DATA_TICK_BUDGET = 0.15     # Dados + painéis
+DATA_TICK_MS = (33.0, 250.0)
+PLOT_TICK_BUDGET = 0.45     # Gráfico
+PLOT_TICK_MS = (25.0, 500.0)
+RECORD_TICK_BUDGET = 0.05   # Gravação da sessão (só fatia e enfileira; a thread grava)
+ANALYSIS_TICK_BUDGET = 0.2  # Abas de análise com a sessão ao vivo (tempos de volta, G-G...)
+ANALYSIS_TICK_MS = (2000.0, 10000.0)
+LIVE_TAB = "📡 Tempo Real"  # Gráfico só é redesenhado com esta aba visível
+
+
+def start_live_scheduler(app_instance):
+    """
+    Inicia o agendamento da aba ao vivo: update_live_gui drena a fonte e
+    atualiza os painéis; o gráfico, a gravação em disco e as abas de análise
+    (com a sessão ao vivo em uso) têm cadência própria.
+    """
+    stop_live_scheduler(app_instance)
+    app_instance._live_plot_dirty = False
+    scheduler = FrameScheduler(app_instance)
+    scheduler.add("dados", lambda: update_live_gui(app_instance), DATA_TICK_BUDGET, *DATA_TICK_MS)
+    scheduler.add("gráfico", lambda: update_live_plot(app_instance), PLOT_TICK_BUDGET, *PLOT_TICK_MS,
+                  paused=lambda: _live_tab_hidden(app_instance))
+    if getattr(app_instance, 'live_recorder', None) is not None:
+        scheduler.add("gravação", lambda: flush_live_recording(app_instance), RECORD_TICK_BUDGET,
+                      RECORD_FLUSH_S * 1000.0, RECORD_FLUSH_S * 1000.0)
+    scheduler.add("análise", lambda: update_live_analysis(app_instance), ANALYSIS_TICK_BUDGET, *ANALYSIS_TICK_MS,
+                  paused=lambda: getattr(app_instance, 'live_view', None) is None or not _live_tab_hidden(app_instance))
+    app_instance.live_scheduler = scheduler
+    scheduler.start()
+
+
+def stop_live_scheduler(app_instance):
+    scheduler = getattr(app_instance, 'live_scheduler', None)
+    if scheduler is not None:
+        scheduler.stop()
+        app_instance.live_scheduler = None
+
+
+def _live_tab_hidden(app_instance) -> bool:
+    try:
+        return app_instance.tabs_view.get() != LIVE_TAB
+    except Exception:
+        return False
@@ -13,7 +13,6 @@ import platform
 import subprocess
 from typing import Optional, Dict, List, Any # Para type hinting
 import threading
-import queue
 import time
 from collections import deque
 import can
@@ -21,7 +20,7 @@ import cantools
 
 # Importa funções dos outros módulos
 from config_manager import load_config, get_channel_name, CONFIG_FILE
-from data_loader import carregar_log_csv
+from data_loader import carregar_log_csv, carregar_sessao_ao_vivo
 from calculations import (calcular_metricas_gg, calcular_tempos_volta,
                           calcular_metricas_skidpad, calcular_metricas_aceleracao)
 from plotting import (configurar_estilo_plot, plotar_dados_no_canvas, plotar_gg_diagrama_nos_eixos,
@@ -40,8 +39,10 @@ from core.constants import (
 from core import analysis_callbacks
 
 # Importa módulos GUI
-from core import telemetry_realtime, lora_receiver
-from gui import dashboards, live_plotting
+from core import telemetry_realtime
+from core.live_store import MultiRateStore
+from gui import dashboards, live_plotting, live_scheduler
+from gui.live_blit import LiveBlitRenderer
 
 # Configura estilo matplotlib
 configurar_estilo_matplotlib()
@@ -105,16 +106,16 @@ class AppAnalisePUCPR(ctk.CTk):
         self.data_frame: Optional[pd.DataFrame] = None # DataFrame com os dados do log
         self.current_filepath: str = ""                # Caminho do arquivo carregado
         self.lap_numbers_series: Optional[pd.Series] = None # Guarda voltas calculadas
+        self.live_view = None      # Sessão ao vivo nas abas de análise (core.live_frame), None = log de arquivo
+        self.voltas_ao_vivo = False # Tempos de volta refeitos a cada atualização da sessão ao vivo
 
         # --- Variáveis para Tempo Real ---
-        self.live_queue = queue.Queue()
-        self.live_thread: Optional[threading.Thread] = None
-        self.stop_live_event = threading.Event()
+        self.live_source = None # Fonte ao vivo da sessão (core.telemetry_sources: CAN, LoRa, replay)
         self.is_live_active = False
         
         # Histórico para gráfico em tempo real
-        self.maxlen_plot = 100000 # Buffer grande para guardar histórico
-        self.live_data_storage: Dict[str, List[float]] = {'Time': []} # Inicializa com Time
+        self.maxlen_plot = 100000 # Amostras por canal guardadas no histórico (~33 min a 50 Hz)
+        self.live_data_storage = MultiRateStore(self.maxlen_plot) # Colunas NumPy de capacidade fixa, uma base de tempo por frame
         self.selected_live_channels: List[str] = ['RPM', 'WheelSpeed_FL'] # Canais padrão
         self.start_time_live = 0.0
         self.auto_scroll = True # Estado do auto-scroll
@@ -180,23 +181,10 @@ class AppAnalisePUCPR(ctk.CTk):
         try:
             if event is None or event.inaxes is None or event.xdata is None:
                 return
-            if 'Time' not in self.live_data_storage:
+            hit = live_plotting.live_values_at(self, float(event.xdata))
+            if hit is None:
                 return
-
-            t_list = self.live_data_storage.get('Time', [])
-            if not t_list:
-                return
-
-            x = float(event.xdata)
-            t_arr = np.asarray(t_list, dtype=float)
-            idx = int(np.searchsorted(t_arr, x, side='left'))
-            if idx <= 0:
-                idx = 0
-            elif idx >= len(t_arr):
-                idx = len(t_arr) - 1
-            else:
-                if abs(t_arr[idx] - x) > abs(x - t_arr[idx - 1]):
-                    idx = idx - 1
+            idx, t_val, lines = hit
 
             if self._live_hover_pinned and self._live_hover_pinned_idx == idx:
                 # Segundo clique no mesmo ponto: desfixa
@@ -209,13 +197,6 @@ class AppAnalisePUCPR(ctk.CTk):
             self._live_hover_pinned_idx = idx
 
             # Reusa a lógica de render do hover com posição do clique
-            t_val = float(t_arr[idx])
-            lines = [f"t = {t_val:.2f} s"]
-            for canal in self.selected_live_channels:
-                y_list = self.live_data_storage.get(canal)
-                if not y_list or idx >= len(y_list):
-                    continue
-                lines.append(f"{canal}: {self._format_hover_value(y_list[idx])}")
 
             if self._live_hover_text is not None:
                 fx, fy = self.fig_live.transFigure.inverted().transform((event.x, event.y))
@@ -251,6 +232,7 @@ class AppAnalisePUCPR(ctk.CTk):
                                  font=self.MENU_FONT, borderwidth=0) # Usa self.MENU_FONT
         self.menu_bar.add_cascade(label="Arquivo", menu=self.file_menu) # Adiciona o menu "Arquivo"
         self.file_menu.add_command(label="Abrir Log (.csv)...", command=self.abrir_arquivo_log) # Opção para abrir log
+        self.file_menu.add_command(label="Usar Sessão Ao Vivo", command=self.usar_sessao_ao_vivo) # Análises sobre a telemetria ao vivo
         self.file_menu.add_command(label="Exportar Log Atual (.csv)...", command=self.exportar_dados_csv, state="disabled") # Opção para exportar (começa desabilitada)
         self.file_menu.add_separator() # Linha separadora
         self.file_menu.add_command(label=f"Ver/Editar Configuração ({CONFIG_FILE})...", command=self.editar_arquivo_config) # Opção para editar config
@@ -275,7 +257,12 @@ class AppAnalisePUCPR(ctk.CTk):
         # Botão Abrir Log (com ícone Unicode)
         self.btn_abrir_log = ctk.CTkButton(self.painel_controle, text="📁 Abrir Log (.csv)", command=self.abrir_arquivo_log,
                                            fg_color=COLOR_ACCENT_RED, hover_color="#A00000", text_color=COLOR_TEXT_PRIMARY, font=self.DEFAULT_FONT_BOLD) # Usa self.
-        self.btn_abrir_log.pack(pady=(15, 10), padx=15, fill="x") # Aumenta padx interno
+        self.btn_abrir_log.pack(pady=(15, 5), padx=15, fill="x") # Aumenta padx interno
+
+        # Botão Usar Sessão Ao Vivo (análises sobre o histórico da telemetria ao vivo, sem cópia)
+        self.btn_usar_sessao_ao_vivo = ctk.CTkButton(self.painel_controle, text="📡 Usar Sessão Ao Vivo", command=self.usar_sessao_ao_vivo,
+                                                     fg_color=COLOR_BG_TERTIARY, hover_color=COLOR_BORDER, text_color=COLOR_TEXT_PRIMARY, font=self.DEFAULT_FONT_BOLD)
+        self.btn_usar_sessao_ao_vivo.pack(pady=(0, 10), padx=15, fill="x")
 
         # Label para nome do arquivo
         self.lbl_nome_arquivo = ctk.CTkLabel(self.painel_controle, text="Nenhum log carregado", text_color=COLOR_TEXT_SECONDARY,
@@ -500,11 +487,14 @@ class AppAnalisePUCPR(ctk.CTk):
 
     # --- Funções de Callback e Lógica Principal ---
     def abrir_arquivo_log(self):
-        """Abre diálogo para selecionar arquivo de log (.csv) e o carrega."""
+        """Abre diálogo para selecionar arquivo de log (.csv ou sessão ao vivo .ptl) e o carrega."""
         self.atualizar_status("Abrindo seletor de arquivo...")
-        filepath = filedialog.askopenfilename(title="Selecionar Arquivo de Log (.csv)", filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*")))
+        filepath = filedialog.askopenfilename(title="Selecionar Arquivo de Log (.csv / .ptl)", filetypes=(("CSV Files", "*.csv"), ("Sessões Ao Vivo", "*.ptl"), ("All Files", "*.*")))
         if filepath:
             self.atualizar_status(f"Carregando log: {os.path.basename(filepath)} em segundo plano...")
+            # Deixa de acompanhar a sessão ao vivo
+            self.live_view = None
+            self.voltas_ao_vivo = False
             # Desabilita botões temporariamente
             self.habilitar_botoes_pos_carga(False)
             # Executa a leitura em uma Thread separada
@@ -515,7 +505,10 @@ class AppAnalisePUCPR(ctk.CTk):
     def _carregar_log_thread(self, filepath):
         """Thread separada para carregar o log sem travar a interface."""
         try:
-            df_carregado = carregar_log_csv(filepath, self.channel_mapping)
+            if filepath.lower().endswith('.ptl'):
+                df_carregado = carregar_sessao_ao_vivo(filepath, self.channel_mapping)
+            else:
+                df_carregado = carregar_log_csv(filepath, self.channel_mapping)
             self.after(0, lambda: self._finalizar_carga_log(df_carregado, filepath))
         except Exception as e:
             self.after(0, lambda: self._falha_carga_log(filepath, str(e)))
@@ -557,7 +550,52 @@ class AppAnalisePUCPR(ctk.CTk):
         if erro_msg:
             print(f"Erro no carregamento do log: {erro_msg}")
         self.atualizar_status("Falha ao carregar o arquivo de log.")
-        
+
+    def usar_sessao_ao_vivo(self):
+        """Passa as abas de análise para a sessão ao vivo (em andamento ou a última), atualizada durante a sessão."""
+        # Limpa o estado do log anterior
+        self.current_filepath = ""
+        self.data_frame = None
+        self.lap_numbers_series = None
+        self.voltas_ao_vivo = False
+        self.atualizar_lista_canais()
+        self.atualizar_area_plot(title="Sessão ao vivo. Selecione canais para plotar.")
+        self.limpar_labels_resultados()
+        self.lbl_nome_arquivo.configure(text="📡 Sessão ao vivo")
+        if telemetry_realtime.use_live_session(self):
+            self.atualizar_status(f"Usando a sessão ao vivo ({len(self.data_frame)} linhas, atualizada durante a sessão).")
+        else:
+            self.habilitar_botoes_pos_carga(False)
+            self.atualizar_status("Sessão ao vivo sem amostras: as análises começam quando os dados chegarem.")
+
+    def definir_data_frame_ao_vivo(self, df: pd.DataFrame):
+        """Troca o data_frame pela versão atual da sessão ao vivo (telemetry_realtime.refresh_live_frame)."""
+        primeira = self.data_frame is None
+        self.data_frame = df
+        if primeira:
+            self.habilitar_botoes_pos_carga(True)
+        # Só recria as checkboxes (perdendo a seleção) se chegaram canais novos
+        if set(self.checkboxes_canais) - {'LapNumber'} != set(df.columns):
+            self.atualizar_lista_canais()
+
+    def atualizar_analises_ao_vivo(self):
+        """Refaz com os dados novos da sessão ao vivo os tempos de volta (se já pedidos) e o gráfico G-G, mapa ou canais aberto."""
+        if self.voltas_ao_vivo:
+            lap_numbers, resultados = calcular_tempos_volta(self.data_frame, self.channel_mapping, self.track_config, self.analysis_config)
+            self.atualizar_texto_resultado("Autocross_Endurance", resultados)
+            self.lap_numbers_series = lap_numbers
+            if lap_numbers is not None:
+                self.data_frame.insert(0, 'LapNumber', lap_numbers)
+                if 'LapNumber' not in self.checkboxes_canais: self.atualizar_lista_canais()
+        # O título identifica o gráfico aberto (ver plotting.configurar_estilo_plot)
+        titulo = self.eixo_plot.get_title()
+        for prefixo, plotar in (("Diagrama G-G", self.plotar_gg_diagrama_gui),
+                                ("Mapa da Pista", self.plotar_mapa_pista_gui),
+                                ("Dados da Série Temporal", self.plotar_dados_selecionados_gui)):
+            if titulo.startswith(prefixo):
+                plotar()
+                break
+
     def limpar_labels_resultados(self):
         """Limpa o texto de todos os textboxes de resultado nas abas específicas."""
         # Usa os nomes das abas como configurados (com ícones)
@@ -732,6 +770,7 @@ class AppAnalisePUCPR(ctk.CTk):
         """Calcula tempos de volta e atualiza a GUI."""
         if self.data_frame is None: return messagebox.showwarning("Aviso", "Carregue um log primeiro.")
         self.atualizar_status("Calculando tempos de volta...")
+        self.voltas_ao_vivo = self.live_view is not None # Na sessão ao vivo, refeitos a cada atualização
         # Chama a função de cálculo, passando as configurações relevantes
         lap_numbers, resultados = calcular_tempos_volta(self.data_frame, self.channel_mapping, self.track_config, self.analysis_config)
         # Atualiza o textbox correspondente
@@ -980,6 +1019,10 @@ class AppAnalisePUCPR(ctk.CTk):
         self.lbl_live_hz = ctk.CTkLabel(frame_botoes_top, text="Hz: --", font=self.SMALL_FONT, text_color=COLOR_TEXT_SECONDARY)
         self.lbl_live_hz.pack(side="right")
 
+        # Indicador de desempenho do gráfico (FPS / tempo de quadro)
+        self.lbl_live_fps = ctk.CTkLabel(frame_botoes_top, text="-- FPS", font=self.SMALL_FONT, text_color=COLOR_TEXT_SECONDARY)
+        self.lbl_live_fps.pack(side="right", padx=(0, 15))
+
         # Configurações do Gráfico (Seleção e Auto-Scroll)
         frame_config_grafico = ctk.CTkFrame(frame_live_ctrl, fg_color="transparent")
         frame_config_grafico.pack(fill="x", pady=(10, 0))
@@ -1035,10 +1078,19 @@ class AppAnalisePUCPR(ctk.CTk):
         self.live_lines: Dict[str, Any] = {}
         # Dicionário para guardar escalas laterais secundárias se precisarmos (não usado na normalização simples, mas bom ter)
         self.live_axes: Dict[str, Any] = {} 
+        # Cache de decimação M4 por canal (core.decimation)
+        self.live_decimators: Dict[str, Any] = {}
+        # Ligações canal → widget dos dashboards (criadas no primeiro tick)
+        self.dashboard_binder = None
+        # Agendador da aba ao vivo (cadência adaptativa de dados e gráfico)
+        self.live_scheduler = None
+        # Estatísticas móveis por canal (criadas ao iniciar CAN/LoRa)
+        self.live_stats = None
 
         # Canvas
         self.canvas_live = FigureCanvasTkAgg(self.fig_live, master=frame_grafico_live)
         self.canvas_live.get_tk_widget().pack(side=tk.TOP, fill="both", expand=True, padx=2, pady=2)
+        self.live_renderer = LiveBlitRenderer(self.canvas_live) # Blitting das linhas ao vivo
         
         # Toolbar para navegação (Zoom/Pan) - Importante para ver histórico
         self.toolbar_live = NavigationToolbar2Tk(self.canvas_live, frame_grafico_live, pack_toolbar=False)
@@ -1106,6 +1158,47 @@ class AppAnalisePUCPR(ctk.CTk):
         self.lbl_val_susp_rl = self._criar_card_sensor(frame_susp, 1, 0, "RL", "0", "mm")
         self.lbl_val_susp_rr = self._criar_card_sensor(frame_susp, 1, 1, "RR", "0", "mm")
 
+        # --- Grupo DERIVADOS (core.derived_channels) ---
+        self._criar_titulo_secao(scroll_dashboard, "DERIVADOS")
+        frame_derivados = ctk.CTkFrame(scroll_dashboard, fg_color="transparent")
+        frame_derivados.pack(fill="x", pady=5)
+        frame_derivados.grid_columnconfigure((0,1), weight=1)
+
+        self.lbl_val_slip = self._criar_card_sensor(frame_derivados, 0, 0, "Escorreg.", "--", "% tras./diant.")
+        self.lbl_val_combined_g = self._criar_card_sensor(frame_derivados, 0, 1, "G Comb.", "0.00", "g")
+        self.lbl_val_ride_delta = self._criar_card_sensor(frame_derivados, 1, 0, "Δ Altura", "0.0", "mm diant.-tras.")
+        self.lbl_val_lambda_err = self._criar_card_sensor(frame_derivados, 1, 1, "Erro λ", "0.000", "λ - alvo")
+
+        # --- Grupo ALARMES (core.alarms: avaliados em todas as amostras) ---
+        self._criar_titulo_secao(scroll_dashboard, "ALARMES")
+        frame_alarmes = ctk.CTkFrame(scroll_dashboard, fg_color=COLOR_BG_TERTIARY, corner_radius=8, border_width=1, border_color=COLOR_BORDER)
+        frame_alarmes.pack(fill="x", pady=5, padx=4)
+        self.lbl_live_alarms = ctk.CTkLabel(frame_alarmes, text="Nenhum alarme", font=("Consolas", 12),
+                                            text_color=COLOR_TEXT_PRIMARY, justify="left", anchor="w")
+        self.lbl_live_alarms.pack(fill="x", padx=10, pady=(8, 4))
+        ctk.CTkButton(frame_alarmes, text="✔ Reconhecer", command=self.acknowledge_live_alarms,
+                      fg_color=COLOR_BG_SECONDARY, hover_color=COLOR_BORDER, border_width=1, border_color=COLOR_BORDER,
+                      width=110, height=26, font=self.SMALL_FONT).pack(anchor="w", padx=10, pady=(0, 8))
+
+        # --- Grupo VOLTAS (resumos calculados na Central, via LoRa) ---
+        self._criar_titulo_secao(scroll_dashboard, "VOLTAS (CENTRAL)")
+        frame_voltas = ctk.CTkFrame(scroll_dashboard, fg_color=COLOR_BG_TERTIARY, corner_radius=8, border_width=1, border_color=COLOR_BORDER)
+        frame_voltas.pack(fill="x", pady=5, padx=4)
+        self.lbl_live_laps = ctk.CTkLabel(frame_voltas, text="Aguardando primeira volta...", font=("Consolas", 12),
+                                          text_color=COLOR_TEXT_PRIMARY, justify="left", anchor="w")
+        self.lbl_live_laps.pack(fill="x", padx=10, pady=8)
+
+        # --- Grupo ESTATÍSTICAS (janelas móveis dos canais do gráfico) ---
+        self._criar_titulo_secao(scroll_dashboard, "ESTATÍSTICAS (MÓVEIS)")
+        frame_stats = ctk.CTkFrame(scroll_dashboard, fg_color=COLOR_BG_TERTIARY, corner_radius=8, border_width=1, border_color=COLOR_BORDER)
+        frame_stats.pack(fill="x", pady=5, padx=4)
+        self.lbl_live_stats = ctk.CTkLabel(frame_stats, text="Aguardando dados...", font=("Consolas", 12),
+                                           text_color=COLOR_TEXT_PRIMARY, justify="left", anchor="w")
+        self.lbl_live_stats.pack(fill="x", padx=10, pady=(8, 4))
+        ctk.CTkButton(frame_stats, text="🏁 Nova Volta", command=self.mark_live_lap,
+                      fg_color=COLOR_BG_SECONDARY, hover_color=COLOR_BORDER, border_width=1, border_color=COLOR_BORDER,
+                      width=110, height=26, font=self.SMALL_FONT).pack(anchor="w", padx=10, pady=(0, 8))
+
     def _criar_titulo_secao(self, parent, texto):
         """Cria um divisor com título no dashboard."""
         f = ctk.CTkFrame(parent, height=30, fg_color="transparent")
@@ -1127,32 +1220,30 @@ class AppAnalisePUCPR(ctk.CTk):
     def toggle_auto_scroll(self):
         live_plotting.toggle_auto_scroll(self)
 
+    def mark_live_lap(self):
+        telemetry_realtime.mark_live_lap(self)
+
+    def acknowledge_live_alarms(self):
+        telemetry_realtime.acknowledge_live_alarms(self)
+
     def update_live_plot_style(self):
         live_plotting.update_live_plot_style(self)
 
+    def start_live_scheduler(self):
+        live_scheduler.start_live_scheduler(self)
+
+    def stop_live_scheduler(self):
+        live_scheduler.stop_live_scheduler(self)
+
+    def update_live_dashboards(self, dados_recentes):
+        dashboards.update_dashboard_labels(self, dados_recentes)
+
     def abrir_seletor_canais_live(self):
         live_plotting.abrir_seletor_canais_live(self)
 
     def toggle_live_telemetry(self):
-        """Alterna telemetria (detecta fonte automaticamente)."""
-        # Verifica se deve usar LoRa ou CAN
-        try:
-            import json
-            with open('telemetry_source.json', 'r') as f:
-                config = json.load(f)
-                source = config.get('source', 'simulator')
-        except:
-            source = 'simulator'  # Padrão
-        
-        if source == 'lora_serial':
-            # Usa LoRa
-            if not self.is_live_active:
-                lora_receiver.start_lora_telemetry(self)
-            else:
-                lora_receiver.stop_lora_telemetry(self)
-        else:
-            # Usa CAN (padrão)
-            telemetry_realtime.toggle_live_telemetry(self)
+        """Alterna telemetria (fonte do telemetry_source.json: CAN, LoRa ou replay)."""
+        telemetry_realtime.toggle_live_telemetry(self)
 
     def start_live_telemetry(self):
         telemetry_realtime.start_live_telemetry(self)
@@ -1160,9 +1251,6 @@ class AppAnalisePUCPR(ctk.CTk):
     def stop_live_telemetry(self):
         telemetry_realtime.stop_live_telemetry(self)
 
-    def loop_leitura_can(self):
-        telemetry_realtime.loop_leitura_can(self)
-
     def update_live_gui(self):
         telemetry_realtime.update_live_gui(self)
 
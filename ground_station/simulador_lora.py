@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Simulador de Enlace LoRa - PUCPR Racing
+
+Cria dois pseudo-terminais (pty) e encaminha os bytes entre eles como se
+fossem os dois rádios LoRa (carro ↔ pit). Permite testar o protocolo
+completo (telemetria + pedidos de retransmissão) sem hardware.
+
+Modelo do enlace (descida carro → pit, por pacote de rádio):
+- Sombra de RF: a cada --shadow-every segundos o enlace fica
+  --shadow-duration segundos sem entregar nada (nos dois sentidos)
+- Perda aleatória: cada pacote se perde com probabilidade --loss
+- Perda em rajada (modelo de Gilbert-Elliott): com probabilidade
+  --burst-start por pacote o enlace entra num desvanecimento que perde,
+  em média, --burst-length pacotes seguidos
+- Corrupção: com probabilidade --corrupt um byte do pacote é alterado
+- Tempo de ar: com --airtime-bps o rádio não entrega mais rápido que a
+  taxa do enlace; o que não cabe na fila do módulo (TX_QUEUE_LIMIT) é
+  descartado, como num rádio real saturado
+
+O fluxo da central é separado em pacotes de rádio pelos marcadores
+(AA 55 = 40 bytes, AA 56 = 6 + tamanho), ou seja, cada write() da
+central vira um pacote no ar.
+
+Com --generate o próprio simulador faz o papel da central: emite quadros
+no formato exato do central.py (AA 55 | 36 bytes | 55 AA) a --rate Hz e
+responde aos NACKs com retransmissões (tipo 0x01, até MAX_BACKFILL_PER_REQUEST
+por pedido, como a central), sem CAN nem Pi.
+
+Uso (Linux/macOS):
+    # Terminal 1: enlace
+    python simulador_lora.py --shadow-every 15 --shadow-duration 2
+
+    # Terminal 2: central apontando para o lado "carro"
+    cd ../central
+    python3 central.py --lora-port /dev/pts/X --can-bustype virtual --no-gps
+
+    # Terminal 3: Ground Station apontando para o lado "pit"
+    python core/lora_receiver.py /dev/pts/Y
+
+    # Sem central: gerador a 200 Hz, 2% de perda, rajadas e corrupção
+    python simulador_lora.py --generate --rate 200 --loss 0.02 \\
+        --burst-start 0.005 --burst-length 10 --corrupt 0.01 --airtime-bps 50000
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import struct
+import time
+import tty
+from collections import OrderedDict, deque
+from typing import List, Optional
+
+from core.lora_receiver import (STRUCT_FORMAT, START_MARKER, END_MARKER, AUX_MARKER,
+                                MSG_BACKFILL, MSG_NACK, NACK_FORMAT)
+
+PACKET_OVERHEAD_BYTES = 8   # Preâmbulo + cabeçalho + CRC do rádio (tempo de ar)
+TX_QUEUE_LIMIT = 4096       # Bytes que o módulo de rádio consegue enfileirar
+HISTORY_SEC = 30            # Janela de retransmissão do gerador (como a central)
+MAX_BACKFILL_PER_REQUEST = 250  # Limite de pacotes por NACK (como a central)
+
+
+class FrameGenerator:
+    """
+    Substitui a central: gera telemetria sintética no formato do central.py.
+
+    O timestamp é em ms desde o início do gerador (número de sequência),
+    e os pacotes dos últimos HISTORY_SEC segundos ficam guardados para
+    responder aos NACKs.
+    """
+
+    def __init__(self, rate_hz: float):
+        self.rate_hz = rate_hz
+        self.start_time = time.time()
+        self.frames_generated = 0
+        self.frames_backfilled = 0
+        self.history: "OrderedDict[int, bytes]" = OrderedDict()
+        self.uplink_buffer = bytearray()
+
+    def pack(self, ts_ms: int) -> bytes:
+        """Pacote de 36 bytes com sinais suaves (mesmas escalas da central)."""
+        t = ts_ms / 1000.0
+        wave = math.sin(t * 0.8)
+        speed = int(60 + 40 * wave)
+        susp = int(100 + 20 * math.sin(t * 7.0))
+        return struct.pack(
+            STRUCT_FORMAT,
+            int(7000 + 4000 * wave),               # RPM
+            int(85 + 5 * math.sin(t * 0.05)),      # Temperatura
+            int(50 + 50 * wave),                   # TPS
+            int(1000 + 50 * math.sin(t * 3.0)),    # Lambda * 1000
+            int(300 * math.sin(t * 0.5)),          # Volante * 10
+            int(max(0.0, -wave) * 80),             # Freio
+            int(1000 * math.cos(t * 0.8)),         # AccelX * 1000
+            int(1500 * math.sin(t * 0.5)),         # AccelY * 1000
+            0,                                     # Reservado
+            speed, speed, speed, speed,
+            susp, susp, susp, susp,
+            ts_ms & 0xFFFFFFFF
+        )
+
+    def due_frames(self, now: float) -> List[bytes]:
+        """Quadros AA 55 cuja hora já chegou (vários, se o loop atrasou)."""
+        target = int((now - self.start_time) * self.rate_hz)
+        frames = []
+        while self.frames_generated < target:
+            ts_ms = int(self.frames_generated * 1000 / self.rate_hz)
+            payload = self.pack(ts_ms)
+            self.history[ts_ms] = payload
+            frames.append(START_MARKER + payload + END_MARKER)
+            self.frames_generated += 1
+
+        # Descarta o histórico além da janela
+        horizon = (now - self.start_time - HISTORY_SEC) * 1000
+        while self.history and next(iter(self.history)) < horizon:
+            self.history.popitem(last=False)
+        return frames
+
+    def history_range(self, start_ms: int, end_ms: int, limit: int) -> List[bytes]:
+        """
+        Payloads guardados com start_ms <= timestamp <= end_ms (até `limit`).
+
+        O timestamp do quadro k é int(k * 1000 / rate_hz): o primeiro da
+        faixa sai direto do índice, sem percorrer o histórico.
+        """
+        oldest = self.frames_generated - len(self.history)  # Histórico é contíguo
+        k = max(oldest, math.ceil(start_ms * self.rate_hz / 1000))
+        payloads = []
+        while k < self.frames_generated and len(payloads) < limit:
+            ts_ms = int(k * 1000 / self.rate_hz)
+            if ts_ms > end_ms:
+                break
+            payload = self.history.get(ts_ms)
+            if payload is not None and ts_ms >= start_ms:
+                payloads.append(payload)
+            k += 1
+        return payloads
+
+    def handle_uplink(self, data: bytes) -> List[bytes]:
+        """Interpreta NACKs vindos do pit e retorna as retransmissões."""
+        self.uplink_buffer += data
+        buf = self.uplink_buffer
+        size = struct.calcsize(NACK_FORMAT)
+        frames = []
+        while True:
+            start = buf.find(AUX_MARKER)
+            if start < 0:
+                del buf[:max(0, len(buf) - 1)]  # Pode ser a metade do marcador
+                return frames
+            if len(buf) - start < 6 + size:
+                del buf[:start]
+                return frames
+            end = start + 4 + size
+            if (buf[start + 2] == MSG_NACK and buf[start + 3] == size
+                    and buf[end:end + len(END_MARKER)] == END_MARKER):
+                start_ms, end_ms = struct.unpack_from(NACK_FORMAT, buf, start + 4)
+                for payload in self.history_range(start_ms, end_ms, MAX_BACKFILL_PER_REQUEST):
+                    frames.append(AUX_MARKER + bytes((MSG_BACKFILL, len(payload)))
+                                  + payload + END_MARKER)
+                    self.frames_backfilled += 1
+                del buf[:end + len(END_MARKER)]  # Quadro inteiro consumido
+            else:
+                del buf[:start + len(AUX_MARKER)]  # Marcador falso: procura o próximo
+
+
+class LinkEmulator:
+    """Encaminha bytes entre dois pty aplicando perdas do enlace."""
+
+    def __init__(self, shadow_every: float = 0.0, shadow_duration: float = 0.0,
+                 loss: float = 0.0, burst_start: float = 0.0, burst_length: float = 0.0,
+                 corrupt: float = 0.0, airtime_bps: float = 0.0,
+                 generator: Optional[FrameGenerator] = None, seed: Optional[int] = None):
+        self.shadow_every = shadow_every
+        self.shadow_duration = shadow_duration
+        self.loss = loss
+        self.burst_start = burst_start
+        self.burst_length = burst_length
+        self.corrupt = corrupt
+        self.airtime_bps = airtime_bps
+        self.generator = generator
+        self.random = random.Random(seed)
+
+        # Lado carro (Central) e lado pit (Ground Station)
+        self.car_master, self.car_slave = os.openpty()
+        self.pit_master, self.pit_slave = os.openpty()
+        for fd in (self.car_slave, self.pit_slave):
+            tty.setraw(fd)  # Sem eco/tradução de caracteres
+
+        self.car_port = os.ttyname(self.car_slave)
+        self.pit_port = os.ttyname(self.pit_slave)
+
+        self.start_time = time.time()
+        self.running = False
+
+        # Descida: bytes da central ainda não separados em pacotes,
+        # e pacotes esperando tempo de ar
+        self.down_buffer = bytearray()
+        self.air_queue: deque = deque()
+        self.air_queue_bytes = 0
+        self.air_free_at = 0.0   # Instante em que o rádio termina o pacote atual
+        self.in_burst = False
+
+        # Estatísticas
+        self.bytes_down = 0       # Carro → pit entregues
+        self.bytes_up = 0         # Pit → carro entregues
+        self.bytes_dropped = 0
+        self.packets_down = 0
+        self.packets_lost = 0     # Perda aleatória + rajada + sombra
+        self.packets_corrupted = 0
+        self.packets_overflow = 0  # Descartados por falta de tempo de ar
+
+    def in_shadow(self, now: float) -> bool:
+        """True se o carro está na sombra de RF neste instante."""
+        if self.shadow_every <= 0 or self.shadow_duration <= 0:
+            return False
+        phase = (now - self.start_time) % self.shadow_every
+        return phase >= self.shadow_every - self.shadow_duration
+
+    def packet_lost(self, now: float) -> bool:
+        """Sorteia a perda de um pacote (sombra, rajada ou aleatória)."""
+        if self.in_shadow(now):
+            return True
+        if self.in_burst:
+            # Duração geométrica com média burst_length pacotes
+            if self.random.random() < 1.0 / max(self.burst_length, 1.0):
+                self.in_burst = False
+            return True
+        if self.burst_start > 0 and self.random.random() < self.burst_start:
+            self.in_burst = True
+            return True
+        return self.loss > 0 and self.random.random() < self.loss
+
+    def split_packets(self) -> List[bytes]:
+        """Separa o fluxo da central em pacotes de rádio (um por quadro)."""
+        buf = self.down_buffer
+        packets = []
+        while buf:
+            if buf[:2] == START_MARKER:
+                size = len(START_MARKER) + struct.calcsize(STRUCT_FORMAT) + len(END_MARKER)
+            elif buf[:2] == AUX_MARKER:
+                if len(buf) < 4:
+                    break
+                size = 6 + buf[3]
+            else:
+                # Sem marcador no início (marcadores desligados ou lixo):
+                # vai até o próximo marcador
+                starts = [i for i in (buf.find(START_MARKER, 1), buf.find(AUX_MARKER, 1)) if i > 0]
+                if starts:
+                    size = min(starts)
+                elif buf[-1] == START_MARKER[0]:
+                    # O último byte pode ser a metade de um marcador
+                    if len(buf) == 1:
+                        break
+                    size = len(buf) - 1
+                else:
+                    size = len(buf)
+            if len(buf) < size:
+                break
+            packets.append(bytes(buf[:size]))
+            del buf[:size]
+        return packets
+
+    def transmit(self, packet: bytes, now: float):
+        """Aplica o modelo do canal a um pacote da descida e o enfileira no rádio."""
+        self.packets_down += 1
+        if self.packet_lost(now):
+            self.packets_lost += 1
+            self.bytes_dropped += len(packet)
+            return
+        if self.corrupt > 0 and self.random.random() < self.corrupt:
+            data = bytearray(packet)
+            data[self.random.randrange(len(data))] ^= 1 << self.random.randrange(8)
+            packet = bytes(data)
+            self.packets_corrupted += 1
+        if self.airtime_bps > 0 and self.air_queue_bytes + len(packet) > TX_QUEUE_LIMIT:
+            self.packets_overflow += 1
+            self.bytes_dropped += len(packet)
+            return
+        self.air_queue.append((packet, now))
+        self.air_queue_bytes += len(packet)
+
+    def deliver_due(self, now: float) -> float:
+        """
+        Entrega ao pit os pacotes cujo tempo de ar já passou.
+
+        Returns:
+            Segundos até a próxima entrega (0.1 se a fila estiver vazia)
+        """
+        while self.air_queue:
+            packet, queued_at = self.air_queue[0]
+            if self.airtime_bps > 0:
+                start = max(self.air_free_at, queued_at)
+                done = start + (len(packet) + PACKET_OVERHEAD_BYTES) * 8 / self.airtime_bps
+                if done > now:
+                    return done - now
+                self.air_free_at = done
+            self.air_queue.popleft()
+            self.air_queue_bytes -= len(packet)
+            os.write(self.pit_master, packet)
+            self.bytes_down += len(packet)
+        return 0.1
+
+    def forward_up(self, data: bytes, now: float):
+        """Subida (pit → carro): só a sombra e a perda aleatória se aplicam."""
+        if self.in_shadow(now) or (self.loss > 0 and self.random.random() < self.loss):
+            self.bytes_dropped += len(data)
+            return
+        self.bytes_up += len(data)
+        if self.generator:
+            for frame in self.generator.handle_uplink(data):
+                self.transmit(frame, now)
+        else:
+            os.write(self.car_master, data)
+
+    def run(self):
+        """Loop principal de encaminhamento."""
+        self.running = True
+        fds = [self.pit_master] if self.generator else [self.car_master, self.pit_master]
+        wait = 0.1
+        while self.running:
+            if self.generator:
+                wait = min(wait, 1.0 / self.generator.rate_hz)
+            readable, _, _ = select.select(fds, [], [], max(wait, 0.0005))
+            now = time.time()
+            for fd in readable:
+                try:
+                    data = os.read(fd, 4096)
+                except OSError:
+                    continue  # Lado ainda não aberto / fechado
+                if fd == self.car_master:
+                    self.down_buffer += data
+                    for packet in self.split_packets():
+                        self.transmit(packet, now)
+                else:
+                    self.forward_up(data, now)
+            if self.generator:
+                for frame in self.generator.due_frames(now):
+                    self.transmit(frame, now)
+            try:
+                wait = self.deliver_due(now)
+            except OSError:
+                wait = 0.1  # Pit ainda não abriu a porta
+
+    def close(self):
+        self.running = False
+        for fd in (self.car_master, self.car_slave, self.pit_master, self.pit_slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de enlace LoRa via pty")
+    parser.add_argument('--shadow-every', type=float, default=15.0,
+                        help="Período da sombra de RF em segundos (0 = desliga)")
+    parser.add_argument('--shadow-duration', type=float, default=2.0,
+                        help="Duração da sombra de RF em segundos")
+    parser.add_argument('--loss', type=float, default=0.0,
+                        help="Probabilidade de perda aleatória por pacote (0-1)")
+    parser.add_argument('--burst-start', type=float, default=0.0,
+                        help="Probabilidade por pacote de iniciar uma rajada de perdas")
+    parser.add_argument('--burst-length', type=float, default=10.0,
+                        help="Duração média da rajada (pacotes)")
+    parser.add_argument('--corrupt', type=float, default=0.0,
+                        help="Probabilidade de corromper um byte do pacote (0-1)")
+    parser.add_argument('--airtime-bps', type=float, default=0.0,
+                        help="Taxa do enlace em bits/s para o tempo de ar (0 = ilimitada)")
+    parser.add_argument('--generate', action='store_true',
+                        help="Gera os quadros da central (não usa o lado carro)")
+    parser.add_argument('--rate', type=float, default=50.0,
+                        help="Pacotes/s do gerador (--generate)")
+    parser.add_argument('--seed', type=int, help="Semente do sorteio de perdas (reprodutível)")
+    args = parser.parse_args()
+
+    generator = FrameGenerator(args.rate) if args.generate else None
+    link = LinkEmulator(args.shadow_every, args.shadow_duration, loss=args.loss,
+                        burst_start=args.burst_start, burst_length=args.burst_length,
+                        corrupt=args.corrupt, airtime_bps=args.airtime_bps,
+                        generator=generator, seed=args.seed)
+    print("=== SIMULADOR DE ENLACE LoRa PUCPR RACING ===")
+    if generator:
+        print(f"Gerador de quadros: {args.rate:.0f} Hz (lado carro não usado)")
+    else:
+        print(f"Lado carro (central.py --lora-port): {link.car_port}")
+    print(f"Lado pit   (Ground Station):         {link.pit_port}")
+    if args.shadow_every > 0:
+        print(f"Sombra de RF: {args.shadow_duration:.1f} s a cada {args.shadow_every:.1f} s")
+    if args.loss or args.burst_start or args.corrupt:
+        print(f"Perda: {args.loss * 100:.1f}% | Rajadas: {args.burst_start * 100:.2f}% "
+              f"(~{args.burst_length:.0f} pacotes) | Corrupção: {args.corrupt * 100:.1f}%")
+    if args.airtime_bps > 0:
+        print(f"Tempo de ar: {args.airtime_bps:.0f} bit/s (fila do rádio {TX_QUEUE_LIMIT} B)")
+    print("Ctrl+C para parar\n")
+
+    try:
+        link.run()
+    except KeyboardInterrupt:
+        print(f"\nEnlace encerrado. Descida: {link.bytes_down} B | "
+              f"Subida: {link.bytes_up} B | Descartados: {link.bytes_dropped} B")
+        print(f"Pacotes: {link.packets_down} | Perdidos: {link.packets_lost} | "
+              f"Corrompidos: {link.packets_corrupted} | Sem tempo de ar: {link.packets_overflow}")
+        if generator:
+            print(f"Gerador: {generator.frames_generated} quadros | "
+                  f"{generator.frames_backfilled} retransmitidos")
+    finally:
+        link.close()
+
+
+if __name__ == '__main__':
+    main()
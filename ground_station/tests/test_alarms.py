@@ -0,0 +1,30 @@
+"""Testes do motor de alarmes (core.alarms)."""
+
+import numpy as np
+
+from core.alarms import AlarmEngine, AlarmRule
+
+RULES = [AlarmRule('Sobregiro', 'RPM', 11000.0, hysteresis=500.0)]
+RPM = [9000.0, 11500.0, 11800.0, 9000.0, 9000.0]
+
+
+def _events(batch_size):
+    engine = AlarmEngine(RULES)
+    t = np.arange(len(RPM), dtype=np.float64) * 0.1
+    x = np.array(RPM, dtype=np.float32)
+    for i in range(0, len(RPM), batch_size):
+        engine.process(t[i:i + batch_size], {'RPM': x[i:i + batch_size]})
+    return engine, [(e.kind, e.t, e.value) for e in engine.pop_events()]
+
+
+def test_lote_unico_liga_e_desliga():
+    engine, events = _events(len(RPM))
+    assert [kind for kind, _, _ in events] == ['ativo', 'normal']
+    assert engine.active() == []
+
+
+def test_amostra_por_lote_igual_ao_lote_unico():
+    _, single = _events(len(RPM))
+    engine, one_by_one = _events(1)
+    assert one_by_one == single
+    assert engine.active() == []
@@ -0,0 +1,21 @@
+"""Testes do rastreador de lacunas da retransmissão (core.lora_receiver.BackfillTracker)."""
+
+import time
+
+from core.lora_receiver import NACK_TIMEOUT, BackfillTracker
+
+
+def test_retransmissao_perdida_no_meio_da_faixa_e_pedida_de_novo():
+    tracker = BackfillTracker(interval_ms=20)
+    tracker.on_live(0)
+    tracker.on_live(200)  # Perdeu 20..180
+    assert tracker.due_requests(time.time()) == [(1, 199)]
+
+    # Central responde, mas a retransmissão de 80 se perde
+    for ts in (20, 40, 60, 100, 120, 140, 160, 180):
+        tracker.on_backfill(ts)
+    assert tracker.gaps and [g[:2] for g in tracker.gaps] == [[61, 99]]
+    assert tracker.due_requests(time.time() + NACK_TIMEOUT) == [(61, 99)]
+
+    tracker.on_backfill(80)
+    assert tracker.gaps == []
@@ -0,0 +1,46 @@
+"""Testes da sincronização de relógio carro ↔ ground station (core.clock_sync)."""
+
+import numpy as np
+import pytest
+
+from core.clock_sync import ClockSync
+
+OFFSET_S = 1.7e9        # Relógio local (epoch) x contador da Central
+DRIFT = 80e-6           # Relógio local anda 80 ppm mais rápido
+MIN_DELAY_S = 0.004     # Atraso físico mínimo do enlace
+
+
+def _synthetic(seconds: float = 90.0, rate_hz: float = 50.0, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    sender_s = np.arange(0.0, seconds, 1.0 / rate_hz)
+    measured_local = sender_s + OFFSET_S + DRIFT * sender_s
+    jitter = rng.exponential(0.015, len(sender_s))   # Fila: sempre >= 0
+    jitter[rng.random(len(sender_s)) < 0.02] += 0.3  # Alguns pacotes bem atrasados
+    return sender_s, measured_local, measured_local + MIN_DELAY_S + jitter
+
+
+@pytest.mark.parametrize('batch', [1, 25])
+def test_recupera_offset_deriva_e_latencia(batch):
+    sender_s, measured_local, rx_time = _synthetic()
+    sync = ClockSync(min_delay_s=MIN_DELAY_S)
+    for i in range(0, len(sender_s), batch):
+        if batch == 1:
+            sync.update(sender_s[i], rx_time[i])
+        else:
+            sync.update_many(sender_s[i:i + batch], rx_time[i:i + batch])
+
+    assert sync.ready
+    assert sync.drift_ppm == pytest.approx(DRIFT * 1e6, abs=10.0)
+    np.testing.assert_allclose(sync.to_local(sender_s[-500:]), measured_local[-500:], rtol=0, atol=0.001)
+    latency = sync.latency(sender_s[-500:], rx_time[-500:])
+    np.testing.assert_allclose(latency, rx_time[-500:] - measured_local[-500:], rtol=0, atol=0.001)
+    assert latency.min() >= MIN_DELAY_S - 0.001
+
+
+def test_reinicio_da_central_descarta_a_estimativa():
+    sender_s, _, rx_time = _synthetic(seconds=20.0)
+    sync = ClockSync()
+    sync.update_many(sender_s, rx_time)
+    sync.update(0.0, rx_time[-1] + 1.0)  # Contador voltou a zero
+    assert sync.samples == 1 and sync.drift == 0.0
+    assert sync.to_local(0.0) == pytest.approx(rx_time[-1] + 1.0)
@@ -0,0 +1,43 @@
+"""Testes da decimação M4 do gráfico ao vivo (core.decimation)."""
+
+import numpy as np
+
+from core.decimation import M4Decimator, decimate_to_width, m4_indices
+from core.live_store import LiveStore
+
+
+def test_m4_incremental_igual_ao_m4_do_array_inteiro_com_deslizamento():
+    rng = np.random.default_rng(7)
+    store = LiveStore(2000)
+    decimator = M4Decimator()
+    dx = 0.05
+    t_next = 0.0
+    for _ in range(60):
+        n = int(rng.integers(1, 200))
+        t = t_next + np.cumsum(rng.uniform(0.001, 0.02, n))
+        t_next = t[-1]
+        y = rng.normal(size=n).astype(np.float32)
+        y[rng.random(n) < 0.02] = np.nan
+        store.extend(t, {'y': y})
+
+        t_all, y_all = store.time, store.column('y')
+        td, yd = decimator.update(t_all, y_all, dx, t_all[0], t_all[-1], revision=store.revision)
+        idx = m4_indices(t_all, y_all, dx)
+
+        # A primeira coluna pode ter perdido amostras no deslizamento: compara só as inteiras
+        first = np.floor(t_all[0] / dx)
+        mine = np.floor(td / dx) > first
+        ref = np.floor(t_all[idx] / dx) > first
+        np.testing.assert_array_equal(td[mine], t_all[idx][ref])
+        np.testing.assert_array_equal(yd[mine], y_all[idx][ref])
+    assert store.slides > 0
+
+
+def test_decimate_to_width_mantem_picos():
+    t = np.linspace(0.0, 10.0, 10001)
+    y = np.sin(t)
+    y[5000] = 50.0
+    td, yd = decimate_to_width(t, y, 200)
+    assert len(td) <= 4 * 100
+    assert yd.max() == 50.0 and yd.min() == y.min()
+    assert td[0] == t[0] and td[-1] == t[-1]
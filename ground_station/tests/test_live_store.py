@@ -0,0 +1,36 @@
+"""Testes do armazenamento ao vivo (core.live_store)."""
+
+import numpy as np
+
+from core.live_store import LiveStore
+
+
+def test_insert_com_buffer_cheio_mantem_tempo_ordenado():
+    store = LiveStore(10)
+    for i in range(20):
+        store.append(float(i), {'x': float(i)})
+    idx = store.insert(15.5, {'x': -1.0})
+    assert np.all(np.diff(store.time) >= 0)
+    assert store.time[idx] == 15.5 and store.column('x')[idx] == -1.0
+    assert len(store) == 10
+
+
+def test_insert_mais_antigo_que_a_janela_cheia_e_descartado():
+    # Com deslizamento pendente (buffer no fim do array)
+    store = LiveStore(4)
+    for i in range(1, 9):
+        store.append(float(i), {'x': float(i)})
+    revision = store.revision
+    assert store.insert(0.5, {'x': -1.0}) == -1
+    assert store.time.tolist() == [5.0, 6.0, 7.0, 8.0]
+    assert store.revision == revision
+
+    # Sem deslizamento
+    store = LiveStore(4)
+    for i in range(1, 5):
+        store.append(float(i), {'x': float(i)})
+    revision, slides = store.revision, store.slides
+    assert store.insert(0.5, {'x': -1.0}) == -1
+    assert store.time.tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert store.column('x').tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert (store.revision, store.slides) == (revision, slides)
@@ -0,0 +1,65 @@
+"""Testes das estatísticas móveis ao vivo (core.rolling_stats)."""
+
+import math
+
+import numpy as np
+import pytest
+
+from core.rolling_stats import BUCKET_S, RollingStatsEngine
+
+WINDOW_S = 2.0
+
+
+def _reference(t: np.ndarray, y: np.ndarray, now: float):
+    """Estatísticas por força bruta: amostras dos baldes dentro da janela que termina em `now`."""
+    span = math.ceil(WINDOW_S / BUCKET_S - 1e-9)
+    first = math.floor(now / BUCKET_S) - span + 1
+    inside = y[(np.floor(t / BUCKET_S) >= first) & ~np.isnan(y)]
+    if not len(inside):
+        return None
+    return len(inside), inside.min(), inside.max(), inside.mean(), inside.std()
+
+
+def _check(engine: RollingStatsEngine, t, y, now, expire_now=None):
+    stats = engine.stats('x', 'janela', expire_now)
+    expected = _reference(t, y, now)
+    if expected is None:
+        assert stats is None
+        return
+    n, lo, hi, mean, std = expected
+    assert stats.n == n
+    assert stats.min == lo and stats.max == hi
+    assert stats.mean == pytest.approx(mean, rel=1e-9, abs=1e-9)
+    assert stats.std == pytest.approx(std, rel=1e-7, abs=1e-9)
+
+
+def test_janela_movel_igual_a_forca_bruta():
+    rng = np.random.default_rng(3)
+    engine = RollingStatsEngine({'janela': WINDOW_S, 'volta': None})
+    t_all, y_all = np.empty(0), np.empty(0)
+    t_next = 0.0
+    for k in range(80):
+        n = int(rng.integers(1, 60))
+        t = t_next + np.cumsum(rng.uniform(0.001, 0.05, n))
+        if k % 17 == 0:
+            t += 3.0  # Canal parado por mais que a janela
+        t_next = t[-1]
+        y = rng.normal(loc=k % 7, scale=1.0 + k % 3, size=n)
+        y[rng.random(n) < 0.05] = np.nan
+        engine.extend(t, {'x': y})
+        t_all, y_all = np.append(t_all, t), np.append(y_all, y)
+        # Sem `now`, a janela termina na última amostra válida do canal
+        _check(engine, t_all, y_all, t_all[~np.isnan(y_all)][-1])
+
+    # Sem amostras novas: `now` tira da janela o que ficou velho
+    for delay in (0.55, 1.3, 1.95):
+        _check(engine, t_all, y_all, t_next + delay, expire_now=t_next + delay)
+    assert engine.stats('x', 'janela', t_next + WINDOW_S + BUCKET_S) is None
+
+    # Janela sem duração: tudo desde o início
+    volta = engine.stats('x', 'volta')
+    valid = y_all[~np.isnan(y_all)]
+    assert volta.n == len(valid)
+    assert volta.min == valid.min() and volta.max == valid.max()
+    assert volta.mean == pytest.approx(valid.mean(), rel=1e-9)
+    assert volta.std == pytest.approx(valid.std(), rel=1e-7)